@@ -0,0 +1,76 @@
+from almacenamiento import aplicar_esquema
+from tipo_dia import DIAS_SEMANA
+
+# Dimensiones del cubo diario. DIA_SEMANA y MOTIVO_FERIADO dependen solo de la fecha,
+# así que no agregan filas: se guardan para no tener que recalcularlas después
+DIMENSIONES_CUBO = ["DIA_TRANSPORTE", "TIPO_TRANSPORTE", "AMBA", "TIPO_DIA", "DIA_SEMANA", "MOTIVO_FERIADO"]
+
+
+def construir_cubo_diario(df, dimensiones=DIMENSIONES_CUBO):
+    """Suma CANTIDAD por fecha × tipo de transporte × AMBA × tipo de día en una sola pasada.
+
+    El resultado tiene unas pocas miles de filas por año (en lugar de millones),
+    y todos los gráficos y tablas del EDA se derivan de él.
+    """
+    cubo = (
+        df.groupby(dimensiones, observed=True, dropna=False, sort=True)["CANTIDAD"]
+        .sum()
+        .reset_index()
+    )
+    return aplicar_esquema(cubo)
+
+
+class AgregadosEDA:
+    """Agregados del EDA calculados a partir del cubo diario (sin volver a recorrer el dataset)."""
+
+    def __init__(self, cubo):
+        self.cubo = cubo
+
+    @classmethod
+    def desde_dataframe(cls, df):
+        return cls(construir_cubo_diario(df))
+
+    def _sumar(self, por):
+        return self.cubo.groupby(por, observed=True, sort=True)["CANTIDAD"].sum()
+
+    def viajes_por_mes(self):
+        """Total de viajes por número de mes."""
+        return self._sumar(self.cubo["DIA_TRANSPORTE"].dt.month.rename("MES"))
+
+    def viajes_por_dia_semana(self):
+        """Total de viajes por día de la semana, de lunes a domingo."""
+        return self._sumar("DIA_SEMANA").reindex(DIAS_SEMANA)
+
+    def viajes_por_mes_y_tipo(self):
+        """Viajes por mes (MES_ANO como fecha del primer día del mes) y tipo de transporte, en orden cronológico."""
+        mes_ano = self.cubo["DIA_TRANSPORTE"].dt.to_period("M").dt.to_timestamp().rename("MES_ANO")
+        return self._sumar([mes_ano, "TIPO_TRANSPORTE"]).reset_index()
+
+    def viajes_por_tipo_transporte(self):
+        """Total de viajes por tipo de transporte."""
+        return self._sumar("TIPO_TRANSPORTE")
+
+    def viajes_diarios_por_tipo_dia(self):
+        """Total de viajes de cada fecha, junto con su tipo de día."""
+        return self._sumar(["DIA_TRANSPORTE", "TIPO_DIA"]).reset_index()
+
+    def promedio_por_tipo_dia(self):
+        """Promedio de viajes diarios por tipo de día (HÁBIL, FIN_DE_SEMANA, FERIADO)."""
+        return self.viajes_diarios_por_tipo_dia().groupby("TIPO_DIA", observed=True)["CANTIDAD"].mean()
+
+    def viajes_habil_vs_no(self):
+        """Total de viajes en días hábiles (True) y no hábiles (False)."""
+        return self._sumar((self.cubo["TIPO_DIA"] == "HÁBIL").rename("ES_HABIL"))
+
+    def viajes_por_motivo_feriado(self):
+        """Total de viajes por motivo de feriado (solo feriados con motivo), de menor a mayor."""
+        feriados = self.cubo[(self.cubo["TIPO_DIA"] == "FERIADO") & (self.cubo["MOTIVO_FERIADO"] != "NO FERIADO")]
+        return (
+            feriados.groupby("MOTIVO_FERIADO", observed=True)["CANTIDAD"]
+            .sum()
+            .sort_values(ascending=True)
+        )
+
+    def pivot_dia_semana_tipo(self):
+        """Tabla día de la semana × tipo de transporte con el total de viajes."""
+        return self._sumar(["DIA_SEMANA", "TIPO_TRANSPORTE"]).unstack("TIPO_TRANSPORTE").reindex(DIAS_SEMANA)
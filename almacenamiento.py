@@ -0,0 +1,450 @@
+import argparse          # Para convertir archivos desde la línea de comandos
+import io                # Para releer un CSV descargado sin volver a pedirlo
+import os                # Para trabajar con rutas y extensiones de archivo
+from urllib.request import urlopen
+
+import numpy as np
+import pandas as pd      # Para manipulación y análisis de datos en DataFrames
+
+from tipo_dia import TIPO_DIA_SEMANA, TIPO_TIPO_DIA
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None            # pyarrow es opcional: sin él los CSV se leen con el motor C de pandas
+
+# Formatos soportados, en orden de preferencia al buscar un dataset ya generado
+FORMATOS = ["parquet", "feather", "csv"]
+
+# Columnas de texto con pocos valores distintos: se guardan y se leen como categóricas
+COLUMNAS_CATEGORICAS = [
+    "TIPO_TRANSPORTE", "JURISDICCION", "PROVINCIA", "MUNICIPIO", "LINEA",
+    "NOMBRE_EMPRESA", "AMBA", "DATO_PRELIMINAR", "MOTIVO_FERIADO",
+]
+
+# Esquema fijo de los datasets SUBE (las columnas que no estén en el DataFrame se ignoran)
+ESQUEMA_SUBE = {
+    "DIA_TRANSPORTE": "datetime64[ns]",
+    "CANTIDAD": "int64",
+    "DIA_SEMANA": TIPO_DIA_SEMANA,
+    "TIPO_DIA": TIPO_TIPO_DIA,
+    **{columna: "category" for columna in COLUMNAS_CATEGORICAS},
+}
+
+# Columnas de los CSV publicados en datos.transporte.gob.ar (dat-ab-usos-AAAA.csv)
+COLUMNAS_ORIGINALES = [
+    "DIA_TRANSPORTE", "NOMBRE_EMPRESA", "LINEA", "AMBA", "TIPO_TRANSPORTE",
+    "JURISDICCION", "PROVINCIA", "MUNICIPIO", "CANTIDAD", "DATO_PRELIMINAR",
+]
+
+# Formato de DIA_TRANSPORTE en los CSV: se parsea con formato fijo en lugar de inferirlo fila por fila
+FORMATO_FECHA = "%Y-%m-%d"
+
+# Columnas de texto de los CSV (originales o enriquecidos): se leen directamente como categóricas
+COLUMNAS_TEXTO_CSV = COLUMNAS_CATEGORICAS + ["DIA_SEMANA", "TIPO_DIA"]
+
+# Valores admitidos de las columnas de texto con dominio cerrado (los demás se cuentan en validar_sube).
+# DIA_SEMANA y TIPO_DIA ya tienen sus categorías fijas en ESQUEMA_SUBE
+DOMINIOS = {"AMBA": ["SI", "NO"], "DATO_PRELIMINAR": ["SI", "NO"]}
+
+MOTORES_CSV = ["pyarrow", "c"]
+
+# Únicos valores que se leen como nulos, con los dos motores: cada parser tiene su propia lista por
+# defecto ("NA", "None", "<NA>", ...) y un texto como "None" no debe depender del motor ni del modo de lectura
+VALORES_NULOS = [""]
+
+# Conteos del informe de validar_sube
+COLUMNAS_VALIDACION = ["TIPO", "NULOS", "NEGATIVOS", "FUERA_DE_ESQUEMA"]
+
+
+def aplicar_esquema(df):
+    """Convierte las columnas presentes al tipo declarado en ESQUEMA_SUBE (modifica y devuelve df)."""
+    for columna, tipo in ESQUEMA_SUBE.items():
+        if columna not in df.columns:
+            continue
+        serie = df[columna]
+        if tipo == "category" and not isinstance(serie.dtype, pd.CategoricalDtype) and serie.isna().all():
+            serie = serie.astype(object)    # una columna de texto sin valores se lee como float: se la trata como texto
+        if serie.dtype != tipo:
+            if pd.api.types.is_integer_dtype(tipo) and serie.isna().any():
+                continue                    # un entero con nulos queda decimal (los nulos se informan en validar_sube)
+            df[columna] = serie.astype(tipo)
+    return df
+
+
+def memoria_mb(df):
+    """Memoria ocupada por el DataFrame en MB, contando el contenido real de los textos."""
+    return df.memory_usage(deep=True).sum() / 2**20
+
+
+def compactar(df, max_proporcion_unicos=0.5, informar=True):
+    """Reduce la memoria del DataFrame sin perder información relevante para el análisis (modifica y devuelve df).
+
+    - Aplica ESQUEMA_SUBE (columnas de texto conocidas como categóricas).
+    - Las demás columnas de texto con pocos valores distintos (a lo sumo
+      `max_proporcion_unicos` del total de filas) también pasan a categóricas.
+    - Los enteros y decimales se reducen al tipo más chico que admite sus valores
+      (las sumas con groupby se siguen calculando en 64 bits).
+    - MES_ANO se guarda como período mensual en lugar de texto.
+
+    Con `informar` se imprime la memoria antes y después.
+    """
+    antes = memoria_mb(df) if informar else None
+    aplicar_esquema(df)
+    for columna in df.columns:
+        serie = df[columna]
+        if isinstance(serie.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(serie):
+            continue
+        if columna == "MES_ANO" and serie.dtype == object:
+            df[columna] = pd.PeriodIndex(serie, freq="M")
+        elif pd.api.types.is_integer_dtype(serie):
+            df[columna] = pd.to_numeric(serie, downcast="integer")
+        elif pd.api.types.is_float_dtype(serie):
+            df[columna] = pd.to_numeric(serie, downcast="float")
+        elif serie.dtype == object and serie.nunique() <= max_proporcion_unicos * len(serie):
+            df[columna] = serie.astype("category")
+    if informar:
+        despues = memoria_mb(df)
+        print(f"🗜️  Memoria del DataFrame: {antes:,.1f} MB → {despues:,.1f} MB ({1 - despues / antes:.0%} menos)")
+    return df
+
+
+def asegurar_categorias(df, columna, valores):
+    """Agrega `valores` a las categorías de la columna para poder asignarlos (si es categórica)."""
+    serie = df[columna]
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        nuevas = [valor for valor in valores if valor not in serie.cat.categories]
+        if nuevas:
+            df[columna] = serie.cat.add_categories(nuevas)
+    return df
+
+
+def formato_de(ruta):
+    """Devuelve el formato ("parquet", "feather" o "csv") según la extensión del archivo."""
+    formato = os.path.splitext(ruta)[1].lstrip(".").lower()
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato no soportado: {ruta} (se esperaba {', '.join(FORMATOS)})")
+    return formato
+
+
+def ruta_dataset(base):
+    """Busca `base`.parquet, `base`.feather o `base`.csv (en ese orden) y devuelve el primero que exista."""
+    for formato in FORMATOS:
+        ruta = f"{base}.{formato}"
+        if os.path.exists(ruta):
+            return ruta
+    raise FileNotFoundError(f"No se encontró {base} en ninguno de los formatos: {', '.join(FORMATOS)}")
+
+
+# ----- L E C T U R A   D E   C S V   C O N   E S Q U E M A -----
+def _es_url(origen):
+    return isinstance(origen, str) and origen.startswith(("http://", "https://"))
+
+
+def _leer_csv_pyarrow(origen, columnas, estricto):
+    """CSV leído por el parser multihilo de pyarrow con los tipos declarados.
+
+    Con `estricto=False` la fecha y CANTIDAD se leen como texto, para convertirlas
+    después contando los valores que no cumplen el tipo (ver _convertir_declarados).
+    """
+    diccionario = pa.dictionary(pa.int32(), pa.string())
+    tipos = {columna: diccionario for columna in COLUMNAS_TEXTO_CSV}
+    if estricto:
+        tipos.update({"DIA_TRANSPORTE": pa.timestamp("ns"), "CANTIDAD": pa.int64()})
+    else:
+        tipos.update({"DIA_TRANSPORTE": pa.string(), "CANTIDAD": pa.string()})
+    opciones = pa_csv.ConvertOptions(
+        column_types=tipos, include_columns=columnas or [], timestamp_parsers=[FORMATO_FECHA],
+        null_values=VALORES_NULOS, strings_can_be_null=True,
+    )
+    return pa_csv.read_csv(origen, convert_options=opciones).to_pandas()
+
+
+def _leer_csv_c(origen, columnas, chunksize=None):
+    """CSV leído por el motor C de pandas: textos como categóricas y fecha con formato fijo.
+
+    CANTIDAD no se declara: si trae valores que no son números enteros, la columna queda
+    como texto o decimal y se convierte después contando esos valores. Solo el campo vacío
+    es nulo (VALORES_NULOS), igual que con pyarrow.
+    """
+    return pd.read_csv(
+        origen, usecols=columnas, chunksize=chunksize,
+        dtype={columna: "category" for columna in COLUMNAS_TEXTO_CSV if columnas is None or columna in columnas},
+        parse_dates=["DIA_TRANSPORTE"] if columnas is None or "DIA_TRANSPORTE" in columnas else None,
+        date_format=FORMATO_FECHA, keep_default_na=False, na_values=VALORES_NULOS,
+    )
+
+
+def _convertir_declarados(df):
+    """Convierte la fecha y CANTIDAD que no se pudieron leer con su tipo y cuenta los valores inválidos.
+
+    Una CANTIDAD que no es un número entero (ej. "12.5") también es inválida: no se
+    trunca. Los valores inválidos quedan como nulos y la cantidad por columna se guarda en
+    df.attrs["violaciones_esquema"] (ver validar_sube). También se cuentan los valores
+    de DIA_SEMANA y TIPO_DIA fuera de sus categorías, que al aplicar el esquema quedan nulos.
+    Las categorías de los textos se dejan ordenadas, igual que con astype("category").
+    """
+    violaciones = {}
+    if "DIA_TRANSPORTE" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["DIA_TRANSPORTE"]):
+        texto = df["DIA_TRANSPORTE"]
+        fechas = pd.to_datetime(texto, format=FORMATO_FECHA, errors="coerce")
+        if fechas.isna().all() and texto.notna().any():
+            fechas = pd.to_datetime(texto, errors="coerce")    # el archivo usa otro formato: se infiere
+        violaciones["DIA_TRANSPORTE"] = int((fechas.isna() & texto.notna()).sum())
+        df["DIA_TRANSPORTE"] = fechas
+    if "CANTIDAD" in df.columns and not pd.api.types.is_integer_dtype(df["CANTIDAD"]):
+        # Texto, o decimal si el motor C encontró valores como "12.5": los que no son enteros también son inválidos
+        texto = df["CANTIDAD"]
+        numeros = pd.to_numeric(texto, errors="coerce")
+        no_enteros = numeros.notna() & (numeros % 1 != 0)
+        violaciones["CANTIDAD"] = int((numeros.isna() & texto.notna()).sum() + no_enteros.sum())
+        df["CANTIDAD"] = numeros.mask(no_enteros)
+    for columna in df.columns.intersection(COLUMNAS_TEXTO_CSV):
+        serie, tipo = df[columna], ESQUEMA_SUBE.get(columna)
+        if isinstance(tipo, pd.CategoricalDtype):
+            # Categorías fijas (DIA_SEMANA, TIPO_DIA): astype no reordena si solo difieren en el orden
+            violaciones[columna] = _fuera_de_dominio(serie, tipo.categories)
+            df[columna] = serie.cat.set_categories(tipo.categories, ordered=tipo.ordered)
+        elif not serie.cat.categories.is_monotonic_increasing:
+            # Los parsers dejan las categorías en orden de aparición: se ordenan como con astype("category")
+            df[columna] = serie.cat.reorder_categories(serie.cat.categories.sort_values())
+    df.attrs["violaciones_esquema"] = {c: n for c, n in violaciones.items() if n}
+    return aplicar_esquema(df)
+
+
+def leer_csv_sube(origen, columnas=None, motor="auto"):
+    """Lee un CSV SUBE (original o enriquecido) con el esquema declarado, sin inferir tipos.
+
+    `origen` puede ser una ruta, una URL o un archivo abierto. `columnas` limita las
+    columnas leídas (el resto ni se convierte). Con `motor="auto"` se usa el parser
+    multihilo de pyarrow si está instalado y, si no, el motor C de pandas.
+    La fecha se parsea con FORMATO_FECHA y CANTIDAD como entero. Si algún valor no
+    cumple el tipo, el archivo se relee en modo tolerante: esos valores quedan nulos
+    y se cuentan en el informe de validar_sube, en lugar de cortar la lectura.
+    """
+    motor = ("pyarrow" if pa is not None else "c") if motor == "auto" else motor
+    if motor not in MOTORES_CSV:
+        raise ValueError(f"Motor de CSV desconocido: {motor} (se esperaba auto, {', '.join(MOTORES_CSV)})")
+    if motor == "c":
+        return _convertir_declarados(_leer_csv_c(origen, columnas))
+
+    if _es_url(origen):
+        with urlopen(origen) as respuesta:
+            origen = io.BytesIO(respuesta.read())
+    posicion = origen.tell() if hasattr(origen, "tell") else None
+    try:
+        df = _leer_csv_pyarrow(origen, columnas, estricto=True)
+    except pa.ArrowInvalid:
+        if posicion is not None:
+            origen.seek(posicion)
+        df = _leer_csv_pyarrow(origen, columnas, estricto=False)
+    return _convertir_declarados(df)
+
+
+def leer_csv_sube_por_bloques(origen, columnas=None, chunksize=1_000_000):
+    """Igual que leer_csv_sube, pero de a bloques de `chunksize` filas (motor C de pandas).
+
+    Cada bloque trae sus propias violaciones en attrs["violaciones_esquema"].
+    """
+    for bloque in _leer_csv_c(origen, columnas, chunksize):
+        yield _convertir_declarados(bloque)
+
+
+# ----- V A L I D A C I Ó N -----
+def _fuera_de_dominio(serie, permitidos):
+    """Cantidad de valores no nulos de la serie que no están en `permitidos` (en una categórica, sobre los códigos)."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        invalidas = np.flatnonzero(~serie.cat.categories.isin(permitidos))
+        return int(np.isin(serie.cat.codes.to_numpy(), invalidas).sum()) if len(invalidas) else 0
+    return int((serie.notna() & ~serie.isin(permitidos)).sum())
+
+
+def validar_sube(df, columnas_esperadas=()):
+    """Informe de calidad por columna, solo con conteos: tipo, nulos, negativos y valores fuera del esquema.
+
+    FUERA_DE_ESQUEMA suma los valores que no se pudieron convertir al leer (quedaron
+    nulos, ver leer_csv_sube) y los valores fuera de DOMINIOS. Las columnas de
+    `columnas_esperadas` que faltan figuran con TIPO "(falta)" y todas sus filas fuera
+    del esquema. No copia el DataFrame: cada conteo recorre una sola columna.
+    """
+    violaciones = df.attrs.get("violaciones_esquema", {})
+    filas = []
+    for columna in dict.fromkeys([*columnas_esperadas, *df.columns]):
+        if columna not in df.columns:
+            filas.append((columna, "(falta)", 0, 0, len(df)))
+            continue
+        serie = df[columna]
+        numerica = pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie)
+        fuera = violaciones.get(columna, 0)
+        if columna in DOMINIOS:
+            fuera += _fuera_de_dominio(serie, DOMINIOS[columna])
+        filas.append((columna, str(serie.dtype), int(serie.isna().sum()), int((serie < 0).sum()) if numerica else 0, fuera))
+    return pd.DataFrame(filas, columns=["COLUMNA"] + COLUMNAS_VALIDACION).set_index("COLUMNA")
+
+
+def sumar_validaciones(informes):
+    """Suma los informes de validar_sube de varios bloques del mismo archivo."""
+    informes = list(informes)
+    por_columna = pd.concat(informes).groupby(level=0, sort=False)
+    total = por_columna[COLUMNAS_VALIDACION[1:]].sum()
+    total.insert(0, "TIPO", por_columna["TIPO"].agg(lambda tipos: " / ".join(dict.fromkeys(tipos))))
+    return total
+
+
+def problemas_validacion(informe):
+    """Solo las columnas del informe con algún nulo, negativo o valor fuera del esquema."""
+    return informe[informe[COLUMNAS_VALIDACION[1:]].sum(axis=1) > 0]
+
+
+def leer_dataset(ruta, columnas=None, compacto=False):
+    """Lee un dataset SUBE en cualquiera de los formatos soportados y le aplica el esquema.
+
+    `columnas` permite leer solo un subconjunto de columnas (en Parquet y Feather
+    el resto ni siquiera se lee del disco). Con `compacto` además se reducen los
+    tipos numéricos y se informa la memoria ahorrada (ver compactar).
+    """
+    formato = formato_de(ruta)
+    if formato == "parquet":
+        df = pd.read_parquet(ruta, columns=columnas)
+    elif formato == "feather":
+        df = pd.read_feather(ruta, columns=columnas)
+    else:
+        df = leer_csv_sube(ruta, columnas)
+    return compactar(df) if compacto else aplicar_esquema(df)
+
+
+def leer_por_bloques(ruta, columnas=None, chunksize=1_000_000):
+    """Lee un dataset de a bloques de hasta `chunksize` filas (CSV o Parquet), con el esquema aplicado.
+
+    Sirve para recorrer archivos más grandes que la memoria; en Parquet se leen de
+    a lotes del archivo y solo las columnas pedidas.
+    """
+    formato = formato_de(ruta)
+    if formato == "parquet":
+        import pyarrow.parquet as pq
+
+        for lote in pq.ParquetFile(ruta).iter_batches(batch_size=chunksize, columns=columnas):
+            yield aplicar_esquema(lote.to_pandas())
+    elif formato == "csv":
+        yield from leer_csv_sube_por_bloques(ruta, columnas, chunksize)
+    else:
+        yield leer_dataset(ruta, columnas)    # Feather no se puede leer por partes
+
+
+def _para_csv(df):
+    """CANTIDAD como entero con nulos (Int64) para escribir el CSV: con un solo nulo la columna es
+    decimal y se escribiría 1599.0 en lugar de 1599 (y distinto en cada bloque, según traiga nulos o no).
+
+    Los lectores ya dejan nulos los valores que no son enteros (ver _convertir_declarados); si la
+    columna trae decimales de otro origen, se escribe tal cual en lugar de redondearlos.
+    """
+    if "CANTIDAD" in df.columns and pd.api.types.is_float_dtype(df["CANTIDAD"]):
+        valores = df["CANTIDAD"].to_numpy()
+        if (np.isnan(valores) | (valores % 1 == 0)).all():
+            return df.assign(CANTIDAD=df["CANTIDAD"].astype("Int64"))
+    return df
+
+
+def _tramos_por_mes(df):
+    """Tramos de filas consecutivas con el mismo mes de DIA_TRANSPORTE, sin reordenar las filas."""
+    if "DIA_TRANSPORTE" not in df.columns or len(df) == 0:
+        return [df]
+    meses = df["DIA_TRANSPORTE"].to_numpy().astype("datetime64[M]").view("int64")
+    cortes = np.flatnonzero(meses[1:] != meses[:-1]) + 1
+    return [df.iloc[desde:hasta] for desde, hasta in zip([0, *cortes], [*cortes, len(df)])]
+
+
+def _escribir_parquet(escritor, df, esquema):
+    """Agrega `df` al archivo con un grupo de filas por mes: como los datasets vienen ordenados por
+    fecha, leer un mes con un filtro sobre DIA_TRANSPORTE no lee los grupos de los demás meses."""
+    for tramo in _tramos_por_mes(df):
+        escritor.write_table(pa.Table.from_pandas(tramo, schema=esquema, preserve_index=False))
+
+
+def guardar_dataset(df, ruta):
+    """Guarda el DataFrame en el formato indicado por la extensión de `ruta` (sin modificar `df`).
+
+    En Parquet cada mes de DIA_TRANSPORTE queda en su propio grupo de filas (ver _escribir_parquet).
+    """
+    formato = formato_de(ruta)
+    if formato == "parquet":
+        import pyarrow.parquet as pq
+
+        df = aplicar_esquema(df.copy(deep=False))    # copia sin duplicar los datos: solo se reemplazan columnas
+        esquema = esquema_parquet(df)
+        with pq.ParquetWriter(ruta, esquema) as escritor:
+            _escribir_parquet(escritor, df, esquema)
+    elif formato == "feather":
+        aplicar_esquema(df.copy(deep=False)).reset_index(drop=True).to_feather(ruta)
+    else:
+        _para_csv(df).to_csv(ruta, index=False, encoding="utf-8-sig")
+    return ruta
+
+
+def esquema_parquet(df):
+    """Esquema de Arrow de `df` con los tipos declarados en ESQUEMA_SUBE, no los inferidos de sus valores.
+
+    Las categóricas son siempre diccionarios de texto con índices de 32 bits, así que un bloque
+    en el que una columna viene toda nula (ej. JURISDICCION) tiene el mismo esquema que los demás.
+    """
+    esquema = pa.Schema.from_pandas(df, preserve_index=False)
+    for i, campo in enumerate(esquema):
+        tipo = ESQUEMA_SUBE.get(campo.name)
+        if isinstance(tipo, pd.CategoricalDtype) or tipo == "category":
+            ordenada = bool(getattr(tipo, "ordered", False))
+            esquema = esquema.set(i, campo.with_type(pa.dictionary(pa.int32(), pa.string(), ordenada)))
+        elif tipo == "int64":
+            esquema = esquema.set(i, campo.with_type(pa.int64()))
+    return esquema
+
+
+def guardar_por_bloques(bloques, ruta):
+    """Escribe una secuencia de DataFrames en un único archivo, bloque por bloque.
+
+    Devuelve la cantidad total de filas escritas. En Parquet, como en guardar_dataset,
+    los grupos de filas no mezclan meses. Feather no se admite porque el formato no
+    permite que cada bloque traiga sus propias categorías.
+    """
+    formato = formato_de(ruta)
+    filas = 0
+    if formato == "csv":
+        # newline="" y utf-8-sig: mismo archivo que escribe to_csv cuando recibe una ruta (el BOM se escribe una sola vez)
+        with open(ruta, "w", encoding="utf-8-sig", newline="") as archivo:
+            for bloque in bloques:
+                _para_csv(bloque).to_csv(archivo, index=False, header=(filas == 0))
+                filas += len(bloque)
+    elif formato == "parquet":
+        import pyarrow.parquet as pq
+
+        escritor = esquema = None
+        try:
+            for bloque in bloques:
+                bloque = aplicar_esquema(bloque)
+                if escritor is None:
+                    esquema = esquema_parquet(bloque)
+                    escritor = pq.ParquetWriter(ruta, esquema)
+                _escribir_parquet(escritor, bloque, esquema)
+                filas += len(bloque)
+        finally:
+            if escritor is not None:
+                escritor.close()
+    else:
+        raise ValueError("La escritura por bloques solo admite CSV o Parquet")
+    return filas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convierte datasets SUBE en CSV a Parquet o Feather")
+    parser.add_argument("archivos", nargs="+", help="archivos CSV a convertir")
+    parser.add_argument("--formato", choices=["parquet", "feather"], default="parquet")
+    args = parser.parse_args()
+
+    for archivo in args.archivos:
+        destino = f"{os.path.splitext(archivo)[0]}.{args.formato}"
+        guardar_dataset(leer_dataset(archivo), destino)
+        print(f"📁 {archivo} → {destino}")
+
+
+if __name__ == "__main__":
+    main()
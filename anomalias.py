@@ -0,0 +1,172 @@
+import argparse          # Para elegir el dataset y el umbral desde la línea de comandos
+
+import numpy as np       # Para las ventanas móviles agrupadas con sumas acumuladas
+import pandas as pd      # Para manipulación y análisis de datos en DataFrames
+
+from almacenamiento import ruta_dataset
+from comparativa import agregado_anual
+
+# Cada serie diaria es una línea (dentro de su tipo de transporte)
+CLAVES_SERIE = ["TIPO_TRANSPORTE", "LINEA"]
+
+# Observaciones anteriores del mismo tipo de día que forman la base de cada día: unas cuatro semanas
+# de días hábiles o de fines de semana, y los últimos feriados. Un HÁBIL se compara solo con días
+# hábiles, un FERIADO solo con feriados, etc.
+VENTANAS = {"HÁBIL": 20, "FIN_DE_SEMANA": 8, "FERIADO": 6}
+VENTANA_POR_DEFECTO = 20
+
+# Observaciones anteriores necesarias para calcular la base (antes, el día no se evalúa)
+MINIMO_OBSERVACIONES = 4
+
+# |Z| a partir del cual un día se considera anómalo
+UMBRAL_Z = 3.0
+
+
+def _como_lista(claves):
+    return [claves] if isinstance(claves, str) else list(claves)
+
+
+# ----- S E R I E S   D I A R I A S -----
+def series_diarias(df, claves=CLAVES_SERIE):
+    """Viajes por día de cada serie (por defecto, cada línea), ordenados por serie y fecha.
+
+    Sirve tanto el dataset enriquecido como un cubo ya agregado (ej. comparativa.agregado_anual):
+    TIPO_DIA y MOTIVO_FERIADO dependen solo de la fecha, así que se conservan sin agregar filas.
+    """
+    claves = _como_lista(claves)
+    por_fecha = ["DIA_TRANSPORTE"] + [c for c in ("TIPO_DIA", "MOTIVO_FERIADO") if c in df.columns]
+    return (
+        df.groupby(claves + por_fecha, observed=True, dropna=False, sort=True)["CANTIDAD"]
+        .sum()
+        .reset_index()
+    )
+
+
+def _base_movil(valores, grupos, ventanas, minimo):
+    """Media y desvío de las `ventanas` observaciones anteriores de cada grupo, sin incluir la actual.
+
+    `valores` y `grupos` vienen ordenados por grupo y fecha; `ventanas` es el largo de
+    la ventana de cada fila. Equivale a groupby().shift(1).rolling(ventana, min_periods=minimo)
+    para todos los grupos a la vez, con sumas acumuladas en lugar de recorrer cada serie.
+    """
+    n = len(valores)
+    posiciones = np.arange(n)
+    nuevo = np.r_[True, grupos[1:] != grupos[:-1]]
+    inicio = np.maximum.accumulate(np.where(nuevo, posiciones, 0))
+    anteriores = np.minimum(posiciones - inicio, ventanas)
+
+    # Se centra cada grupo en su media para que las sumas de cuadrados no pierdan precisión
+    codigos = np.cumsum(nuevo) - 1
+    centrados = valores - (np.bincount(codigos, weights=valores) / np.bincount(codigos))[codigos]
+    suma = np.r_[0.0, np.cumsum(centrados)]
+    suma_cuadrados = np.r_[0.0, np.cumsum(centrados**2)]
+    desde = posiciones - anteriores
+    s1 = suma[posiciones] - suma[desde]
+    s2 = suma_cuadrados[posiciones] - suma_cuadrados[desde]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        media = s1 / anteriores
+        varianza = np.maximum(s2 - s1 * media, 0) / (anteriores - 1)
+    valida = anteriores >= max(minimo, 2)
+    media = np.where(valida, media + (valores - centrados), np.nan)
+    desvio = np.where(valida, np.sqrt(varianza), np.nan)
+    return media, desvio
+
+
+def puntajes_z(series, claves=CLAVES_SERIE, ventanas=VENTANAS, minimo=MINIMO_OBSERVACIONES):
+    """Agrega a las series diarias la base de cada día y su puntaje Z (modifica y devuelve series).
+
+    La base de un día es la media de los días anteriores de la misma serie y el mismo
+    TIPO_DIA (ventana según VENTANAS): BASE, DESVIO, Z = (CANTIDAD - BASE) / DESVIO y
+    VARIACION_PCT. Los días sin suficientes observaciones anteriores, o con desvío cero,
+    quedan con Z nulo.
+    """
+    claves = _como_lista(claves)
+    grupos = series.groupby(claves + ["TIPO_DIA"], observed=True, dropna=False, sort=False).ngroup().to_numpy()
+    orden = np.lexsort((series["DIA_TRANSPORTE"].to_numpy().view("int64"), grupos))
+
+    codigos, tipos = pd.factorize(series["TIPO_DIA"])
+    largo = np.array([ventanas.get(t, VENTANA_POR_DEFECTO) for t in tipos] + [VENTANA_POR_DEFECTO])
+    ventana = largo[codigos[orden]]
+
+    valores = series["CANTIDAD"].to_numpy(dtype="float64")[orden]
+    media, desvio = _base_movil(valores, grupos[orden], ventana, minimo)
+
+    base, dispersion = np.empty(len(orden)), np.empty(len(orden))
+    base[orden], dispersion[orden] = media, desvio
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = (series["CANTIDAD"].to_numpy() - base) / np.where(dispersion > 0, dispersion, np.nan)
+        variacion = (series["CANTIDAD"].to_numpy() / base - 1) * 100
+    series["BASE"] = base.round(1)
+    series["DESVIO"] = dispersion.round(1)
+    series["Z"] = z
+    series["VARIACION_PCT"] = variacion.round(2)
+    return series
+
+
+# ----- T A B L A S   D E   A N O M A L Í A S -----
+def detectar_anomalias(df, claves=CLAVES_SERIE, umbral=UMBRAL_Z, ventanas=VENTANAS, minimo=MINIMO_OBSERVACIONES):
+    """Días de cada serie cuyo |Z| supera `umbral`, de mayor a menor |Z|.
+
+    Devuelve (anomalias, puntajes): la tabla de anomalías, con las claves de la serie,
+    DIA_TRANSPORTE, TIPO_DIA, MOTIVO_FERIADO (si el dataset lo tiene), CANTIDAD, BASE, Z,
+    VARIACION_PCT y TIPO_ANOMALIA (CAIDA o PICO), y las series con los puntajes de todos
+    los días. Ambas se pueden unir por DIA_TRANSPORTE con cualquier tabla por fecha
+    (ej. calendario_feriados.CalendarioFeriados.tabla).
+    """
+    puntajes = puntajes_z(series_diarias(df, claves), claves, ventanas, minimo)
+    anomalias = puntajes[puntajes["Z"].abs() >= umbral].copy()
+    anomalias["TIPO_ANOMALIA"] = pd.Categorical(np.where(anomalias["Z"] < 0, "CAIDA", "PICO"), ["CAIDA", "PICO"])
+    anomalias = anomalias.iloc[np.argsort(-anomalias["Z"].abs().to_numpy(), kind="stable")].reset_index(drop=True)
+    anomalias["Z"] = anomalias["Z"].round(2)
+    return anomalias, puntajes
+
+
+def anomalias_por_fecha(puntajes, umbral=UMBRAL_Z, ventanas=VENTANAS, minimo=MINIMO_OBSERVACIONES):
+    """Resumen por fecha: cuántas series se evaluaron, cuántas cayeron o tuvieron un pico, y el Z del total.
+
+    Un paro o un evento masivo afecta a muchas líneas el mismo día, mientras que un
+    error de carga afecta a una sola: PROPORCION_CAIDAS alta, o un Z muy negativo del
+    total de viajes del día (comparado con los días anteriores del mismo TIPO_DIA, que
+    es mucho menos ruidoso que cada línea), señalan los primeros. Se ordena de mayor a menor |Z|.
+    """
+    evaluada = puntajes["Z"].notna()
+    por_fecha = ["DIA_TRANSPORTE"] + [c for c in ("TIPO_DIA", "MOTIVO_FERIADO") if c in puntajes.columns]
+    resumen = (
+        pd.DataFrame({
+            "EVALUADAS": evaluada,
+            "CAIDAS": evaluada & (puntajes["Z"] <= -umbral),
+            "PICOS": evaluada & (puntajes["Z"] >= umbral),
+            "CANTIDAD": puntajes["CANTIDAD"],
+        })
+        .groupby([puntajes[c] for c in por_fecha], observed=True, dropna=False, sort=True)
+        .sum()
+        .reset_index()
+    )
+    resumen["PROPORCION_CAIDAS"] = (resumen["CAIDAS"] / resumen["EVALUADAS"]).round(3)
+    resumen = puntajes_z(resumen, [], ventanas, minimo).drop(columns="DESVIO")
+    orden = np.argsort(-resumen["Z"].abs().fillna(-1).to_numpy(), kind="stable")
+    resumen["Z"] = resumen["Z"].round(2)
+    return resumen.iloc[orden].reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Anomalías en las series diarias de viajes por línea")
+    parser.add_argument("anio", type=int, help="año a analizar (usa df-sube-AAAA, ya enriquecido)")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_Z, help="|Z| mínimo para considerar anómalo un día")
+    parser.add_argument("--top", type=int, default=20, help="cantidad de anomalías y de fechas que se muestran")
+    parser.add_argument("--salida", help="guardar la tabla completa de anomalías en este CSV")
+    args = parser.parse_args()
+
+    # El agregado anual de la comparación interanual ya tiene los viajes por línea y fecha (memorizado)
+    anomalias, puntajes = detectar_anomalias(agregado_anual(ruta_dataset(f"df-sube-{args.anio}")), umbral=args.umbral)
+    print(f"{len(anomalias):,} días anómalos en {puntajes.groupby(CLAVES_SERIE, observed=True).ngroups:,} líneas\n")
+    print(anomalias.head(args.top).to_string(index=False) + "\n")
+    print(anomalias_por_fecha(puntajes, args.umbral).head(args.top).to_string(index=False))
+    if args.salida:
+        anomalias.to_csv(args.salida, index=False, encoding="utf-8-sig")
+        print(f"📁 Anomalías guardadas en '{args.salida}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse          # Para leer los parámetros desde la línea de comandos
+import os                # Para verificar si las páginas ya están guardadas
+import timeit            # Para medir tiempos de ejecución
+
+import requests
+
+from feriados import HEADERS, URL_LANACION, etree, parsear_feriados_lanacion
+from scraping_consulta_robots import scraping_permitido
+
+DIRECTORIO_PAGINAS = "paginas_feriados"
+
+
+def pagina_guardada(anio, directorio=DIRECTORIO_PAGINAS):
+    """Devuelve el HTML guardado de la página de feriados del año, descargándolo la primera vez."""
+    ruta = os.path.join(directorio, f"lanacion-{anio}.html")
+    if not os.path.exists(ruta):
+        url = URL_LANACION.format(anio=anio)
+        if not scraping_permitido(url):
+            raise SystemExit(f"⛔ El robots.txt del sitio no permite descargar {url}")
+        resp = requests.get(url, headers=HEADERS, timeout=10)
+        resp.raise_for_status()
+        os.makedirs(directorio, exist_ok=True)
+        with open(ruta, "wb") as archivo:
+            archivo.write(resp.content)
+        print(f"📁 Página guardada en {ruta}")
+    with open(ruta, "rb") as archivo:
+        return archivo.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark del parser de feriados de La Nación")
+    parser.add_argument("anios", nargs="*", type=int, default=[2024, 2025])
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    backends = ["bs4", "lxml"] if etree is not None else ["bs4"]
+    if etree is None:
+        print("⚠️ lxml no está instalado: solo se mide el backend de BeautifulSoup")
+
+    for anio in args.anios:
+        html = pagina_guardada(anio)
+        resultados = {b: parsear_feriados_lanacion(html, anio, backend=b) for b in backends}
+        if any(resultado != resultados["bs4"] for resultado in resultados.values()):
+            raise SystemExit(f"❌ Los backends no devuelven los mismos feriados para {anio}")
+
+        print(f"\n{anio}: {len(resultados['bs4'])} feriados, {len(html) / 1024:,.0f} KB de HTML")
+        tiempos = {}
+        for backend in backends:
+            total = min(timeit.repeat(lambda: parsear_feriados_lanacion(html, anio, backend=backend),
+                                      number=1, repeat=args.repeticiones))
+            tiempos[backend] = total
+            print(f"  {backend:5s} {total * 1000:8.2f} ms")
+        if "lxml" in tiempos:
+            print(f"  Aceleración lxml: {tiempos['bs4'] / tiempos['lxml']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+import argparse          # Para leer los parámetros desde la línea de comandos
+import json              # Para guardar y comparar los resultados entre ejecuciones
+import os
+import platform          # Para registrar en qué máquina se midió
+import statistics
+import sys
+import tempfile          # Para el CSV y los gráficos de prueba
+import time              # Para medir tiempos de ejecución
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import graficos_eda as ge
+from agregados_eda import AgregadosEDA
+import anomalias
+from almacenamiento import COLUMNAS_ORIGINALES, aplicar_esquema, leer_csv_sube, validar_sube
+from benchmark_tipo_dia import clasificar_con_apply
+from datos_sinteticos import FERIADOS_2024, MOTIVOS_2024, generar_sube
+from estadisticas_streaming import EstadisticasStreaming
+from feriados import agregar_motivo_feriado
+from outliers import marcar_outliers
+from tipo_dia import DIAS_SEMANA, agregar_tipo_dia
+
+# Un caso del benchmark:
+# - entrada: "csv" (ruta del archivo), "crudo" (dataset original) o "enriquecido" (con TIPO_DIA, MOTIVO_FERIADO, ...)
+# - legado: implementación original, que se omite por encima de --max-filas-legado por su lentitud
+Caso = namedtuple("Caso", ["nombre", "entrada", "funcion", "legado"])
+
+
+# ----- I M P L E M E N T A C I O N E S   O R I G I N A L E S   ( R E F E R E N C I A ) -----
+def motivo_feriado_strftime(df, motivos):
+    """Camino original de scraping_feriadoXXXX.py: strftime de cada fila y map contra el diccionario."""
+    df["MOTIVO_FERIADO"] = df["DIA_TRANSPORTE"].dt.strftime("%Y-%m-%d").map(motivos).fillna("NO FERIADO")
+    return df
+
+
+def groupbys_directos(df):
+    """Agregados del EDA original: un groupby sobre el dataset completo por cada pregunta."""
+    df["MES"] = df["DIA_TRANSPORTE"].dt.month
+    df["MES_ANO"] = df["DIA_TRANSPORTE"].dt.to_period("M").astype(str)
+    df["ES_HABIL"] = df["TIPO_DIA"] == "HÁBIL"
+    viajes_diarios = df.groupby(["DIA_TRANSPORTE", "TIPO_DIA"], observed=True)["CANTIDAD"].sum().reset_index()
+    feriados_df = df[(df["TIPO_DIA"] == "FERIADO") & (df["MOTIVO_FERIADO"] != "NO FERIADO")].copy()
+    return [
+        df.groupby("MES")["CANTIDAD"].sum(),
+        df.groupby("DIA_SEMANA", observed=True)["CANTIDAD"].sum().reindex(DIAS_SEMANA),
+        df.groupby(["MES_ANO", "TIPO_TRANSPORTE"], observed=True)["CANTIDAD"].sum().reset_index(),
+        df.groupby("TIPO_TRANSPORTE", observed=True)["CANTIDAD"].sum(),
+        viajes_diarios.groupby("TIPO_DIA", observed=True)["CANTIDAD"].mean(),
+        df.groupby("ES_HABIL")["CANTIDAD"].sum(),
+        feriados_df.groupby("MOTIVO_FERIADO", observed=True)["CANTIDAD"].sum().sort_values(),
+        df.groupby(["DIA_SEMANA", "TIPO_TRANSPORTE"], observed=True)["CANTIDAD"].sum().unstack().reindex(DIAS_SEMANA),
+    ]
+
+
+def agregados_desde_cubo(df):
+    """Los mismos agregados a partir del cubo diario (agregados_eda.py)."""
+    agregados = AgregadosEDA.desde_dataframe(df)
+    return [
+        agregados.viajes_por_mes(), agregados.viajes_por_dia_semana(), agregados.viajes_por_mes_y_tipo(),
+        agregados.viajes_por_tipo_transporte(), agregados.promedio_por_tipo_dia(), agregados.viajes_habil_vs_no(),
+        agregados.viajes_por_motivo_feriado(), agregados.pivot_dia_semana_tipo(),
+    ]
+
+
+def outliers_loop(df, columna_grupo="AMBA", columna_valor="CANTIDAD"):
+    """identificar_outliers_por_grupo original: un subconjunto del DataFrame y dos quantile por grupo."""
+    resultado = {}
+    for grupo, subdf in df.groupby(columna_grupo, observed=True):
+        q1 = subdf[columna_valor].quantile(0.25)
+        q3 = subdf[columna_valor].quantile(0.75)
+        iqr = q3 - q1
+        inferior, superior = max(q1 - 1.5 * iqr, 0), q3 + 1.5 * iqr
+        normales = subdf[(subdf[columna_valor] >= inferior) & (subdf[columna_valor] <= superior)]
+        resultado[grupo] = len(subdf) - len(normales)
+    return resultado
+
+
+def anomalias_rolling_por_grupo(df):
+    """Base móvil con groupby().rolling() de pandas: una ventana por serie y tipo de día (mismo resultado)."""
+    series = anomalias.series_diarias(df).sort_values(anomalias.CLAVES_SERIE + ["TIPO_DIA", "DIA_TRANSPORTE"])
+    partes = []
+    for tipo_dia, grupo in series.groupby("TIPO_DIA", observed=True):
+        ventana = anomalias.VENTANAS.get(tipo_dia, anomalias.VENTANA_POR_DEFECTO)
+        previas = grupo.groupby(anomalias.CLAVES_SERIE, observed=True)["CANTIDAD"].shift(1)
+        movil = previas.groupby([grupo[c] for c in anomalias.CLAVES_SERIE], observed=True).rolling(
+            ventana, min_periods=anomalias.MINIMO_OBSERVACIONES)
+        base = movil.mean().reset_index(level=[0, 1], drop=True)
+        desvio = movil.std().reset_index(level=[0, 1], drop=True)
+        partes.append(grupo.assign(Z=(grupo["CANTIDAD"] - base) / desvio))
+    puntajes = pd.concat(partes)
+    return puntajes[puntajes["Z"].abs() >= anomalias.UMBRAL_Z]
+
+
+def renderizar_referencia(df, directorio):
+    """Datos y PNG de un conjunto representativo de gráficos del EDA (siempre se dibujan todos)."""
+    agregados = AgregadosEDA.desde_dataframe(df)
+    conteos, bordes = ge.histograma(df["CANTIDAD"], bins=50)
+    graficos = [
+        ge.Grafico("histograma.png", ge.grafico_histograma, dict(
+            conteos=conteos, bordes=bordes, color="salmon", titulo="CANTIDAD", xlabel="Viajes")),
+        ge.Grafico("boxplot_tipo.png", ge.grafico_boxplot, dict(
+            estadisticas=ge.estadisticas_boxplot(df, "TIPO_TRANSPORTE"), escala_log=True,
+            titulo="CANTIDAD por tipo", xlabel="Tipo", ylabel="Viajes")),
+        ge.Grafico("viajes_mes.png", ge.grafico_barras_etiquetadas, dict(
+            serie=agregados.viajes_por_mes(), color="cyan", titulo="Viajes por mes", xlabel="Mes", desplazamiento=0)),
+        ge.Grafico("evolucion.png", ge.grafico_evolucion_mensual, dict(df_mes=agregados.viajes_por_mes_y_tipo(), anio=2024)),
+        ge.Grafico("torta.png", ge.grafico_torta_tipo_transporte, dict(viajes_tipo=agregados.viajes_por_tipo_transporte())),
+        ge.Grafico("heatmap.png", ge.grafico_heatmap_dia_semana_tipo, dict(tabla_pivot=agregados.pivot_dia_semana_tipo(), anio=2024)),
+    ]
+    return ge.renderizar_graficos(graficos, directorio=directorio, forzar=True)
+
+
+def casos(directorio_graficos):
+    return [
+        Caso("carga_csv", "csv", lambda ruta: pd.read_csv(ruta, parse_dates=["DIA_TRANSPORTE"]), False),
+        Caso("carga_csv_esquema", "csv", leer_csv_sube, False),
+        Caso("validacion", "crudo", lambda df: validar_sube(df, COLUMNAS_ORIGINALES), False),
+        Caso("tipo_dia_apply", "crudo", lambda df: clasificar_con_apply(df, FERIADOS_2024), True),
+        Caso("tipo_dia", "crudo", lambda df: agregar_tipo_dia(df, FERIADOS_2024), False),
+        Caso("motivo_feriado_strftime", "crudo", lambda df: motivo_feriado_strftime(df, MOTIVOS_2024), True),
+        Caso("motivo_feriado", "crudo", lambda df: agregar_motivo_feriado(df, MOTIVOS_2024), False),
+        Caso("eda_groupbys_directos", "enriquecido", groupbys_directos, True),
+        Caso("eda_cubo_diario", "enriquecido", agregados_desde_cubo, False),
+        Caso("outliers_loop", "enriquecido", outliers_loop, True),
+        Caso("outliers_amba", "enriquecido", lambda df: marcar_outliers(df, "AMBA"), False),
+        Caso("outliers_por_linea", "enriquecido", lambda df: marcar_outliers(df, ["TIPO_TRANSPORTE", "LINEA"]), False),
+        Caso("anomalias_rolling_por_grupo", "enriquecido", anomalias_rolling_por_grupo, True),
+        Caso("anomalias_por_linea", "enriquecido", anomalias.detectar_anomalias, False),
+        Caso("estadisticas_streaming", "enriquecido", lambda df: EstadisticasStreaming("CANTIDAD", ["AMBA", "TIPO_TRANSPORTE"]).agregar(df), False),
+        Caso("graficos", "enriquecido", lambda df: renderizar_referencia(df, directorio_graficos), False),
+    ]
+
+
+# ----- M E D I C I Ó N -----
+def medir(funcion, entrada, repeticiones, copiar):
+    """Tiempos (en segundos) de cada repetición; la copia de la entrada no se cuenta."""
+    tiempos = []
+    for _ in range(repeticiones):
+        argumento = entrada.copy() if copiar else entrada
+        inicio = time.perf_counter()
+        funcion(argumento)
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def ejecutar(escalas, repeticiones, max_filas_legado, seleccion=None, directorio=None):
+    """Corre los casos pedidos en cada escala y devuelve la lista de resultados."""
+    resultados = []
+    with tempfile.TemporaryDirectory(dir=directorio) as temporal:
+        lista = [c for c in casos(os.path.join(temporal, "graficos")) if not seleccion or c.nombre in seleccion]
+        for escala in escalas:
+            crudo = generar_sube(escala)
+            filas = len(crudo)
+            entradas = {"crudo": crudo}
+            if any(c.entrada == "csv" for c in lista):
+                entradas["csv"] = os.path.join(temporal, f"sube-x{escala:g}.csv")
+                crudo.to_csv(entradas["csv"], index=False)
+            if any(c.entrada == "enriquecido" for c in lista):
+                enriquecido = agregar_motivo_feriado(agregar_tipo_dia(crudo.copy(), FERIADOS_2024), MOTIVOS_2024)
+                entradas["enriquecido"] = aplicar_esquema(enriquecido)
+            print(f"── Escala x{escala:g}: {filas:,} filas")
+
+            for caso in lista:
+                if caso.legado and filas > max_filas_legado:
+                    print(f"   {caso.nombre:<26} omitido (más de {max_filas_legado:,} filas)")
+                    continue
+                tiempos = medir(caso.funcion, entradas[caso.entrada], repeticiones, copiar=caso.entrada != "csv")
+                resultados.append({
+                    "caso": caso.nombre, "escala": escala, "filas": filas, "repeticiones": repeticiones,
+                    "segundos_min": min(tiempos), "segundos_mediana": statistics.median(tiempos),
+                })
+                print(f"   {caso.nombre:<26} {min(tiempos):9.3f} s  ({filas / min(tiempos):,.0f} filas/s)")
+    return resultados
+
+
+def comparar(actuales, anteriores, umbral):
+    """Compara el mejor tiempo de cada caso y escala con una ejecución anterior; devuelve las regresiones."""
+    previos = {(r["caso"], r["escala"]): r for r in anteriores["resultados"]}
+    regresiones = []
+    print(f"\n── Comparación con la ejecución del {anteriores['fecha']}")
+    for r in actuales:
+        previo = previos.get((r["caso"], r["escala"]))
+        if previo is None:
+            continue
+        relacion = r["segundos_min"] / previo["segundos_min"]
+        marca = "⚠️ " if relacion > umbral else "  "
+        print(f"{marca} {r['caso']:<26} x{r['escala']:<5g} {previo['segundos_min']:9.3f} s → {r['segundos_min']:9.3f} s ({relacion:5.2f}x)")
+        if relacion > umbral:
+            regresiones.append(r["caso"])
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de las etapas del pipeline SUBE sobre datos sintéticos")
+    parser.add_argument("--escalas", type=float, nargs="+", default=[1], help="tamaños respecto de 2024 (ej. 1 10 100)")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--casos", nargs="*", help="correr solo estos casos")
+    parser.add_argument("--max-filas-legado", type=int, default=6_000_000,
+                        help="no medir las implementaciones originales por encima de esta cantidad de filas")
+    parser.add_argument("--salida", default="benchmark_pipeline.json", help="archivo JSON con los resultados")
+    parser.add_argument("--comparar", help="JSON de una ejecución anterior para detectar regresiones")
+    parser.add_argument("--umbral", type=float, default=1.2, help="relación de tiempos considerada regresión")
+    parser.add_argument("--directorio-temporal", help="dónde escribir el CSV de prueba (ocupa ~40 MB por escala 1)")
+    args = parser.parse_args()
+
+    resultados = ejecutar(args.escalas, args.repeticiones, args.max_filas_legado, args.casos, args.directorio_temporal)
+    informe = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "maquina": f"{platform.system()} {platform.machine()} ({os.cpu_count()} CPU)",
+        "resultados": resultados,
+    }
+    with open(args.salida, "w", encoding="utf-8") as archivo:
+        json.dump(informe, archivo, indent=2, ensure_ascii=False)
+    print(f"\n📁 Resultados guardados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            regresiones = comparar(resultados, json.load(archivo), args.umbral)
+        if regresiones:
+            sys.exit(f"❌ Regresiones de más de {args.umbral:g}x: {', '.join(regresiones)}")
+
+
+if __name__ == "__main__":
+    main()
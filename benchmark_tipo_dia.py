@@ -0,0 +1,69 @@
+import argparse          # Para leer los parámetros desde la línea de comandos
+import time              # Para medir tiempos de ejecución
+
+import numpy as np
+import pandas as pd
+
+from datos_sinteticos import FERIADOS_2024
+from tipo_dia import agregar_tipo_dia
+
+dias_traduccion = {
+    "Monday": "LUNES", "Tuesday": "MARTES", "Wednesday": "MIÉRCOLES",
+    "Thursday": "JUEVES", "Friday": "VIERNES", "Saturday": "SÁBADO", "Sunday": "DOMINGO"
+}
+
+
+def clasificar_con_apply(df, fechas_feriados):
+    """Camino original de api_tipo_dias2024.py: strftime y búsqueda en el set por cada fila."""
+    def clasificar_fecha(fecha):
+        fecha_str = fecha.strftime("%Y-%m-%d")
+        if fecha_str in fechas_feriados:
+            return "FERIADO"
+        elif fecha.weekday() >= 5:
+            return "FIN_DE_SEMANA"
+        else:
+            return "HÁBIL"
+
+    df["DIA_SEMANA"] = df["DIA_TRANSPORTE"].dt.day_name().map(dias_traduccion)
+    df["TIPO_DIA"] = df["DIA_TRANSPORTE"].apply(clasificar_fecha)
+    return df
+
+
+def medir(funcion, df, repeticiones):
+    """Devuelve el mejor tiempo (en segundos) y el resultado de la última ejecución."""
+    tiempos = []
+    for _ in range(repeticiones):
+        copia = df.copy()
+        inicio = time.perf_counter()
+        resultado = funcion(copia, FERIADOS_2024)
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos), resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la clasificación de tipo de día")
+    parser.add_argument("--filas", type=int, default=2_000_000, help="cantidad de filas sintéticas")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    # Fechas de 2024 repartidas al azar, como en el dataset SUBE (varias líneas por día)
+    rng = np.random.default_rng(0)
+    fechas = pd.date_range("2024-01-01", "2024-12-31", freq="D")
+    df = pd.DataFrame({"DIA_TRANSPORTE": fechas[rng.integers(0, len(fechas), args.filas)]})
+
+    t_apply, esperado = medir(clasificar_con_apply, df, args.repeticiones)
+    t_vector, obtenido = medir(agregar_tipo_dia, df, args.repeticiones)
+
+    # Ambos caminos deben producir exactamente las mismas etiquetas
+    for columna in ["DIA_SEMANA", "TIPO_DIA"]:
+        if not esperado[columna].equals(obtenido[columna].astype(object)):
+            raise SystemExit(f"❌ La columna {columna} no coincide con el camino original")
+
+    print(f"Filas: {args.filas:,}")
+    print(f"apply (original):  {t_apply:8.3f} s")
+    print(f"vectorizado:       {t_vector:8.3f} s")
+    print(f"Aceleración:       {t_apply / t_vector:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
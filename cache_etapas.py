@@ -0,0 +1,279 @@
+import argparse          # Para ver o vaciar la caché desde la línea de comandos
+import hashlib           # Para calcular las huellas de entradas, parámetros y código
+import inspect           # Para incluir el código de las funciones en la huella
+import json              # Para registrar las salidas ya generadas
+import os                # Para manejar rutas y reemplazar archivos de forma atómica
+import pickle            # Para guardar los resultados de cada etapa
+import time              # Para esperar el turno de escritura del registro de salidas
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+DIRECTORIO_CACHE = ".cache_etapas"
+TAMANIO_MAXIMO = 2 * 1024**3          # 2 GB; al superarlo se borran los resultados usados hace más tiempo
+ARCHIVO_SALIDAS = "_salidas.json"     # huella con la que se generó cada archivo de salida
+ARCHIVO_DIGESTOS = "_digestos.json"   # digesto del contenido de cada archivo de entrada o salida
+BLOQUE_LECTURA = 8 * 1024**2          # 8 MB por lectura al calcular el digesto de un archivo
+
+_DIGESTOS = {}                        # digestos ya calculados o leídos en este proceso
+
+
+# ----- H U E L L A S -----
+def actualizar_huella(h, valor):
+    """Agrega `valor` al hash: DataFrames/Series por contenido, colecciones recursivamente."""
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        h.update(pd.util.hash_pandas_object(valor, index=True).to_numpy().tobytes())
+        if isinstance(valor, pd.DataFrame):
+            h.update(repr((list(valor.columns), list(valor.index.names), valor.dtypes.astype(str).tolist())).encode())
+        else:
+            h.update(repr((valor.name, list(valor.index.names), str(valor.dtype))).encode())
+    elif isinstance(valor, np.ndarray):
+        h.update(str(valor.dtype).encode())
+        h.update(np.ascontiguousarray(valor).tobytes())
+    elif isinstance(valor, dict):
+        for clave in sorted(valor, key=repr):
+            h.update(repr(clave).encode())
+            actualizar_huella(h, valor[clave])
+    elif isinstance(valor, (list, tuple)):
+        h.update(f"[{len(valor)}]".encode())
+        for elemento in valor:
+            actualizar_huella(h, elemento)
+    else:
+        h.update(repr(valor).encode())
+
+
+def huella(*partes):
+    """Huella (sha256) de cualquier combinación de valores, DataFrames, huellas de archivos y de código."""
+    h = hashlib.sha256()
+    actualizar_huella(h, partes)
+    return h.hexdigest()
+
+
+def _leer_digestos(directorio):
+    try:
+        with open(os.path.join(directorio, ARCHIVO_DIGESTOS), encoding="utf-8") as archivo:
+            return json.load(archivo)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _guardar_digesto(directorio, ruta, registro):
+    """Agrega un digesto al registro; si dos procesos escriben a la vez se pierde uno, que solo se vuelve a calcular."""
+    os.makedirs(directorio, exist_ok=True)
+    digestos = _leer_digestos(directorio)
+    digestos[ruta] = registro
+    temporal = os.path.join(directorio, f"{ARCHIVO_DIGESTOS}.{os.getpid()}.tmp")
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        json.dump(digestos, archivo, indent=2, sort_keys=True)
+    os.replace(temporal, os.path.join(directorio, ARCHIVO_DIGESTOS))
+
+
+def digesto_archivo(ruta, directorio=DIRECTORIO_CACHE, bloque=BLOQUE_LECTURA):
+    """Digesto blake2b del contenido de un archivo, leído de a `bloque` bytes.
+
+    El resultado se guarda por ruta junto con el tamaño y la fecha de modificación:
+    mientras no cambien, no se vuelve a leer el archivo.
+    """
+    ruta = os.path.abspath(ruta)
+    estado = os.stat(ruta)
+    firma = [estado.st_size, estado.st_mtime_ns]
+    registro = _DIGESTOS.get(ruta) or _leer_digestos(directorio).get(ruta)
+    if registro is not None and registro["firma"] == firma:
+        _DIGESTOS[ruta] = registro
+        return registro["digesto"]
+
+    h = hashlib.blake2b()
+    with open(ruta, "rb") as archivo:
+        while datos := archivo.read(bloque):
+            h.update(datos)
+    registro = {"firma": firma, "digesto": h.hexdigest()}
+    _DIGESTOS[ruta] = registro
+    _guardar_digesto(directorio, ruta, registro)
+    return registro["digesto"]
+
+
+def huella_archivo(ruta, directorio=DIRECTORIO_CACHE):
+    """Identifica un archivo por su contenido (ver digesto_archivo): copiarlo, moverlo o tocarlo no cambia la huella."""
+    return ("archivo", digesto_archivo(ruta, directorio))
+
+
+def huella_codigo(*objetos):
+    """Código fuente de funciones, clases o módulos: si cambia el código, cambia la huella."""
+    return tuple(("codigo", getattr(o, "__qualname__", o.__name__), inspect.getsource(o)) for o in objetos)
+
+
+# ----- R E S U L T A D O S   E N   D I S C O -----
+def ruta_resultado(etapa, clave, directorio=DIRECTORIO_CACHE):
+    return os.path.join(directorio, f"{etapa}-{clave[:16]}.pkl")
+
+
+def tamanio_cache(directorio=DIRECTORIO_CACHE):
+    """Bytes ocupados por los resultados guardados."""
+    if not os.path.isdir(directorio):
+        return 0
+    return sum(e.stat().st_size for e in os.scandir(directorio) if e.name.endswith(".pkl"))
+
+
+def podar(directorio=DIRECTORIO_CACHE, tamanio_maximo=TAMANIO_MAXIMO):
+    """Borra los resultados usados hace más tiempo hasta que la caché entre en `tamanio_maximo` bytes."""
+    if not os.path.isdir(directorio):
+        return []
+    entradas = sorted(
+        (e for e in os.scandir(directorio) if e.name.endswith(".pkl")),
+        key=lambda e: e.stat().st_mtime,
+    )
+    total = sum(e.stat().st_size for e in entradas)
+    borrados = []
+    for entrada in entradas:
+        if total <= tamanio_maximo:
+            break
+        total -= entrada.stat().st_size
+        try:
+            os.remove(entrada.path)
+        except FileNotFoundError:    # otro proceso ya lo borró
+            continue
+        borrados.append(entrada.name)
+    return borrados
+
+
+def memoizar(etapa, clave, calcular, directorio=DIRECTORIO_CACHE, tamanio_maximo=TAMANIO_MAXIMO):
+    """Devuelve el resultado de `calcular()` guardado para (`etapa`, `clave`), o lo calcula y lo guarda.
+
+    `clave` es una huella de todo lo que determina el resultado (ver huella,
+    huella_archivo y huella_codigo). Cada uso de un resultado actualiza su fecha de
+    modificación, de modo que al superar `tamanio_maximo` se borran primero los
+    que no se usan hace más tiempo.
+    """
+    ruta = ruta_resultado(etapa, clave, directorio)
+    try:
+        with open(ruta, "rb") as archivo:
+            resultado = pickle.load(archivo)
+        os.utime(ruta)
+        return resultado
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        pass
+
+    resultado = calcular()
+    os.makedirs(directorio, exist_ok=True)
+    temporal = f"{ruta}.{os.getpid()}.tmp"    # varios procesos pueden calcular etapas a la vez
+    with open(temporal, "wb") as archivo:
+        pickle.dump(resultado, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporal, ruta)
+    podar(directorio, tamanio_maximo)
+    return resultado
+
+
+# ----- S A L I D A S   Y A   G E N E R A D A S -----
+# Para las etapas que escriben archivos grandes (ej. el dataset enriquecido) no se guarda una copia:
+# se registra con qué huella se generó cada archivo y se lo reutiliza si la huella no cambió
+def _leer_salidas(directorio):
+    try:
+        with open(os.path.join(directorio, ARCHIVO_SALIDAS), encoding="utf-8") as archivo:
+            return json.load(archivo)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def salida_vigente(ruta, clave, directorio=DIRECTORIO_CACHE):
+    """Indica si `ruta` existe, no se modificó y se generó con la misma `clave`."""
+    registro = _leer_salidas(directorio).get(os.path.abspath(ruta))
+    return (
+        registro is not None and os.path.exists(ruta)
+        and registro["clave"] == clave and registro["archivo"] == list(huella_archivo(ruta, directorio))
+    )
+
+
+@contextmanager
+def _bloqueo(directorio, espera=0.05, vencimiento=30):
+    """Turno exclusivo para actualizar el registro de salidas entre procesos (archivo .lock creado con O_EXCL).
+
+    El archivo guarda una marca propia de este proceso, y al terminar solo se borra si
+    todavía es la nuestra. Un bloqueo con más de `vencimiento` segundos (de una
+    ejecución interrumpida) se descarta; mientras tanto se espera el turno.
+    """
+    ruta = os.path.join(directorio, ARCHIVO_SALIDAS + ".lock")
+    marca = f"{os.getpid()}-{time.time_ns()}".encode()
+    while True:
+        try:
+            descriptor = os.open(ruta, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if not _descartar_vencido(ruta, vencimiento):
+                time.sleep(espera)
+            continue
+        with os.fdopen(descriptor, "wb") as archivo:
+            archivo.write(marca)
+        break
+    try:
+        yield
+    finally:
+        if _leer_marca(ruta) == marca:
+            os.remove(ruta)
+
+
+def _leer_marca(ruta):
+    try:
+        with open(ruta, "rb") as archivo:
+            return archivo.read()
+    except FileNotFoundError:
+        return None
+
+
+def _descartar_vencido(ruta, vencimiento):
+    """Borra el bloqueo si tiene más de `vencimiento` segundos; devuelve True si ya no existe.
+
+    Primero se lo aparta con un nombre propio (os.replace es atómico: solo un proceso
+    puede apartar cada archivo) y se verifica que el apartado sea el vencido: si otro
+    proceso llegó a tomar el turno en el medio, se le devuelve su bloqueo.
+    """
+    try:
+        vencido = _leer_marca(ruta), os.stat(ruta).st_mtime
+    except FileNotFoundError:
+        return True
+    if time.time() - vencido[1] <= vencimiento:
+        return False
+    apartado = f"{ruta}.{os.getpid()}.vencido"
+    try:
+        os.replace(ruta, apartado)
+    except FileNotFoundError:
+        return True
+    if (_leer_marca(apartado), os.stat(apartado).st_mtime) != vencido:
+        try:
+            os.link(apartado, ruta)       # falla si ya hay otro bloqueo: entonces el turno es de ese proceso
+        except FileExistsError:
+            pass
+    os.remove(apartado)
+    return True
+
+
+def registrar_salida(ruta, clave, directorio=DIRECTORIO_CACHE):
+    """Anota que `ruta` se generó con `clave` (se puede llamar desde varios procesos a la vez)."""
+    os.makedirs(directorio, exist_ok=True)
+    registro = {"clave": clave, "archivo": list(huella_archivo(ruta, directorio))}
+    with _bloqueo(directorio):
+        salidas = _leer_salidas(directorio)
+        salidas[os.path.abspath(ruta)] = registro
+        temporal = os.path.join(directorio, ARCHIVO_SALIDAS + ".tmp")
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            json.dump(salidas, archivo, indent=2, sort_keys=True)
+        os.replace(temporal, os.path.join(directorio, ARCHIVO_SALIDAS))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Caché de resultados de las etapas del pipeline SUBE")
+    parser.add_argument("--vaciar", action="store_true", help="borrar todos los resultados guardados")
+    parser.add_argument("--maximo-mb", type=float, help="podar la caché hasta este tamaño")
+    args = parser.parse_args()
+
+    if args.vaciar:
+        podar(tamanio_maximo=0)
+        for registro in (ARCHIVO_SALIDAS, ARCHIVO_DIGESTOS):
+            if os.path.exists(os.path.join(DIRECTORIO_CACHE, registro)):
+                os.remove(os.path.join(DIRECTORIO_CACHE, registro))
+    elif args.maximo_mb is not None:
+        podar(tamanio_maximo=int(args.maximo_mb * 2**20))
+    print(f"📦 {DIRECTORIO_CACHE}: {tamanio_cache() / 2**20:,.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import json              # Para guardar los feriados en disco
+import os                # Para manejar rutas y reemplazar archivos de forma atómica
+import time              # Para controlar la antigüedad de cada entrada
+from datetime import datetime
+
+import requests          # Solo para reconocer los errores de red
+
+DIRECTORIO_CACHE = ".cache_feriados"
+TTL_POR_DEFECTO = 24 * 60 * 60    # un día, para el año en curso y los futuros
+
+
+def ruta_cache(fuente, anio, directorio=DIRECTORIO_CACHE):
+    """Archivo donde se guardan los feriados de una fuente para un año (ej. .cache_feriados/lanacion-2024.json)."""
+    return os.path.join(directorio, f"{fuente}-{anio}.json")
+
+
+def leer_cache(fuente, anio, directorio=DIRECTORIO_CACHE):
+    """Devuelve la entrada guardada ({"obtenido": ..., "feriados": {...}}) o None si no existe."""
+    try:
+        with open(ruta_cache(fuente, anio, directorio), encoding="utf-8") as archivo:
+            return json.load(archivo)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def guardar_cache(fuente, anio, feriados, directorio=DIRECTORIO_CACHE, ahora=None):
+    """Guarda el mapeo fecha → motivo junto con el momento en que se obtuvo."""
+    os.makedirs(directorio, exist_ok=True)
+    entrada = {"fuente": fuente, "anio": anio, "obtenido": ahora or time.time(), "feriados": feriados}
+    ruta = ruta_cache(fuente, anio, directorio)
+    temporal = ruta + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        json.dump(entrada, archivo, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(temporal, ruta)    # reemplazo atómico: nunca queda un JSON a medio escribir
+    return entrada
+
+
+def es_vigente(entrada, anio, ttl=TTL_POR_DEFECTO, ahora=None):
+    """Una entrada obtenida después de terminado su año no cambia más; el resto vence a los `ttl` segundos."""
+    obtenido = entrada["obtenido"]
+    if datetime.fromtimestamp(obtenido).year > anio:
+        return True
+    return (ahora or time.time()) - obtenido < ttl
+
+
+def feriados_con_cache(fuente, anio, descargar, ttl=TTL_POR_DEFECTO, refrescar=False,
+                       directorio=DIRECTORIO_CACHE):
+    """Devuelve los feriados de `fuente` para `anio`, descargándolos solo si hace falta.
+
+    - Con la caché vigente no se hace ninguna petición.
+    - `refrescar=True` fuerza la descarga aunque la caché esté vigente.
+    - Si la descarga falla por un problema de red y hay una copia local (aunque
+      esté vencida), se usa esa copia.
+    - Un PermissionError (ej. el robots.txt del sitio no permite la descarga) no es un
+      problema de red: se propaga siempre, sin usar la copia local.
+    `descargar` es una función anio → {"YYYY-MM-DD": motivo}.
+    """
+    entrada = leer_cache(fuente, anio, directorio)
+    if entrada and not refrescar and es_vigente(entrada, anio, ttl):
+        return entrada["feriados"]
+
+    try:
+        feriados = descargar(anio)
+    except PermissionError:
+        raise                    # subclase de OSError, pero es una negativa del sitio, no una falla de red
+    except (requests.RequestException, OSError) as e:
+        if entrada is None:
+            raise
+        print(f"⚠️ No se pudo actualizar {fuente} {anio} ({e}); se usa la copia local")
+        return entrada["feriados"]
+
+    guardar_cache(fuente, anio, feriados, directorio)
+    return feriados
@@ -0,0 +1,109 @@
+import numpy as np       # Para operar sobre arreglos de códigos sin recorrer fila por fila
+import pandas as pd      # Para manipulación y análisis de datos en DataFrames
+
+SIN_FERIADO = "NO FERIADO"    # valor de MOTIVO_FERIADO en las fechas que no son feriado
+
+
+class CalendarioFeriados:
+    """Feriados indexados por fecha (datetime64) con su motivo.
+
+    Todas las consultas sobre una columna de fechas se resuelven sobre las fechas
+    únicas (unas 366 por año) y se propagan a las filas con los códigos de
+    pd.factorize, sin formatear cada fecha como texto.
+    """
+
+    def __init__(self, motivos):
+        """`motivos`: {fecha: motivo}, con fechas como texto "YYYY-MM-DD" o Timestamp."""
+        serie = pd.Series(list(motivos.values()), index=pd.to_datetime(list(motivos.keys())), dtype=object)
+        serie.index = serie.index.normalize()
+        self.motivos = serie[~serie.index.duplicated(keep="first")].sort_index()
+
+    @classmethod
+    def desde_fechas(cls, fechas, motivo="FERIADO"):
+        """Calendario a partir de un conjunto de fechas sin motivo (ej. las de Nager.Date para TIPO_DIA)."""
+        return cls({fecha: motivo for fecha in fechas})
+
+    def __len__(self):
+        return len(self.motivos)
+
+    def __contains__(self, fecha):
+        return pd.Timestamp(fecha).normalize() in self.motivos.index
+
+    # ----- T A B L A   P O R   F E C H A   Ú N I C A -----
+    def tabla(self, fechas):
+        """Motivo y predicados de cada fecha de `fechas` (índice: las fechas, sin repetir).
+
+        - MOTIVO_FERIADO: motivo del feriado o "NO FERIADO".
+        - ES_FERIADO: la fecha es feriado.
+        - ES_NO_LABORABLE: feriado, sábado o domingo.
+        - DIAS_NO_LABORABLES: largo del tramo de días no laborables consecutivos que la contiene (0 si es laborable).
+        - FIN_DE_SEMANA_LARGO: forma parte de un tramo de 3 o más días no laborables.
+        - ES_PUENTE: día laborable entre dos días no laborables (candidato a "día puente").
+        """
+        unicas = pd.DatetimeIndex(fechas).dropna().normalize().unique().sort_values()
+        if unicas.empty:
+            return pd.DataFrame(
+                columns=["MOTIVO_FERIADO", "ES_FERIADO", "ES_NO_LABORABLE", "DIAS_NO_LABORABLES",
+                         "FIN_DE_SEMANA_LARGO", "ES_PUENTE"],
+                index=unicas,
+            )
+
+        # Los predicados dependen de los días vecinos: se evalúan sobre un rango continuo con margen
+        rango = pd.date_range(unicas[0] - pd.Timedelta(days=10), unicas[-1] + pd.Timedelta(days=10), freq="D")
+        posicion_motivo = self.motivos.index.get_indexer(rango)
+        es_feriado = posicion_motivo >= 0
+        no_laborable = es_feriado | (rango.weekday >= 5)
+
+        # Tramos de días consecutivos con el mismo estado (laborable / no laborable) y su largo
+        tramo = np.concatenate([[0], np.cumsum(no_laborable[1:] != no_laborable[:-1])])
+        largo = np.bincount(tramo)[tramo]
+        dias_no_laborables = np.where(no_laborable, largo, 0)
+        anterior = np.concatenate([[False], no_laborable[:-1]])
+        siguiente = np.concatenate([no_laborable[1:], [False]])
+        es_puente = ~no_laborable & anterior & siguiente
+
+        # Solo se indexan los motivos de las fechas que son feriado: con un calendario vacío
+        # (ej. la página de feriados no publicada todavía) todas las fechas quedan "NO FERIADO"
+        motivo = np.full(len(rango), SIN_FERIADO, dtype=object)
+        motivo[es_feriado] = self.motivos.to_numpy()[posicion_motivo[es_feriado]]
+        posiciones = rango.get_indexer(unicas)
+        return pd.DataFrame(
+            {
+                "MOTIVO_FERIADO": motivo[posiciones],
+                "ES_FERIADO": es_feriado[posiciones],
+                "ES_NO_LABORABLE": no_laborable[posiciones],
+                "DIAS_NO_LABORABLES": dias_no_laborables[posiciones],
+                "FIN_DE_SEMANA_LARGO": dias_no_laborables[posiciones] >= 3,
+                "ES_PUENTE": es_puente[posiciones],
+            },
+            index=unicas,
+        )
+
+    # ----- C O L U M N A S   P O R   F I L A -----
+    def atributos(self, fechas, columnas=None):
+        """Columnas de `tabla` alineadas con cada fila de `fechas` (Serie de fechas, puede tener nulos).
+
+        MOTIVO_FERIADO queda categórica; las filas con fecha nula quedan con motivo nulo
+        y los predicados en False.
+        """
+        codigos, unicas = pd.factorize(fechas)
+        tabla = self.tabla(unicas)
+        # factorize no normaliza: se ubica cada fecha única (con hora o no) en la tabla por día
+        posiciones = tabla.index.get_indexer(pd.DatetimeIndex(unicas).normalize())
+        filas = np.append(posiciones, -1)[codigos]    # el código -1 (fecha nula) apunta a la fila agregada
+        columnas = columnas or list(tabla.columns)
+
+        resultado = {}
+        for columna in columnas:
+            if columna == "MOTIVO_FERIADO":
+                motivos_codigos, categorias = pd.factorize(tabla[columna])
+                resultado[columna] = pd.Categorical.from_codes(np.append(motivos_codigos, -1)[filas], categorias)
+            else:
+                valores = tabla[columna].to_numpy()
+                resultado[columna] = np.append(valores, np.zeros(1, dtype=valores.dtype))[filas]
+        return pd.DataFrame(resultado, index=fechas.index)
+
+    def agregar_motivo(self, df, columna="DIA_TRANSPORTE"):
+        """Agrega la columna MOTIVO_FERIADO al DataFrame (lo modifica y lo devuelve)."""
+        df["MOTIVO_FERIADO"] = self.atributos(df[columna], ["MOTIVO_FERIADO"])["MOTIVO_FERIADO"]
+        return df
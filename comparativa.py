@@ -0,0 +1,236 @@
+import argparse          # Para elegir los años y las dimensiones desde la línea de comandos
+
+import numpy as np       # Para elegir la fecha de referencia sin recorrer fecha por fecha
+import pandas as pd      # Para manipulación y análisis de datos en DataFrames
+
+import almacenamiento
+import limpieza
+from agregados_eda import construir_cubo_diario
+from almacenamiento import leer_dataset, ruta_dataset
+from cache_etapas import huella, huella_archivo, huella_codigo, memoizar
+from limpieza import aplicar_reglas, columnas_reglas
+
+# Dimensiones del agregado diario de cada año: alcanzan para comparar por tipo de transporte,
+# línea y jurisdicción, y para alinear los calendarios (TIPO_DIA y MOTIVO_FERIADO dependen de la fecha)
+DIMENSIONES_COMPARATIVA = ["DIA_TRANSPORTE", "TIPO_TRANSPORTE", "JURISDICCION", "LINEA", "TIPO_DIA", "MOTIVO_FERIADO"]
+
+# Desplazamientos (en días) para buscar la fecha equivalente del año anterior, en orden de preferencia:
+# 52 semanas antes (mismo día de la semana) y, si el tipo de día no coincide, una o dos semanas más o menos
+DESPLAZAMIENTOS = [364, 357, 371, 350, 378]
+
+# Cómo se eligió la fecha de referencia de cada día
+CRITERIOS = ["MISMO_FERIADO", "MISMA_SEMANA", "SEMANA_VECINA", "SIN_PAR"]
+
+
+# ----- A G R E G A D O S   P O R   A Ñ O -----
+def agregado_anual(ruta):
+    """Viajes por fecha, tipo de transporte, jurisdicción y línea de un dataset enriquecido (ya limpio).
+
+    Se leen solo las columnas necesarias y se memoriza el resultado en .cache_etapas/
+    (ver cache_etapas.py): comparar años ya agregados no vuelve a leer los datasets.
+    """
+    def calcular():
+        df, _ = aplicar_reglas(leer_dataset(ruta, columnas=columnas_agregado()))
+        return construir_cubo_diario(df, DIMENSIONES_COMPARATIVA)
+
+    return memoizar("agregado_anual", clave_agregado_anual(ruta), calcular)
+
+
+def columnas_agregado():
+    """Columnas que hay que leer para el agregado anual: dimensiones, las que usan las reglas y CANTIDAD."""
+    return list(dict.fromkeys(DIMENSIONES_COMPARATIVA + columnas_reglas() + ["CANTIDAD"]))
+
+
+def clave_agregado_anual(ruta):
+    """Huella con la que se memoriza el agregado anual de `ruta`: el archivo y el código que lo calcula."""
+    return huella(huella_archivo(ruta), huella_codigo(almacenamiento, limpieza, construir_cubo_diario, agregado_anual))
+
+
+def calendario(agregado):
+    """Tipo de día y motivo de feriado de cada fecha del agregado (una fila por fecha)."""
+    return (
+        agregado.groupby("DIA_TRANSPORTE", sort=True)[["TIPO_DIA", "MOTIVO_FERIADO"]]
+        .first()
+    )
+
+
+# ----- A L I N E A C I Ó N   D E   C A L E N D A R I O S -----
+def alinear_calendarios(actual, base):
+    """Fecha equivalente del año `base` para cada fecha del año `actual`.
+
+    `actual` y `base` son calendarios (ver `calendario`). Cada fecha se compara con:
+    - MISMO_FERIADO: un feriado, con el feriado del mismo motivo del año base aunque
+      cambie de fecha o de día de la semana (los feriados repetidos, como los dos días de
+      Carnaval, se emparejan en orden).
+    - MISMA_SEMANA: el resto, con la fecha de 52 semanas antes (mismo día de la semana),
+      si tiene el mismo tipo de día.
+    - SEMANA_VECINA: si no, con el mismo día de la semana una o dos semanas antes o
+      después que tenga el mismo tipo de día (ej. un lunes hábil cuyo par era feriado).
+    - SIN_PAR: si ninguna cumple o la fecha de referencia no está en los datos del año base.
+
+    Devuelve un DataFrame con FECHA, FECHA_BASE, TIPO_DIA y CRITERIO.
+    """
+    fechas = actual.index
+    tipos = actual["TIPO_DIA"].astype(object).to_numpy()
+    tipos_base = base["TIPO_DIA"].astype(object)
+
+    # Feriados con motivo: se emparejan por (motivo, número de aparición en el año)
+    def con_orden(cal):
+        feriados = cal[(cal["TIPO_DIA"] == "FERIADO") & (cal["MOTIVO_FERIADO"] != "NO FERIADO")]
+        motivos = feriados["MOTIVO_FERIADO"].astype(object)
+        return pd.MultiIndex.from_arrays([motivos, motivos.groupby(motivos).cumcount()]), feriados.index
+
+    claves_actual, feriados_actual = con_orden(actual)
+    claves_base, feriados_base = con_orden(base)
+    posiciones = claves_base.get_indexer(claves_actual)
+    por_motivo = pd.Series(pd.NaT, index=fechas, dtype="datetime64[ns]")
+    por_motivo[feriados_actual[posiciones >= 0]] = feriados_base[posiciones[posiciones >= 0]]
+
+    # Resto de las fechas: primer desplazamiento cuya fecha existe en el año base con el mismo tipo de día
+    candidatas = np.stack([fechas - pd.Timedelta(days=dias) for dias in DESPLAZAMIENTOS], axis=1)
+    tipo_candidatas = tipos_base.reindex(candidatas.ravel()).to_numpy().reshape(candidatas.shape)
+    valida = tipo_candidatas == tipos[:, None]
+    primera = valida.argmax(axis=1)
+    hay_valida = valida.any(axis=1)
+    por_semana = np.where(hay_valida, candidatas[np.arange(len(fechas)), primera], np.datetime64("NaT"))
+
+    emparejado = por_motivo.notna().to_numpy()
+    fecha_base = np.where(emparejado, por_motivo.to_numpy(), por_semana)
+    criterio = np.select(
+        [emparejado, hay_valida & (primera == 0), hay_valida],
+        CRITERIOS[:3],
+        default="SIN_PAR",
+    )
+    return pd.DataFrame({
+        "FECHA": fechas,
+        "FECHA_BASE": pd.to_datetime(fecha_base),
+        "TIPO_DIA": actual["TIPO_DIA"].to_numpy(),
+        "CRITERIO": pd.Categorical(criterio, categories=CRITERIOS),
+    })
+
+
+# ----- V A R I A C I Ó N   I N T E R A N U A L -----
+def _sumar_por_fecha(agregado, fechas, columna_fecha, por):
+    """Viajes de las fechas pedidas (una fecha puede repetirse si es referencia de varias), por `por`."""
+    seleccion = pd.DataFrame({columna_fecha: fechas}).merge(
+        agregado, left_on=columna_fecha, right_on="DIA_TRANSPORTE", how="inner"
+    )
+    if not por:
+        return pd.Series({"TOTAL": seleccion["CANTIDAD"].sum()})
+    return seleccion.groupby(por, observed=True, sort=True)["CANTIDAD"].sum()
+
+
+def variacion_interanual(actual, base, alineacion, por):
+    """Viajes de las fechas alineadas en ambos años y su variación, agrupados por `por`.
+
+    Solo se suman las fechas con par (criterio distinto de SIN_PAR), así los dos años
+    cubren la misma cantidad de días de cada tipo aunque un año esté incompleto.
+    Devuelve VIAJES_BASE, VIAJES, DIFERENCIA y VARIACION_PCT (NaN si el grupo no existía en el año base).
+    """
+    por = [por] if isinstance(por, str) else list(por)
+    pares = alineacion[alineacion["CRITERIO"] != "SIN_PAR"]
+    resultado = pd.concat(
+        {
+            "VIAJES_BASE": _sumar_por_fecha(base, pares["FECHA_BASE"], "FECHA_BASE", por),
+            "VIAJES": _sumar_por_fecha(actual, pares["FECHA"], "FECHA", por),
+        },
+        axis=1,
+    ).fillna(0).astype("int64")
+    resultado["DIFERENCIA"] = resultado["VIAJES"] - resultado["VIAJES_BASE"]
+    resultado["VARIACION_PCT"] = (resultado["DIFERENCIA"] / resultado["VIAJES_BASE"].replace(0, np.nan) * 100).round(2)
+    return resultado
+
+
+def promedio_diario_por_tipo_dia(agregado, fechas):
+    """Promedio de viajes por día de cada tipo de día, sobre las fechas pedidas."""
+    diarios = agregado[agregado["DIA_TRANSPORTE"].isin(fechas)].groupby(
+        ["DIA_TRANSPORTE", "TIPO_DIA"], observed=True
+    )["CANTIDAD"].sum()
+    return diarios.groupby(level="TIPO_DIA", observed=True).mean()
+
+
+class Comparativa:
+    """Comparación de un año contra un año base a partir de sus agregados diarios.
+
+    Guarda solo los dos agregados y la alineación de fechas; los datasets completos
+    no se cargan nunca al mismo tiempo.
+    """
+
+    def __init__(self, actual, base, anio, anio_base):
+        self.actual, self.base = actual, base
+        self.anio, self.anio_base = anio, anio_base
+        self.alineacion = alinear_calendarios(calendario(actual), calendario(base))
+
+    @classmethod
+    def desde_datasets(cls, ruta, ruta_base, anio, anio_base):
+        return cls(agregado_anual(ruta), agregado_anual(ruta_base), anio, anio_base)
+
+    def periodo(self):
+        """Primera y última fecha del año actual con datos."""
+        return self.alineacion["FECHA"].min(), self.alineacion["FECHA"].max()
+
+    def resumen_alineacion(self):
+        """Cantidad de fechas por tipo de día y criterio de alineación."""
+        return pd.crosstab(self.alineacion["TIPO_DIA"], self.alineacion["CRITERIO"])
+
+    def feriados_desplazados(self):
+        """Feriados emparejados por motivo cuya fecha o día de la semana cambió respecto del año base."""
+        feriados = self.alineacion[self.alineacion["CRITERIO"] == "MISMO_FERIADO"].copy()
+        feriados["MOTIVO_FERIADO"] = calendario(self.actual)["MOTIVO_FERIADO"].reindex(feriados["FECHA"]).to_numpy()
+        mismo_dia = (feriados["FECHA"] - feriados["FECHA_BASE"]).dt.days == 364
+        return feriados[~mismo_dia][["MOTIVO_FERIADO", "FECHA", "FECHA_BASE"]].reset_index(drop=True)
+
+    def variacion(self, *por):
+        """Variación interanual agrupada por las dimensiones pedidas (ej. "TIPO_TRANSPORTE", "LINEA")."""
+        return variacion_interanual(self.actual, self.base, self.alineacion, por)
+
+    def promedio_por_tipo_dia(self):
+        """Viajes promedio por día de cada tipo en ambos años, sobre las fechas alineadas."""
+        pares = self.alineacion[self.alineacion["CRITERIO"] != "SIN_PAR"]
+        tabla = pd.DataFrame({
+            self.anio_base: promedio_diario_por_tipo_dia(self.base, pares["FECHA_BASE"]),
+            self.anio: promedio_diario_por_tipo_dia(self.actual, pares["FECHA"]),
+        })
+        tabla["VARIACION_PCT"] = ((tabla[self.anio] / tabla[self.anio_base] - 1) * 100).round(2)
+        return tabla
+
+
+def comparar_anios(anios, por, rutas=None, agregados=None):
+    """Variación de cada año contra el anterior para una lista de años (ej. [2023, 2024, 2025]).
+
+    En memoria hay a lo sumo dos agregados anuales a la vez. Si ya se calcularon
+    (ej. en pipeline_paralelo.py) se pueden pasar en `agregados` ({anio: agregado}).
+    Devuelve una tabla con ANIO_BASE y ANIO como primeras columnas.
+    """
+    anios = sorted(anios)
+    if agregados is None:
+        rutas = rutas or {anio: ruta_dataset(f"df-sube-{anio}") for anio in anios}
+
+    def obtener(anio):
+        return agregados[anio] if agregados is not None else agregado_anual(rutas[anio])
+
+    partes = []
+    anterior = obtener(anios[0])
+    for anio_base, anio in zip(anios, anios[1:]):
+        actual = obtener(anio)
+        tabla = Comparativa(actual, anterior, anio, anio_base).variacion(*por).reset_index()
+        tabla.insert(0, "ANIO", anio)
+        tabla.insert(0, "ANIO_BASE", anio_base)
+        partes.append(tabla)
+        anterior = actual
+    return pd.concat(partes, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Variación interanual de viajes SUBE sobre calendarios alineados")
+    parser.add_argument("anios", nargs="+", type=int, help="años a comparar, cada uno contra el anterior (usa df-sube-AAAA)")
+    parser.add_argument("--por", nargs="*", default=["TIPO_TRANSPORTE"], help="dimensiones del resultado")
+    args = parser.parse_args()
+
+    if len(args.anios) < 2:
+        parser.error("se necesitan al menos dos años")
+    print(comparar_anios(args.anios, args.por).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import argparse
+
+from almacenamiento import ruta_dataset
+from comparativa import Comparativa
+from instrumentacion import iniciar, seccion
+import graficos_eda as ge
+
+# Años a comparar: 2025 (publicado día a día, incompleto) contra el mismo período de 2024
+ANIO, ANIO_BASE = 2025, 2024
+
+# Cantidad de líneas con mayor caída y mayor crecimiento que se muestran
+TOP_LINEAS = 10
+
+parser = argparse.ArgumentParser(description="Comparación interanual SUBE 2025 vs 2024")
+parser.add_argument("--informe", help="guardar el tiempo, la memoria y las filas de cada sección en este JSON")
+parser.add_argument("--perfil", help="guardar un perfil de cProfile de toda la comparación en este archivo")
+args = parser.parse_args()
+instrumentacion = iniciar("comparativa_2025vs2024", perfil=bool(args.perfil))
+
+graficos = []
+
+
+# 1️⃣ ----- A G R E G A D O S   D I A R I O S   D E   C A D A   A Ñ O -----
+# No se concatenan los datasets: de cada año se guarda solo la suma de viajes por fecha, tipo de
+# transporte, jurisdicción y línea (ver comparativa.agregado_anual, memorizado en .cache_etapas/)
+with seccion("1. Agregados diarios por año", filas=lambda: len(comparativa.actual) + len(comparativa.base)):
+    comparativa = Comparativa.desde_datasets(
+        ruta_dataset(f"df-sube-{ANIO}"), ruta_dataset(f"df-sube-{ANIO_BASE}"), ANIO, ANIO_BASE
+    )
+    desde, hasta = comparativa.periodo()
+    print("─" * 80 + f"\nPERÍODO COMPARADO: {desde:%d/%m/%Y} a {hasta:%d/%m/%Y} contra las fechas equivalentes de {ANIO_BASE}\n")
+
+
+# 2️⃣ ----- A L I N E A C I Ó N   D E   C A L E N D A R I O S -----
+# Cada fecha de 2025 se compara con la de 2024 del mismo día de la semana y tipo de día;
+# los feriados se comparan con el mismo feriado de 2024 aunque haya cambiado de fecha
+with seccion("2. Alineación de calendarios", filas=lambda: len(comparativa.alineacion)):
+    print("─" * 80 + "\nFECHAS POR TIPO DE DÍA Y CRITERIO DE ALINEACIÓN\n")
+    print(comparativa.resumen_alineacion())
+
+    print("─" * 80 + "\nFERIADOS QUE CAMBIARON DE FECHA O DE DÍA DE LA SEMANA\n")
+    desplazados = comparativa.feriados_desplazados()
+    print(desplazados.to_string(index=False) if not desplazados.empty else "Ninguno")
+
+
+# 3️⃣ ----- V A R I A C I Ó N   P O R   T I P O   D E   T R A N S P O R T E   Y   T I P O   D E   D Í A -----
+with seccion("3. Variación por transporte y tipo de día"):
+    print("─" * 80 + "\nVARIACIÓN INTERANUAL TOTAL\n")
+    print(comparativa.variacion().to_string())
+
+    por_tipo = comparativa.variacion("TIPO_TRANSPORTE")
+    print("─" * 80 + "\nVARIACIÓN INTERANUAL POR TIPO DE TRANSPORTE\n")
+    print(por_tipo.to_string())
+    graficos.append(ge.Grafico("comparativa_2025vs2024_tipo_transporte.png", ge.grafico_variacion_interanual, dict(
+        variacion=por_tipo["VARIACION_PCT"].sort_values(),
+        titulo=f"Variación de viajes por tipo de transporte ({ANIO} vs {ANIO_BASE})", ylabel="Tipo de transporte")))
+
+    print("─" * 80 + "\nVIAJES PROMEDIO POR DÍA SEGÚN TIPO DE DÍA\n")
+    print(comparativa.promedio_por_tipo_dia().round(0).to_string())
+
+    print("─" * 80 + "\nVARIACIÓN INTERANUAL POR TIPO DE TRANSPORTE Y TIPO DE DÍA\n")
+    print(comparativa.variacion("TIPO_TRANSPORTE", "TIPO_DIA").to_string())
+
+
+# 4️⃣ ----- V A R I A C I Ó N   P O R   J U R I S D I C C I Ó N -----
+with seccion("4. Variación por jurisdicción"):
+    por_jurisdiccion = comparativa.variacion("JURISDICCION")
+    print("─" * 80 + "\nVARIACIÓN INTERANUAL POR JURISDICCIÓN\n")
+    print(por_jurisdiccion.to_string())
+    graficos.append(ge.Grafico("comparativa_2025vs2024_jurisdiccion.png", ge.grafico_variacion_interanual, dict(
+        variacion=por_jurisdiccion["VARIACION_PCT"].dropna().sort_values(),
+        titulo=f"Variación de viajes por jurisdicción ({ANIO} vs {ANIO_BASE})", ylabel="Jurisdicción")))
+
+
+# 5️⃣ ----- V A R I A C I Ó N   P O R   L Í N E A -----
+# Las líneas sin viajes en alguno de los dos períodos (altas y bajas) se informan aparte
+with seccion("5. Variación por línea"):
+    por_linea = comparativa.variacion("TIPO_TRANSPORTE", "LINEA")
+    comparables = por_linea[(por_linea["VIAJES_BASE"] > 0) & (por_linea["VIAJES"] > 0)]
+
+    print("─" * 80 + f"\nLAS {TOP_LINEAS} LÍNEAS CON MAYOR CAÍDA DE VIAJES\n")
+    print(comparables.nsmallest(TOP_LINEAS, "DIFERENCIA").to_string())
+    print("─" * 80 + f"\nLAS {TOP_LINEAS} LÍNEAS CON MAYOR CRECIMIENTO DE VIAJES\n")
+    print(comparables.nlargest(TOP_LINEAS, "DIFERENCIA").to_string())
+
+    print("─" * 80 + "\nLÍNEAS SIN VIAJES EN ALGUNO DE LOS DOS PERÍODOS\n")
+    print(f"Solo en {ANIO_BASE}: {int((por_linea['VIAJES'] == 0).sum())}")
+    print(f"Solo en {ANIO}: {int((por_linea['VIAJES_BASE'] == 0).sum())}")
+
+
+# 🔸 Dibujar los gráficos (solo los que cambiaron, ver graficos_eda.renderizar_graficos)
+with seccion("Dibujo de los gráficos"):
+    dibujados, omitidos = ge.renderizar_graficos(graficos, directorio="graficos")
+    print(f"\n📊 Gráficos generados: {len(dibujados)}, sin cambios (omitidos): {len(omitidos)}")
+
+instrumentacion.imprimir_resumen()
+if args.informe:
+    instrumentacion.guardar_informe(args.informe)
+    print(f"📁 Informe de la ejecución guardado en '{args.informe}'")
+if args.perfil:
+    instrumentacion.guardar_perfil(args.perfil)
+    print(f"📁 Perfil de cProfile guardado en '{args.perfil}'")
+
+print("\nProceso terminado.\n\n")
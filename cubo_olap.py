@@ -0,0 +1,142 @@
+import argparse          # Para construir y consultar el cubo desde la línea de comandos
+import os                # Para comparar fechas de modificación de los archivos
+
+import pandas as pd      # Para manipulación y análisis de datos en DataFrames
+
+from agregados_eda import DIMENSIONES_CUBO, AgregadosEDA, construir_cubo_diario
+from almacenamiento import guardar_dataset, leer_dataset, ruta_dataset
+from limpieza import aplicar_reglas
+
+# Dimensiones del cubo: fecha, ubicación, línea y tipo de día. DIA_SEMANA y MOTIVO_FERIADO
+# dependen solo de la fecha (no agregan filas) y se guardan para no recalcularlas
+DIMENSIONES_OLAP = [
+    "DIA_TRANSPORTE", "TIPO_TRANSPORTE", "JURISDICCION", "PROVINCIA", "MUNICIPIO",
+    "LINEA", "AMBA", "TIPO_DIA", "DIA_SEMANA", "MOTIVO_FERIADO",
+]
+
+# Niveles de tiempo para agrupar (roll-up) a partir de DIA_TRANSPORTE
+NIVELES_TIEMPO = {
+    "ANIO": lambda fechas: fechas.dt.year,
+    "MES": lambda fechas: fechas.dt.month,
+    "MES_ANO": lambda fechas: fechas.dt.to_period("M"),
+    "SEMANA": lambda fechas: fechas.dt.to_period("W"),
+}
+
+RUTA_CUBO = "cubo_sube.parquet"
+
+
+def _como_lista(valor):
+    return list(valor) if isinstance(valor, (list, tuple, set, frozenset)) else [valor]
+
+
+class CuboOLAP:
+    """Cubo de viajes (suma de CANTIDAD) por fecha, ubicación, línea y tipo de día.
+
+    Se construye una vez a partir de los datasets enriquecidos, se guarda en disco
+    y responde las preguntas del EDA (viajes por mes, día de la semana, tipo de
+    transporte, tipo de día, feriado, línea...) sin volver a leer los datos originales.
+    """
+
+    def __init__(self, cubo):
+        self.cubo = cubo
+
+    # ----- C O N S T R U C C I Ó N   Y   A C T U A L I Z A C I Ó N -----
+    @classmethod
+    def desde_dataframe(cls, df, limpiar=True):
+        """Cubo de un dataset enriquecido. Con `limpiar` antes se aplican las reglas de limpieza.py (modifica df)."""
+        if limpiar:
+            df, _ = aplicar_reglas(df)
+        return cls(construir_cubo_diario(df, DIMENSIONES_OLAP))
+
+    @classmethod
+    def desde_datasets(cls, rutas, limpiar=True):
+        """Cubo de varios datasets (ej. un archivo por año), leyendo de cada uno solo las columnas necesarias."""
+        cubos = [
+            cls.desde_dataframe(leer_dataset(ruta, columnas=DIMENSIONES_OLAP + ["CANTIDAD"]), limpiar).cubo
+            for ruta in rutas
+        ]
+        return cls(construir_cubo_diario(pd.concat(cubos, ignore_index=True), DIMENSIONES_OLAP))
+
+    def agregar(self, df, limpiar=True):
+        """Nuevo cubo con las filas de `df` sumadas (ej. días recién publicados), sin releer lo ya agregado."""
+        nuevo = CuboOLAP.desde_dataframe(df, limpiar).cubo
+        return CuboOLAP(construir_cubo_diario(pd.concat([self.cubo, nuevo], ignore_index=True), DIMENSIONES_OLAP))
+
+    @classmethod
+    def cargar(cls, ruta=RUTA_CUBO):
+        return cls(leer_dataset(ruta))
+
+    def guardar(self, ruta=RUTA_CUBO):
+        return guardar_dataset(self.cubo, ruta)
+
+    # ----- C O N S U L T A S -----
+    def filtrar(self, desde=None, hasta=None, **filtros):
+        """Subcubo con las fechas entre `desde` y `hasta` (inclusive) y los valores pedidos de cada dimensión.
+
+        ej. cubo.filtrar("2024-07-01", "2024-07-31", TIPO_TRANSPORTE="SUBTE", TIPO_DIA=["HÁBIL", "FERIADO"])
+        Los niveles de tiempo (ANIO, MES, ...) también se pueden usar como filtro.
+        """
+        mascara = pd.Series(True, index=self.cubo.index)
+        fechas = self.cubo["DIA_TRANSPORTE"]
+        if desde is not None:
+            mascara &= fechas >= pd.Timestamp(desde)
+        if hasta is not None:
+            mascara &= fechas <= pd.Timestamp(hasta)
+        for dimension, valores in filtros.items():
+            mascara &= self._columna(dimension).isin(_como_lista(valores))
+        return CuboOLAP(self.cubo[mascara])
+
+    def _columna(self, dimension):
+        if dimension in NIVELES_TIEMPO:
+            return NIVELES_TIEMPO[dimension](self.cubo["DIA_TRANSPORTE"]).rename(dimension)
+        if dimension not in self.cubo.columns:
+            raise KeyError(f"Dimensión desconocida: {dimension} (disponibles: {', '.join(DIMENSIONES_OLAP + list(NIVELES_TIEMPO))})")
+        return self.cubo[dimension]
+
+    def totales(self, *por):
+        """Total de viajes agrupado (roll-up) por las dimensiones o niveles de tiempo pedidos.
+
+        Sin dimensiones devuelve el total general. ej. cubo.totales("MES_ANO", "TIPO_TRANSPORTE")
+        """
+        if not por:
+            return int(self.cubo["CANTIDAD"].sum())
+        return self.cubo.groupby([self._columna(d) for d in por], observed=True, sort=True)["CANTIDAD"].sum()
+
+    def promedio_diario(self, *por):
+        """Promedio de los viajes totales de cada día, por las dimensiones pedidas (ej. "TIPO_DIA")."""
+        diarios = self.totales("DIA_TRANSPORTE", *por)
+        if not por:
+            return diarios.mean()
+        return diarios.groupby(level=list(por), observed=True).mean()
+
+    def agregados_eda(self):
+        """Agregados del EDA (AgregadosEDA) a partir de este cubo, sin ubicación ni línea."""
+        return AgregadosEDA(construir_cubo_diario(self.cubo, DIMENSIONES_CUBO))
+
+
+def cubo_actualizado(rutas, ruta_cubo=RUTA_CUBO, forzar=False):
+    """Carga el cubo guardado o lo reconstruye si alguno de los datasets es más nuevo que él."""
+    if not forzar and os.path.exists(ruta_cubo):
+        modificado = os.path.getmtime(ruta_cubo)
+        if all(os.path.getmtime(ruta) <= modificado for ruta in rutas):
+            return CuboOLAP.cargar(ruta_cubo)
+    cubo = CuboOLAP.desde_datasets(rutas)
+    cubo.guardar(ruta_cubo)
+    print(f"🧊 Cubo reconstruido a partir de {', '.join(rutas)}: {len(cubo.cubo):,} celdas → {ruta_cubo}")
+    return cubo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cubo de viajes SUBE: construcción y consultas")
+    parser.add_argument("anios", nargs="*", type=int, default=[2024, 2025], help="años a incluir (usa df-sube-AAAA)")
+    parser.add_argument("--salida", default=RUTA_CUBO)
+    parser.add_argument("--forzar", action="store_true", help="reconstruir aunque los datasets no hayan cambiado")
+    parser.add_argument("--por", nargs="*", default=["MES_ANO", "TIPO_TRANSPORTE"], help="dimensiones del resultado")
+    args = parser.parse_args()
+
+    cubo = cubo_actualizado([ruta_dataset(f"df-sube-{anio}") for anio in args.anios], args.salida, args.forzar)
+    print(cubo.totales(*args.por).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+import argparse          # Para hacer consultas desde la línea de comandos
+import os                # Para armar y recorrer las rutas de las particiones
+import shutil            # Para reemplazar las particiones de un año completo
+from urllib.parse import quote, unquote   # Valores de partición seguros como nombre de directorio
+
+import numpy as np       # Para combinar las máscaras de los filtros
+import pandas as pd      # Para manipulación y análisis de datos en DataFrames
+
+from almacenamiento import aplicar_esquema, guardar_dataset, leer_dataset
+
+# Particiones por defecto: un directorio por año y, dentro, uno por mes (ANIO=2025/MES=5/)
+CLAVES_PARTICION = ["ANIO", "MES"]
+
+# Claves numéricas: el resto de las claves de partición (ej. TIPO_TRANSPORTE) se leen como texto
+CLAVES_NUMERICAS = {"ANIO", "MES"}
+
+
+def columnas_particion(df, columna_fecha="DIA_TRANSPORTE"):
+    """Valores de ANIO y MES de cada fila, calculados a partir de la fecha."""
+    fechas = df[columna_fecha].dt
+    return {"ANIO": fechas.year, "MES": fechas.month}
+
+
+def ruta_particion(raiz, valores):
+    """Directorio de una partición al estilo Hive, ej. raiz/ANIO=2025/MES=5."""
+    return os.path.join(raiz, *[f"{clave}={quote(str(valor), safe='')}" for clave, valor in valores.items()])
+
+
+def escribir_particionado(df, raiz, etiqueta, claves=CLAVES_PARTICION):
+    """Agrega las filas de `df` al dataset particionado, un archivo Parquet nuevo por partición.
+
+    Los archivos ya existentes no se tocan: cada escritura agrega part-`etiqueta`.parquet
+    en las particiones que correspondan, y si alguno de esos archivos ya existe se lanza
+    FileExistsError antes de escribir nada (la etiqueta tiene que ser única en cada escritura).
+    Las columnas de partición no se guardan dentro de los archivos porque ya están en la ruta.
+    Devuelve las rutas escritas.
+    """
+    derivadas = columnas_particion(df)
+    llaves = [derivadas[clave] if clave in derivadas else df[clave] for clave in claves]
+    grupos = []
+    for valores, grupo in df.groupby(llaves, observed=True, sort=True):
+        valores = valores if isinstance(valores, tuple) else (valores,)
+        ruta = os.path.join(ruta_particion(raiz, dict(zip(claves, valores))), f"part-{etiqueta}.parquet")
+        if os.path.exists(ruta):
+            raise FileExistsError(f"{ruta} ya existe: cada escritura necesita una etiqueta distinta")
+        grupos.append((ruta, grupo))
+
+    escritos = []
+    for ruta, grupo in grupos:
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        grupo = grupo.drop(columns=[clave for clave in claves if clave in grupo.columns])
+        escritos.append(guardar_dataset(grupo.reset_index(drop=True), ruta))
+    return escritos
+
+
+def borrar_escritura(raiz, etiqueta):
+    """Borra los archivos part-`etiqueta`.parquet de todas las particiones (ej. una escritura interrumpida)."""
+    nombre = f"part-{etiqueta}.parquet"
+    borrados = [ruta for ruta, _ in listar_particiones(raiz) if os.path.basename(ruta) == nombre]
+    for ruta in borrados:
+        os.remove(ruta)
+    return borrados
+
+
+def reemplazar_anio(df, raiz, anio, claves=CLAVES_PARTICION):
+    """Vuelve a escribir todas las particiones de `anio` (borra las anteriores, incluso las que ya no tienen filas)."""
+    shutil.rmtree(ruta_particion(raiz, {"ANIO": anio}), ignore_errors=True)
+    return escribir_particionado(df, raiz, etiqueta=str(anio), claves=claves)
+
+
+# ----- C O N S U L T A S   C O N   P O D A   D E   P A R T I C I O N E S -----
+def _valor_particion(clave, texto):
+    texto = unquote(texto)
+    return int(texto) if clave in CLAVES_NUMERICAS else texto
+
+
+def listar_particiones(raiz):
+    """Archivos del dataset con los valores de partición que indica su ruta.
+
+    Devuelve una lista de (ruta, {clave: valor}). Se ignoran los archivos y
+    directorios que empiezan con "_" o "." (estado de la ingesta, cubo, etc.).
+    """
+    archivos = []
+    for directorio, subdirectorios, nombres in os.walk(raiz):
+        subdirectorios[:] = sorted(d for d in subdirectorios if not d.startswith(("_", ".")))
+        relativo = os.path.relpath(directorio, raiz)
+        partes = [] if relativo == "." else relativo.split(os.sep)
+        if not all("=" in parte for parte in partes):
+            continue
+        valores = {clave: _valor_particion(clave, texto) for clave, texto in (p.split("=", 1) for p in partes)}
+        for nombre in sorted(nombres):
+            if nombre.endswith(".parquet") and not nombre.startswith(("_", ".")):
+                archivos.append((os.path.join(directorio, nombre), valores))
+    return archivos
+
+
+def _como_conjunto(valor):
+    return set(valor) if isinstance(valor, (list, tuple, set, frozenset)) else {valor}
+
+
+def particion_posible(valores, desde=None, hasta=None, filtros=None):
+    """Indica si una partición puede tener filas que cumplan el rango de fechas y los filtros.
+
+    Solo se usan las claves presentes en la ruta: un filtro sobre una columna que
+    no es clave de partición no descarta ningún archivo.
+    """
+    if "ANIO" in valores and (desde is not None or hasta is not None):
+        if "MES" in valores:
+            inicio = pd.Timestamp(year=valores["ANIO"], month=valores["MES"], day=1)
+            fin = inicio + pd.offsets.MonthEnd(1)
+        else:
+            inicio, fin = pd.Timestamp(year=valores["ANIO"], month=1, day=1), pd.Timestamp(year=valores["ANIO"], month=12, day=31)
+        if (desde is not None and fin < desde) or (hasta is not None and inicio > hasta.normalize()):
+            return False
+    for columna, buscados in (filtros or {}).items():
+        if columna in valores and str(valores[columna]) not in {str(v) for v in _como_conjunto(buscados)}:
+            return False
+    return True
+
+
+def consultar(raiz, desde=None, hasta=None, columnas=None, **filtros):
+    """Lee del dataset particionado solo las filas entre `desde` y `hasta` (inclusive) que cumplen los filtros.
+
+    Los filtros se pasan por nombre de columna con un valor o una lista de valores,
+    ej. consultar(raiz, "2024-03-01", "2024-03-31", TIPO_TRANSPORTE="SUBTE", TIPO_DIA="FERIADO").
+    Primero se descartan las particiones que no pueden cumplir el rango ni los filtros
+    sobre claves de partición (sin abrir sus archivos); sobre los archivos restantes
+    se leen solo las columnas necesarias y se aplican los filtros fila por fila.
+    Las claves de partición (ANIO, MES, ...) se agregan como columnas.
+    """
+    desde = pd.Timestamp(desde) if desde is not None else None
+    hasta = pd.Timestamp(hasta) if hasta is not None else None
+
+    todas = listar_particiones(raiz)
+    elegidas = [(ruta, valores) for ruta, valores in todas if particion_posible(valores, desde, hasta, filtros)]
+
+    # Columnas a leer de los archivos: las pedidas más las necesarias para filtrar (las claves salen de la ruta)
+    lectura = None
+    if columnas is not None:
+        necesarias = list(columnas) + list(filtros) + (["DIA_TRANSPORTE"] if desde is not None or hasta is not None else [])
+        lectura = list(dict.fromkeys(necesarias))
+
+    partes = []
+    for ruta, valores in elegidas:
+        parte = leer_dataset(ruta, columnas=[c for c in lectura if c not in valores] if lectura else None)
+        for clave, valor in valores.items():
+            parte[clave] = valor
+        mascara = np.ones(len(parte), dtype=bool)
+        if desde is not None:
+            mascara &= (parte["DIA_TRANSPORTE"] >= desde).to_numpy()
+        if hasta is not None:
+            mascara &= (parte["DIA_TRANSPORTE"] <= hasta).to_numpy()
+        for columna, buscados in filtros.items():
+            if columna not in valores:
+                mascara &= parte[columna].isin(_como_conjunto(buscados)).to_numpy()
+        partes.append(parte if mascara.all() else parte[mascara])
+
+    print(f"🔎 {raiz}: {len(elegidas)} de {len(todas)} archivos leídos")
+    if not partes:
+        return pd.DataFrame(columns=columnas)
+    # Cada archivo trae sus propias categorías: se unifican al concatenar
+    resultado = aplicar_esquema(pd.concat(partes, ignore_index=True))
+    return resultado[list(columnas)] if columnas is not None else resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consulta un dataset SUBE particionado por año y mes")
+    parser.add_argument("raiz", help="directorio del dataset particionado")
+    parser.add_argument("--desde", help="fecha inicial (AAAA-MM-DD)")
+    parser.add_argument("--hasta", help="fecha final (AAAA-MM-DD)")
+    parser.add_argument("--filtro", action="append", default=[], metavar="COLUMNA=VALOR[,VALOR...]")
+    args = parser.parse_args()
+
+    filtros = {}
+    for filtro in args.filtro:
+        columna, valores = filtro.split("=", 1)
+        filtros[columna] = valores.split(",")
+    resultado = consultar(args.raiz, args.desde, args.hasta, **filtros)
+    print(resultado.groupby("TIPO_TRANSPORTE", observed=True)["CANTIDAD"].sum().to_string() if not resultado.empty else "Sin filas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import argparse          # Para generar archivos desde la línea de comandos
+
+import numpy as np
+import pandas as pd
+
+# Feriados nacionales 2024 (mismas fechas que devuelve la API de Nager.Date)
+FERIADOS_2024 = {
+    "2024-01-01", "2024-02-12", "2024-02-13", "2024-03-24", "2024-03-28",
+    "2024-03-29", "2024-04-01", "2024-04-02", "2024-05-01", "2024-05-25",
+    "2024-06-17", "2024-06-20", "2024-06-21", "2024-07-09", "2024-08-17",
+    "2024-10-11", "2024-11-18", "2024-12-08", "2024-12-25",
+}
+# Motivos sintéticos para cada feriado (la columna MOTIVO_FERIADO solo necesita un texto por fecha)
+MOTIVOS_2024 = {fecha: f"FERIADO {i + 1:02d}" for i, fecha in enumerate(sorted(FERIADOS_2024))}
+
+# Cantidad aproximada de líneas con viajes registrados cada día en el dataset 2024 (escala 1)
+LINEAS_2024 = 1_500
+
+COLUMNAS_SUBE = [
+    "DIA_TRANSPORTE", "NOMBRE_EMPRESA", "LINEA", "AMBA", "TIPO_TRANSPORTE",
+    "JURISDICCION", "PROVINCIA", "MUNICIPIO", "CANTIDAD", "DATO_PRELIMINAR",
+]
+
+LINEAS_SUBTE = ["LINEA A", "LINEA B", "LINEA C", "LINEA D", "LINEA E", "LINEA H", "PREMETRO"]
+PROVINCIAS = [
+    "BUENOS AIRES", "CATAMARCA", "CHACO", "CHUBUT", "CÓRDOBA", "CORRIENTES", "ENTRE RÍOS",
+    "JUJUY", "LA RIOJA", "MENDOZA", "MISIONES", "NEUQUÉN", "RÍO NEGRO", "SALTA", "SAN JUAN",
+    "SAN LUIS", "SANTA CRUZ", "SANTA FE", "SANTIAGO DEL ESTERO", "TIERRA DEL FUEGO", "TUCUMÁN",
+]
+MUNICIPIOS_POR_PROVINCIA = 8
+
+# Viajes relativos de cada tipo de día respecto de un día hábil
+FACTOR_SABADO, FACTOR_DOMINGO, FACTOR_FERIADO = 0.6, 0.4, 0.45
+
+
+def catalogo_lineas(n_lineas, rng):
+    """Una fila por línea con su empresa, tipo de transporte, ubicación y demanda media de un día hábil.
+
+    Proporciones parecidas a las del dataset real: casi todo colectivos, unas decenas de
+    trenes, el subte y algunas lanchas; cada empresa opera en promedio unas 3-4 líneas
+    (pocas empresas grandes con muchas líneas). Se incluyen LINEA_500I_SFE y
+    FFCC TREN DEL VALLE con la ubicación vacía, igual que en los datos originales.
+    """
+    n_tren = max(2, round(n_lineas * 0.03))
+    n_lanchas = max(1, round(n_lineas * 0.003))
+    n_subte = len(LINEAS_SUBTE)
+    n_colectivo = n_lineas - n_tren - n_lanchas - n_subte
+
+    lineas = pd.DataFrame({
+        "LINEA": (
+            [f"LINEA_{i:04d}" for i in range(n_colectivo - 1)] + ["LINEA_500I_SFE"]
+            + [f"FFCC_{i:03d}" for i in range(n_tren - 1)] + ["FFCC TREN DEL VALLE"]
+            + LINEAS_SUBTE + [f"LANCHA_{i:02d}" for i in range(n_lanchas)]
+        ),
+        "TIPO_TRANSPORTE": ["COLECTIVO"] * n_colectivo + ["TREN"] * n_tren + ["SUBTE"] * n_subte + ["LANCHAS"] * n_lanchas,
+    })
+    n = len(lineas)
+    tipo = lineas["TIPO_TRANSPORTE"].to_numpy()
+
+    # Empresas: sesgadas hacia las primeras (algunas con muchas líneas)
+    n_empresas = max(1, round(n / 3.5))
+    lineas["NOMBRE_EMPRESA"] = [f"EMPRESA {j:04d}" for j in (n_empresas * rng.random(n) ** 2).astype(int)]
+    lineas.loc[tipo == "SUBTE", "NOMBRE_EMPRESA"] = "EMOVA MOVILIDAD SA"
+
+    amba = (rng.random(n) < 0.4) | (tipo == "SUBTE")
+    lineas["AMBA"] = np.where(amba, "SI", "NO")
+    jurisdiccion = np.where(amba & (rng.random(n) < 0.3), "NACIONAL", rng.choice(["PROVINCIAL", "MUNICIPAL"], n))
+    lineas["JURISDICCION"] = jurisdiccion
+    provincia = np.where(amba, "BUENOS AIRES", rng.choice(PROVINCIAS, n))
+    lineas["PROVINCIA"] = np.where(jurisdiccion == "NACIONAL", "JN", provincia)
+    municipio = np.char.add(
+        np.char.add(lineas["PROVINCIA"].to_numpy().astype(str), " - MUNICIPIO "),
+        rng.integers(1, MUNICIPIOS_POR_PROVINCIA + 1, n).astype(str),
+    )
+    lineas["MUNICIPIO"] = np.where(jurisdiccion == "NACIONAL", "SD", municipio)
+
+    sin_ubicacion = (tipo == "SUBTE") | lineas["LINEA"].isin(["LINEA_500I_SFE", "FFCC TREN DEL VALLE"]).to_numpy()
+    lineas.loc[sin_ubicacion, ["JURISDICCION", "PROVINCIA", "MUNICIPIO"]] = np.nan
+    lineas.loc[lineas["LINEA"] == "LINEA_500I_SFE", "JURISDICCION"] = "PROVINCIAL"
+
+    # Demanda media de un día hábil: lognormal, mayor en trenes y subte
+    escala_tipo = pd.Series(tipo).map({"COLECTIVO": 1, "TREN": 8, "SUBTE": 40, "LANCHAS": 0.05}).to_numpy()
+    lineas["BASE"] = rng.lognormal(mean=7.8, sigma=1.2, size=n) * escala_tipo
+    return lineas
+
+
+def generar_sube(escala=1, anio=2024, semilla=0, lineas_por_dia=LINEAS_2024):
+    """DataFrame con la forma del dataset original de SUBE (dat-ab-usos-AAAA.csv), determinístico.
+
+    `escala` multiplica la cantidad de líneas (y de empresas) respecto del año 2024:
+    escala 1 ≈ 550 mil filas, 10 ≈ 5,5 millones, 100 ≈ 55 millones. Las columnas de
+    texto se devuelven como categóricas para que las escalas grandes entren en memoria.
+    """
+    rng = np.random.default_rng(semilla)
+    lineas = catalogo_lineas(int(lineas_por_dia * escala), rng)
+    fechas = pd.date_range(f"{anio}-01-01", f"{anio}-12-31", freq="D")
+    n_lineas, n_dias = len(lineas), len(fechas)
+
+    # Factor de demanda de cada fecha según su tipo de día
+    feriados = pd.DatetimeIndex(sorted(FERIADOS_2024)) if anio == 2024 else pd.DatetimeIndex([])
+    factor = np.select(
+        [fechas.isin(feriados), fechas.dayofweek == 6, fechas.dayofweek == 5],
+        [FACTOR_FERIADO, FACTOR_DOMINGO, FACTOR_SABADO], 1.0,
+    )
+
+    # Filas ordenadas por fecha, como en el archivo original: todas las líneas de cada día
+    dia = np.repeat(np.arange(n_dias), n_lineas)
+    linea = np.tile(np.arange(n_lineas), n_dias)
+    cantidad = lineas["BASE"].to_numpy()[linea] * factor[dia] * rng.normal(1.0, 0.1, len(dia))
+    cantidad = np.maximum(cantidad, 0).round().astype("int64")
+    # Algunos valores negativos (correcciones no documentadas del dataset real)
+    cantidad[rng.choice(len(cantidad), size=3 * max(1, int(escala)), replace=False)] *= -1
+
+    df = pd.DataFrame({"DIA_TRANSPORTE": fechas[dia]})
+    for columna in ["NOMBRE_EMPRESA", "LINEA", "AMBA", "TIPO_TRANSPORTE", "JURISDICCION", "PROVINCIA", "MUNICIPIO"]:
+        codigos, categorias = pd.factorize(lineas[columna])
+        df[columna] = pd.Categorical.from_codes(codigos[linea], categorias)
+    df["CANTIDAD"] = cantidad
+    # Los últimos días se publican como datos preliminares
+    df["DATO_PRELIMINAR"] = pd.Categorical.from_codes((dia >= n_dias - 7).astype("int8"), ["NO", "SI"])
+    return df[COLUMNAS_SUBE]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera un dataset SUBE sintético (mismo formato que dat-ab-usos-AAAA.csv)")
+    parser.add_argument("--escala", type=float, default=1, help="tamaño respecto de 2024 (1, 10, 100...)")
+    parser.add_argument("--anio", type=int, default=2024)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", help="archivo CSV de salida (por defecto dat-ab-usos-sintetico-xN.csv)")
+    args = parser.parse_args()
+
+    df = generar_sube(args.escala, args.anio, args.semilla)
+    salida = args.salida or f"dat-ab-usos-sintetico-x{args.escala:g}.csv"
+    df.to_csv(salida, index=False)
+    print(f"📁 {len(df):,} filas ({df['LINEA'].nunique():,} líneas, {df['NOMBRE_EMPRESA'].nunique():,} empresas) → {salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+import argparse          # Para resumir datasets desde la línea de comandos
+
+import numpy as np       # Para calcular por grupo con bincount y búsquedas vectorizadas
+import pandas as pd      # Para manipulación y análisis de datos en DataFrames
+
+from almacenamiento import leer_por_bloques
+from limpieza import aplicar_reglas, columnas_reglas
+
+# Compresión por defecto de los sketches de cuantiles: cantidad aproximada de centroides por grupo
+COMPRESION = 200
+
+
+def _como_lista(claves):
+    if claves is None:
+        return []
+    return [claves] if isinstance(claves, str) else list(claves)
+
+
+def _llaves(df, claves):
+    """Columnas de agrupación: las `claves` del DataFrame o una única clave constante si no hay."""
+    if not claves:
+        return [np.zeros(len(df), dtype=np.int8)]
+    return [df[clave] for clave in claves]
+
+
+def _indice(tabla, claves):
+    """Índice de grupos (simple o MultiIndex) de una tabla que tiene las claves como columnas."""
+    if not claves:
+        return pd.Index(["TOTAL"] * len(tabla))    # sin filas válidas no hay ni siquiera el total
+    if len(claves) == 1:
+        return pd.Index(tabla[claves[0]], name=claves[0])
+    return pd.MultiIndex.from_frame(tabla[claves])
+
+
+# ----- M O M E N T O S -----
+class Momentos:
+    """Cantidad, media, varianza, mínimo y máximo por grupo, combinables entre bloques y años.
+
+    La combinación usa la fórmula de Chan et al. para sumas de cuadrados parciales:
+    el resultado es el mismo (salvo redondeo) que calcular todo sobre las filas juntas.
+    """
+
+    COLUMNAS = ["N", "MEDIA", "M2", "MINIMO", "MAXIMO"]
+
+    def __init__(self, tabla, claves=()):
+        self.tabla = tabla            # una fila por grupo: claves + COLUMNAS
+        self.claves = list(claves)
+
+    @classmethod
+    def desde_valores(cls, df, columna="CANTIDAD", claves=None):
+        claves = _como_lista(claves)
+        grupos = df[columna].astype("float64").groupby(_llaves(df, claves), observed=True, dropna=False, sort=True)
+        tabla = pd.DataFrame({
+            "N": grupos.count(),
+            "MEDIA": grupos.mean(),
+            "M2": grupos.var(ddof=0) * grupos.count(),
+            "MINIMO": grupos.min(),
+            "MAXIMO": grupos.max(),
+        })
+        tabla = tabla[tabla["N"] > 0]
+        return cls(tabla.reset_index(drop=not claves), claves)
+
+    def combinar(self, otro):
+        """Momentos de la unión de los datos de ambos (ej. dos bloques o dos años)."""
+        return Momentos._unir(pd.concat([self.tabla, otro.tabla], ignore_index=True), self.claves)
+
+    def reagrupar(self, claves):
+        """Momentos por un subconjunto de las claves (ej. de AMBA × TIPO_TRANSPORTE a solo AMBA; [] para el total)."""
+        return Momentos._unir(self.tabla, _como_lista(claves))
+
+    @staticmethod
+    def _unir(juntos, claves):
+        """Combina las filas de `juntos` que tienen las mismas claves."""
+        codigos = juntos.groupby(_llaves(juntos, claves), observed=True, dropna=False, sort=True).ngroup().to_numpy()
+        n, media, m2 = (juntos[c].to_numpy(dtype="float64") for c in ("N", "MEDIA", "M2"))
+
+        total = np.bincount(codigos, weights=n)
+        nueva_media = np.bincount(codigos, weights=n * media) / total
+        # M2 combinado = suma de los M2 parciales + n_i * (media_i - media)^2
+        nuevo_m2 = np.bincount(codigos, weights=m2 + n * (media - nueva_media[codigos]) ** 2)
+
+        primeras = pd.Series(np.arange(len(juntos))).groupby(codigos).first().to_numpy()
+        tabla = juntos.iloc[primeras][claves].reset_index(drop=True)
+        tabla["N"] = total.astype("int64")
+        tabla["MEDIA"] = nueva_media
+        tabla["M2"] = nuevo_m2
+        tabla["MINIMO"] = juntos["MINIMO"].groupby(codigos).min().to_numpy()
+        tabla["MAXIMO"] = juntos["MAXIMO"].groupby(codigos).max().to_numpy()
+        return Momentos(tabla, claves)
+
+    def resumen(self):
+        """count, mean, std (muestral, como pandas), min y max por grupo."""
+        tabla = self.tabla
+        n = tabla["N"].to_numpy(dtype="float64")
+        return pd.DataFrame(
+            {
+                "count": n,
+                "mean": tabla["MEDIA"].to_numpy(),
+                "std": np.sqrt(tabla["M2"].to_numpy() / np.where(n > 1, n - 1, np.nan)),
+                "min": tabla["MINIMO"].to_numpy(),
+                "max": tabla["MAXIMO"].to_numpy(),
+            },
+            index=_indice(tabla, self.claves),
+        )
+
+
+# ----- H I S T O G R A M A   D E   A N C H O   F I J O -----
+class Histograma:
+    """Histograma con intervalos de ancho fijo (`ancho`), en escala lineal o log1p.
+
+    Los bordes no dependen de los datos (son múltiplos de `ancho`), así que los
+    histogramas de distintos bloques o años se suman directamente; el rango se
+    extiende a medida que aparecen valores nuevos. Los conteos son exactos.
+    """
+
+    def __init__(self, ancho, log=False, inicio=0, conteos=None):
+        self.ancho, self.log = ancho, log
+        self.inicio = inicio                                     # índice del primer intervalo
+        self.conteos = np.zeros(0, dtype="int64") if conteos is None else conteos
+
+    @classmethod
+    def desde_valores(cls, valores, ancho, log=False):
+        valores = np.asarray(valores, dtype="float64")
+        if log:
+            valores = np.log1p(np.where(valores > -1, valores, np.nan))
+        valores = valores[~np.isnan(valores)]
+        if not len(valores):
+            return cls(ancho, log)
+        indices = np.floor(valores / ancho).astype("int64")
+        inicio = int(indices.min())
+        return cls(ancho, log, inicio, np.bincount(indices - inicio).astype("int64"))
+
+    def combinar(self, otro):
+        if (otro.ancho, otro.log) != (self.ancho, self.log):
+            raise ValueError("Solo se pueden combinar histogramas con el mismo ancho y escala")
+        if not len(otro.conteos):
+            return self
+        if not len(self.conteos):
+            return otro
+        inicio = min(self.inicio, otro.inicio)
+        fin = max(self.inicio + len(self.conteos), otro.inicio + len(otro.conteos))
+        conteos = np.zeros(fin - inicio, dtype="int64")
+        for histograma in (self, otro):
+            desde = histograma.inicio - inicio
+            conteos[desde:desde + len(histograma.conteos)] += histograma.conteos
+        return Histograma(self.ancho, self.log, inicio, conteos)
+
+    @property
+    def total(self):
+        return int(self.conteos.sum())
+
+    def reagrupar(self, bins=50):
+        """(conteos, bordes) con unos `bins` intervalos entre el primer y el último valor, para graficar.
+
+        Cada intervalo junta varios intervalos de ancho fijo consecutivos, así que
+        los conteos siguen siendo exactos. Los bordes están en la escala del histograma (log1p si `log`).
+        """
+        ocupados = np.flatnonzero(self.conteos)
+        if not len(ocupados):
+            return np.zeros(0, dtype="int64"), np.zeros(1)
+        conteos = self.conteos[ocupados[0]:ocupados[-1] + 1]
+        por_bin = max(1, int(np.ceil(len(conteos) / bins)))
+        relleno = (-len(conteos)) % por_bin
+        agrupados = np.concatenate([conteos, np.zeros(relleno, dtype="int64")]).reshape(-1, por_bin).sum(axis=1)
+        primero = self.inicio + ocupados[0]
+        bordes = (primero + np.arange(len(agrupados) + 1) * por_bin) * self.ancho
+        return agrupados, bordes
+
+
+# ----- S K E T C H   D E   C U A N T I L E S   ( T I P O   T - D I G E S T ) -----
+def _comprimir(codigos, medias, pesos, compresion):
+    """Agrupa los centroides de cada grupo según la escala k del t-digest, sin recorrerlos uno por uno.
+
+    Se ordenan por (grupo, media) y cada centroide cae en el intervalo de la escala
+    k(q) = compresion * (asin(2q - 1) / pi + 1/2) que contiene su cuantil: los intervalos
+    son más finos cerca de los extremos, donde los cuantiles necesitan más precisión.
+    """
+    orden = np.lexsort((medias, codigos))
+    codigos, medias, pesos = codigos[orden], medias[orden], pesos[orden]
+
+    totales = np.bincount(codigos, weights=pesos)
+    acumulado = np.cumsum(pesos)
+    inicio_grupo = np.concatenate([[0.0], np.cumsum(totales)[:-1]])
+    cuantil = (acumulado - pesos / 2 - inicio_grupo[codigos]) / totales[codigos]
+    k = np.floor(compresion * (np.arcsin(2 * cuantil - 1) / np.pi + 0.5)).astype("int64")
+    k = np.minimum(k, compresion - 1)
+
+    cubetas, inversa = np.unique(codigos * compresion + k, return_inverse=True)
+    nuevos_pesos = np.bincount(inversa, weights=pesos)
+    nuevas_medias = np.bincount(inversa, weights=pesos * medias) / nuevos_pesos
+    return cubetas // compresion, nuevas_medias, nuevos_pesos
+
+
+class SketchCuantiles:
+    """Sketch de cuantiles combinable por grupo, al estilo t-digest.
+
+    Cada grupo se resume en hasta `compresion` centroides (media y peso) más su
+    mínimo y máximo exactos. Se construye por bloques y se combina entre bloques y
+    años sin guardar las filas; los cuantiles se interpolan entre centroides con el
+    mismo criterio que pandas (lineal), así que con pocos datos son exactos.
+    """
+
+    def __init__(self, claves, grupos, centroides, compresion=COMPRESION):
+        self.claves = list(claves)
+        self.grupos = grupos            # una fila por grupo: claves + N, MINIMO, MAXIMO (ordenado)
+        self.centroides = centroides    # GRUPO (posición en grupos), MEDIA, PESO, ordenados por grupo y media
+        self.compresion = compresion
+
+    @classmethod
+    def desde_valores(cls, df, columna="CANTIDAD", claves=None, compresion=COMPRESION):
+        claves = _como_lista(claves)
+        valores = df[columna].to_numpy(dtype="float64")
+        validos = ~np.isnan(valores)
+        grupos = df.groupby(_llaves(df, claves), observed=True, dropna=False, sort=True)
+        tabla_grupos = grupos.size().reset_index()[claves] if claves else pd.DataFrame(index=range(1))
+        codigos, valores = grupos.ngroup().to_numpy()[validos], valores[validos]
+        extremos = pd.Series(valores).groupby(codigos).agg(["min", "max"]).reindex(range(len(tabla_grupos)))
+        return cls._desde_centroides(
+            tabla_grupos, codigos, valores, np.ones(len(valores)),
+            extremos["min"].to_numpy(), extremos["max"].to_numpy(), claves, compresion,
+        )
+
+    @classmethod
+    def _desde_centroides(cls, tabla_grupos, codigos, medias, pesos, minimos, maximos, claves, compresion):
+        """Sketch a partir de centroides sin comprimir; `minimos` y `maximos` son los extremos exactos de cada grupo."""
+        codigos, medias, pesos = _comprimir(codigos, medias, pesos, compresion)
+        presentes = np.unique(codigos)
+        # Los grupos sin valores válidos no tienen centroides: se descartan
+        renumerar = np.full(len(tabla_grupos), -1)
+        renumerar[presentes] = np.arange(len(presentes))
+        codigos = renumerar[codigos]
+        grupos = tabla_grupos.iloc[presentes].reset_index(drop=True)
+        centroides = pd.DataFrame({"GRUPO": codigos, "MEDIA": medias, "PESO": pesos})
+        por_grupo = centroides.groupby("GRUPO")
+        grupos["N"] = por_grupo["PESO"].sum().to_numpy()
+        grupos["MINIMO"] = minimos[presentes]
+        grupos["MAXIMO"] = maximos[presentes]
+        return cls(claves, grupos, centroides, compresion)
+
+    def combinar(self, otro):
+        """Sketch de la unión de los datos de ambos (los grupos se emparejan por sus claves)."""
+        otros = otro.centroides.assign(GRUPO=otro.centroides["GRUPO"] + len(self.grupos))
+        return SketchCuantiles._unir(
+            pd.concat([self.grupos, otro.grupos], ignore_index=True),
+            pd.concat([self.centroides, otros], ignore_index=True),
+            self.claves, self.compresion,
+        )
+
+    def reagrupar(self, claves):
+        """Sketch por un subconjunto de las claves (ej. de AMBA × TIPO_TRANSPORTE a solo AMBA; [] para el total)."""
+        return SketchCuantiles._unir(self.grupos, self.centroides, _como_lista(claves), self.compresion)
+
+    @staticmethod
+    def _unir(tablas, centroides, claves, compresion):
+        """Junta los centroides de los grupos de `tablas` que tienen las mismas claves y los vuelve a comprimir."""
+        codigos_tabla = tablas.groupby(_llaves(tablas, claves), observed=True, dropna=False, sort=True).ngroup().to_numpy()
+        primeras = pd.Series(np.arange(len(tablas))).groupby(codigos_tabla).first().to_numpy()
+        tabla_grupos = tablas.iloc[primeras][claves].reset_index(drop=True)
+
+        # El mínimo y el máximo exactos de cada grupo se conservan aunque sus centroides se unan
+        extremos = tablas.groupby(codigos_tabla).agg({"MINIMO": "min", "MAXIMO": "max"})
+        return SketchCuantiles._desde_centroides(
+            tabla_grupos, codigos_tabla[centroides["GRUPO"].to_numpy()],
+            centroides["MEDIA"].to_numpy(), centroides["PESO"].to_numpy(),
+            extremos["MINIMO"].to_numpy(), extremos["MAXIMO"].to_numpy(), claves, compresion,
+        )
+
+    def cuantiles(self, qs=(0.25, 0.5, 0.75)):
+        """Cuantiles de cada grupo (filas) para cada q de `qs` (columnas).
+
+        Con todos los centroides de peso 1 (grupos chicos) coincide con groupby().quantile().
+        Todos los grupos y cuantiles se resuelven con una sola interpolación.
+        """
+        qs = np.asarray(qs, dtype="float64")
+        if self.grupos.empty:       # ningún valor válido: no hay puntos para interpolar
+            return pd.DataFrame(index=_indice(self.grupos, self.claves), columns=qs, dtype="float64")
+        codigos = self.centroides["GRUPO"].to_numpy()
+        pesos = self.centroides["PESO"].to_numpy()
+        totales = self.grupos["N"].to_numpy(dtype="float64")
+        inicio_grupo = np.concatenate([[0.0], np.cumsum(totales)[:-1]])
+
+        # Posición de cada centroide: rango de su punto medio (el i-ésimo valor ordenado está en i + 0.5)
+        rango = np.cumsum(pesos) - pesos / 2 - inicio_grupo[codigos]
+        n_grupos = len(self.grupos)
+        puntos_x = np.concatenate([rango, np.full(n_grupos, 0.5), totales - 0.5])
+        puntos_y = np.concatenate([self.centroides["MEDIA"].to_numpy(), self.grupos["MINIMO"], self.grupos["MAXIMO"]])
+        puntos_grupo = np.concatenate([codigos, np.arange(n_grupos), np.arange(n_grupos)])
+
+        # Un solo eje para todos los grupos: grupo + rango normalizado (en [0, 1))
+        eje = puntos_grupo + puntos_x / (totales[puntos_grupo] + 1)
+        orden = np.argsort(eje, kind="stable")
+        eje, puntos_y = eje[orden], puntos_y[orden]
+        distintos = np.concatenate([[True], np.diff(eje) > 0])
+        eje, puntos_y = eje[distintos], puntos_y[distintos]
+
+        buscados = qs[None, :] * (totales[:, None] - 1) + 0.5
+        consulta = np.arange(n_grupos)[:, None] + buscados / (totales[:, None] + 1)
+        valores = np.interp(consulta.ravel(), eje, puntos_y).reshape(consulta.shape)
+        return pd.DataFrame(valores, index=_indice(self.grupos, self.claves), columns=qs)
+
+
+# ----- R E S Ú M E N E S   A   P A R T I R   D E   L O S   S K E T C H E S -----
+def describir(momentos, sketch):
+    """Equivalente de groupby(claves)[columna].describe() sin las filas (cuartiles aproximados)."""
+    resumen = momentos.resumen()
+    cuartiles = sketch.cuantiles((0.25, 0.5, 0.75)).reindex(resumen.index)
+    cuartiles.columns = ["25%", "50%", "75%"]
+    return pd.concat([resumen[["count", "mean", "std", "min"]], cuartiles, resumen[["max"]]], axis=1)
+
+
+def limites_iqr(sketch, factor=1.5):
+    """Límites de outliers por rango intercuartílico de cada grupo, como en outliers.marcar_outliers.
+
+    La tabla (Q1, Q3, IQR, LIMITE_INFERIOR, LIMITE_SUPERIOR, TOTAL) se puede usar con
+    outliers.aplicar_limites para marcar filas de cualquier bloque o año.
+    """
+    cuartiles = sketch.cuantiles((0.25, 0.75))
+    q1, q3 = cuartiles[0.25].to_numpy(), cuartiles[0.75].to_numpy()
+    iqr = q3 - q1
+    return pd.DataFrame(
+        {
+            "Q1": q1,
+            "Q3": q3,
+            "IQR": iqr,
+            "LIMITE_INFERIOR": np.maximum(q1 - factor * iqr, 0),
+            "LIMITE_SUPERIOR": q3 + factor * iqr,
+            "TOTAL": sketch.grupos["N"].to_numpy().astype("int64"),
+        },
+        index=cuartiles.index,
+    )
+
+
+class EstadisticasStreaming:
+    """Momentos y sketch de cuantiles de una columna por grupo, más histogramas de toda la columna.
+
+    Se alimenta bloque por bloque (`agregar`) o se combina con otra instancia (`combinar`,
+    ej. otro año); en memoria solo quedan los resúmenes.
+    """
+
+    def __init__(self, columna="CANTIDAD", claves=None, ancho=100, ancho_log=0.02, compresion=COMPRESION):
+        self.columna, self.claves = columna, _como_lista(claves)
+        self.ancho, self.ancho_log, self.compresion = ancho, ancho_log, compresion
+        self.momentos = self.sketch = None
+        self.histograma = Histograma(ancho)
+        self.histograma_log = Histograma(ancho_log, log=True)
+
+    def agregar(self, df):
+        """Suma un bloque de filas a los resúmenes (modifica y devuelve self)."""
+        momentos = Momentos.desde_valores(df, self.columna, self.claves)
+        sketch = SketchCuantiles.desde_valores(df, self.columna, self.claves, self.compresion)
+        self.momentos = momentos if self.momentos is None else self.momentos.combinar(momentos)
+        self.sketch = sketch if self.sketch is None else self.sketch.combinar(sketch)
+        valores = df[self.columna]
+        self.histograma = self.histograma.combinar(Histograma.desde_valores(valores, self.ancho))
+        self.histograma_log = self.histograma_log.combinar(Histograma.desde_valores(valores, self.ancho_log, log=True))
+        return self
+
+    def combinar(self, otro):
+        resultado = EstadisticasStreaming(self.columna, self.claves, self.ancho, self.ancho_log, self.compresion)
+        resultado.momentos = self.momentos.combinar(otro.momentos)
+        resultado.sketch = self.sketch.combinar(otro.sketch)
+        resultado.histograma = self.histograma.combinar(otro.histograma)
+        resultado.histograma_log = self.histograma_log.combinar(otro.histograma_log)
+        return resultado
+
+    def por(self, claves=None):
+        """(momentos, sketch) por un subconjunto de las claves; sin `claves`, por todas; [] para el total."""
+        if claves is None:
+            return self.momentos, self.sketch
+        return self.momentos.reagrupar(claves), self.sketch.reagrupar(claves)
+
+    def describir(self, claves=None):
+        return describir(*self.por(claves))
+
+    def limites_iqr(self, claves=None, factor=1.5):
+        return limites_iqr(self.por(claves)[1], factor)
+
+
+def estadisticas_por_bloques(rutas, claves=None, columna="CANTIDAD", chunksize=1_000_000, limpiar=True):
+    """Estadísticas de `columna` por grupo recorriendo los datasets de a bloques (CSV o Parquet).
+
+    Con `limpiar` cada bloque pasa antes por las reglas de limpieza.py.
+    """
+    claves = _como_lista(claves)
+    columnas = list(dict.fromkeys(claves + [columna] + (columnas_reglas() if limpiar else [])))
+    estadisticas = EstadisticasStreaming(columna, claves)
+    for ruta in ([rutas] if isinstance(rutas, str) else rutas):
+        for bloque in leer_por_bloques(ruta, columnas, chunksize):
+            if limpiar:
+                bloque, _ = aplicar_reglas(bloque)
+            estadisticas.agregar(bloque)
+    return estadisticas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumen de la distribución de CANTIDAD sin cargar los datasets completos")
+    parser.add_argument("rutas", nargs="+", help="datasets CSV o Parquet (ej. un archivo por año)")
+    parser.add_argument("--por", nargs="*", default=["TIPO_TRANSPORTE"], help="columnas de agrupación")
+    parser.add_argument("--chunksize", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    estadisticas = estadisticas_por_bloques(args.rutas, args.por, chunksize=args.chunksize)
+    print(estadisticas.describir().round(2).to_string() + "\n")
+    print(estadisticas.limites_iqr().round(1).to_string())
+
+
+if __name__ == "__main__":
+    main()
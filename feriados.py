@@ -0,0 +1,255 @@
+import re                       # Para trabajar con expresiones regulares
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime   # Para manejar fechas
+from functools import partial
+
+import requests                 # Para realizar peticiones HTTP
+from bs4 import BeautifulSoup   # Para parsear el contenido HTML
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from cache_feriados import TTL_POR_DEFECTO, feriados_con_cache
+from calendario_feriados import CalendarioFeriados
+from scraping_consulta_robots import scraping_permitido
+
+URL_NAGER = "https://date.nager.at/api/v3/PublicHolidays/{anio}/AR"
+URL_LANACION = "https://www.lanacion.com.ar/feriados/{anio}/"
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+# Mapeo de nombres de meses en español a su número correspondiente
+MESES = {
+    "enero":   1,
+    "febrero": 2,
+    "marzo":   3,
+    "abril":   4,
+    "mayo":    5,
+    "junio":   6,
+    "julio":   7,
+    "agosto":  8,
+    "septiembre": 9,
+    "octubre":   10,
+    "noviembre": 11,
+    "diciembre": 12
+}
+
+
+def parsear_feriados_api(datos):
+    """Convierte la respuesta JSON de Nager.Date en {"YYYY-MM-DD": nombre}."""
+    return {item["date"]: item["localName"].upper() for item in datos}
+
+
+def crear_sesion(conexiones=8, reintentos=3):
+    """Sesión HTTP con un pool de conexiones reutilizables y reintentos con espera creciente."""
+    sesion = requests.Session()
+    sesion.headers.update(HEADERS)
+    reintento = Retry(
+        total=reintentos,
+        backoff_factor=0.5,                              # 0.5 s, 1 s, 2 s...
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",),
+    )
+    adaptador = HTTPAdapter(pool_connections=conexiones, pool_maxsize=conexiones, max_retries=reintento)
+    sesion.mount("http://", adaptador)
+    sesion.mount("https://", adaptador)
+    return sesion
+
+
+def obtener_feriados_api(anio, sesion=None, url=URL_NAGER):
+    """Feriados de Argentina según la API pública de Nager.Date, como {"YYYY-MM-DD": nombre}."""
+    resp = (sesion or requests).get(url.format(anio=anio), timeout=10)
+    resp.raise_for_status()
+    return parsear_feriados_api(resp.json())
+
+
+# Filtro de clase del día (ej. "com-date --inamovible"): se compila una sola vez, no por cada <li>
+CLASE_DIA = re.compile(r"--")
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:             # lxml es opcional: sin él se usa BeautifulSoup
+    etree = None
+
+
+def _con_clase(clase):
+    """Condición XPath equivalente a class_=clase de BeautifulSoup (la clase es uno de los tokens)."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {clase} ')"
+
+
+if etree is not None:
+    # Selectores XPath precompilados: mismo recorrido que hace el backend de BeautifulSoup
+    PARSER_HTML = lxml_html.HTMLParser(encoding="utf-8")
+    XPATH_CALENDARIOS = etree.XPath(f"//div[{_con_clase('holidays-card-calendar')}]")
+    XPATH_ENCABEZADO = etree.XPath(f"(.//div[{_con_clase('labeled-calendar')}])[1]")
+    XPATH_LINK_MES = etree.XPath(f"(.//a[{_con_clase('com-link')}])[1]")
+    XPATH_LISTA = etree.XPath(f"(.//ul[{_con_clase('holidays-list')}])[1]")
+    XPATH_ITEMS = etree.XPath(".//li")
+    XPATH_DIA = etree.XPath("(.//span[contains(@class, '--')])[1]")
+    XPATH_MOTIVO = etree.XPath(f"(.//h4[{_con_clase('com-text')}])[1]")
+
+
+def _bloques_bs4(html):
+    """Recorre la página con BeautifulSoup y devuelve (mes, [(día, motivo), ...]) por cada bloque mensual.
+
+    La lista es None si el bloque no tiene lista de feriados.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    for calendario in soup.find_all("div", class_="holidays-card-calendar"):
+        encabezado = calendario.find("div", class_="labeled-calendar")
+        link_mes = encabezado.find("a", class_="com-link") if encabezado else None
+        if not link_mes:
+            continue    # Saltar si no se encuentra el encabezado o el enlace con el mes
+
+        ul = calendario.find("ul", class_="holidays-list")
+        items = None
+        if ul:
+            items = []
+            for li in ul.find_all("li"):
+                dia_tag = li.find("span", class_=CLASE_DIA)         # Tag con el día
+                motivo_tag = li.find("h4", class_="com-text")       # Tag con el motivo
+                if dia_tag and motivo_tag:
+                    items.append((dia_tag.text, motivo_tag.text))
+        yield link_mes.text, items
+
+
+def _bloques_lxml(html):
+    """Mismo recorrido que _bloques_bs4, pero con lxml y los XPath precompilados."""
+    if isinstance(html, bytes):
+        raiz = lxml_html.fromstring(html, parser=PARSER_HTML)
+    else:
+        raiz = lxml_html.fromstring(html)
+    for calendario in XPATH_CALENDARIOS(raiz):
+        encabezado = XPATH_ENCABEZADO(calendario)
+        link_mes = XPATH_LINK_MES(encabezado[0]) if encabezado else []
+        if not link_mes:
+            continue
+
+        ul = XPATH_LISTA(calendario)
+        items = None
+        if ul:
+            items = []
+            for li in XPATH_ITEMS(ul[0]):
+                dia_tag = XPATH_DIA(li)
+                motivo_tag = XPATH_MOTIVO(li)
+                if dia_tag and motivo_tag:
+                    items.append((dia_tag[0].text_content(), motivo_tag[0].text_content()))
+        yield link_mes[0].text_content(), items
+
+
+BACKENDS_HTML = {"bs4": _bloques_bs4, "lxml": _bloques_lxml}
+
+
+def _armar_feriados(bloques, anio):
+    """Convierte los bloques (mes, [(día, motivo), ...]) en {"YYYY-MM-DD": motivo}."""
+    feriados = {}
+    for texto_mes, items in bloques:
+        nombre_mes = texto_mes.strip().lower()
+        numero_mes = MESES.get(nombre_mes)
+        if not numero_mes:
+            print(f"⚠️ Mes no reconocido: {nombre_mes}")
+            continue
+
+        for texto_dia, texto_motivo in items or ():
+            try:
+                dia = int(texto_dia.strip())
+                motivo = texto_motivo.strip().upper()
+                fecha = datetime(anio, numero_mes, dia).strftime("%Y-%m-%d")
+                feriados[fecha] = motivo
+            except Exception as e:
+                print(f"❌ Error procesando {nombre_mes} {texto_dia!r}: {e}")
+
+    return feriados
+
+
+def parsear_feriados_lanacion(html, anio, backend="auto"):
+    """Extrae {"YYYY-MM-DD": motivo} de la página de feriados de La Nación.
+
+    `backend` puede ser "lxml" (más rápido), "bs4" (BeautifulSoup con html.parser)
+    o "auto": lxml si está instalado, y BeautifulSoup si no lo está o si lxml no
+    encuentra ningún feriado en la página.
+    """
+    if backend != "auto":
+        if backend == "lxml" and etree is None:
+            raise ImportError("El backend 'lxml' requiere instalar lxml (pip install lxml)")
+        return _armar_feriados(BACKENDS_HTML[backend](html), anio)
+
+    feriados = _armar_feriados(_bloques_lxml(html), anio) if etree is not None else {}
+    return feriados or _armar_feriados(_bloques_bs4(html), anio)
+
+
+def obtener_feriados_lanacion(anio, sesion=None, url=URL_LANACION):
+    """Descarga y parsea la página de feriados de La Nación para el año indicado.
+
+    Antes de descargar se verifica que el robots.txt del sitio lo permita.
+    """
+    url = url.format(anio=anio)
+    if not scraping_permitido(url, sesion):
+        raise PermissionError(f"El robots.txt del sitio no permite descargar {url}")
+    resp = (sesion or requests).get(url, headers=HEADERS, timeout=10)
+    resp.raise_for_status()
+    return parsear_feriados_lanacion(resp.content, anio)
+
+
+# Fuentes disponibles: nombre → función que descarga y parsea los feriados de un año
+FUENTES = {
+    "nager": obtener_feriados_api,
+    "lanacion": obtener_feriados_lanacion,
+}
+
+
+def obtener_feriados(fuente, anio, ttl=TTL_POR_DEFECTO, refrescar=False, sesion=None, urls=None):
+    """Feriados de una fuente para un año, pasando por la caché local (ver cache_feriados.py).
+
+    `urls` permite reemplazar la URL de cada fuente (ej. {"nager": "http://127.0.0.1:8000/{anio}"}).
+    """
+    descargar = partial(FUENTES[fuente], sesion=sesion)
+    if urls and fuente in urls:
+        descargar = partial(descargar, url=urls[fuente])
+    return feriados_con_cache(fuente, anio, descargar, ttl=ttl, refrescar=refrescar)
+
+
+def descargar_feriados(anios, fuentes=tuple(FUENTES), max_workers=4, ttl=TTL_POR_DEFECTO,
+                       refrescar=False, urls=None):
+    """Obtiene los feriados de varios años y fuentes en paralelo.
+
+    Usa una sola sesión con pool de conexiones, como máximo `max_workers`
+    descargas simultáneas y la caché local. Devuelve {(fuente, anio): feriados}.
+    """
+    with crear_sesion(conexiones=max_workers) as sesion, ThreadPoolExecutor(max_workers) as pool:
+        futuros = {
+            pool.submit(obtener_feriados, fuente, anio, ttl, refrescar, sesion, urls): (fuente, anio)
+            for anio in anios
+            for fuente in fuentes
+        }
+        return {futuros[futuro]: futuro.result() for futuro in as_completed(futuros)}
+
+
+def combinar_calendarios(descargados, prioridad=("lanacion", "nager")):
+    """Une los feriados de todas las fuentes y años en un solo {"YYYY-MM-DD": motivo}.
+
+    Si una fecha aparece en más de una fuente, gana el motivo de la primera fuente en `prioridad`.
+    """
+    calendario = {}
+    # Se recorren de menor a mayor prioridad para que la última escritura sea la que vale
+    for _, feriados in sorted(descargados.items(), key=lambda item: -_orden(item[0][0], prioridad)):
+        calendario.update(feriados)
+    return dict(sorted(calendario.items()))
+
+
+def _orden(fuente, prioridad):
+    """Posición de la fuente en la prioridad (las desconocidas van al final)."""
+    return prioridad.index(fuente) if fuente in prioridad else len(prioridad)
+
+
+def obtener_calendario(anios, **kwargs):
+    """Calendario único de feriados para todos los años, descargando las fuentes en paralelo."""
+    return combinar_calendarios(descargar_feriados(anios, **kwargs))
+
+
+def agregar_motivo_feriado(df, motivos, columna="DIA_TRANSPORTE"):
+    """Agrega la columna MOTIVO_FERIADO ("NO FERIADO" si la fecha no es feriado).
+
+    El cruce se hace por fecha única contra el índice del calendario (ver
+    calendario_feriados.py), sin formatear cada fila como texto; la columna queda categórica.
+    """
+    return CalendarioFeriados(motivos).agregar_motivo(df, columna)
@@ -0,0 +1,283 @@
+import json              # Para guardar las huellas de la última ejecución
+import multiprocessing   # Para dibujar los gráficos en procesos separados
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use("Agg")    # Backend sin ventanas: solo se generan archivos PNG
+
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+from matplotlib import cbook
+
+from cache_etapas import huella, huella_codigo
+
+ARCHIVO_HUELLAS = ".huellas_graficos.json"
+
+# Un gráfico a generar: nombre del archivo, función que lo dibuja y datos (ya agregados) que recibe
+Grafico = namedtuple("Grafico", ["archivo", "funcion", "datos"])
+
+
+# ----- D A T O S   P R E C A L C U L A D O S   P A R A   L O S   G R Á F I C O S -----
+def histograma(valores, bins=50):
+    """Conteos y bordes del histograma (mismo rango mínimo-máximo que usa Series.hist)."""
+    conteos, bordes = np.histogram(np.asarray(valores), bins=bins)
+    return conteos, bordes
+
+
+def estadisticas_boxplot(df, grupo, columna="CANTIDAD"):
+    """Estadísticas de cada caja (cuartiles, bigotes y outliers) por grupo, listas para Axes.bxp."""
+    estadisticas = []
+    for nombre, valores in df.groupby(grupo, observed=True)[columna]:
+        caja = cbook.boxplot_stats(valores.to_numpy(), whis=1.5)[0]
+        caja["label"] = str(nombre)
+        estadisticas.append(caja)
+    return estadisticas
+
+
+def estadisticas_boxplot_resumen(momentos, sketch, whis=1.5):
+    """Mismas cajas que estadisticas_boxplot, a partir de resúmenes sin las filas (ver estadisticas_streaming.py).
+
+    Los cuartiles salen del sketch; cada bigote llega hasta el límite de `whis` × IQR
+    (o hasta el mínimo/máximo si está más cerca) y como outliers se dibujan solo el
+    mínimo y el máximo cuando quedan fuera de los bigotes.
+    """
+    resumen = momentos.resumen()
+    cuartiles = sketch.cuantiles((0.25, 0.5, 0.75)).reindex(resumen.index)
+    estadisticas = []
+    for (nombre, fila), (q1, mediana, q3) in zip(resumen.iterrows(), cuartiles.to_numpy()):
+        iqr = q3 - q1
+        whislo, whishi = max(fila["min"], q1 - whis * iqr), min(fila["max"], q3 + whis * iqr)
+        estadisticas.append({
+            "label": str(nombre), "mean": fila["mean"], "iqr": iqr,
+            "q1": q1, "med": mediana, "q3": q3, "whislo": whislo, "whishi": whishi,
+            "cilo": mediana - 1.57 * iqr / np.sqrt(fila["count"]), "cihi": mediana + 1.57 * iqr / np.sqrt(fila["count"]),
+            "fliers": np.array([v for v in (fila["min"], fila["max"]) if v < whislo or v > whishi]),
+        })
+    return estadisticas
+
+
+# ----- F U N C I O N E S   D E   D I B U J O -----
+# Cada función recibe la ruta del PNG y los datos agregados, dibuja una figura, la guarda y la cierra
+def grafico_histograma(ruta, conteos, bordes, color, titulo, xlabel):
+    fig, ax = plt.subplots()
+    ax.hist(bordes[:-1], bins=bordes, weights=conteos, color=color)
+    ax.set_title(titulo)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel("Frecuencia")
+    fig.tight_layout()
+    fig.savefig(ruta)
+    plt.close(fig)
+
+
+def grafico_boxplot(ruta, estadisticas, titulo, xlabel, ylabel, escala_log=False, figsize=None):
+    fig, ax = plt.subplots(figsize=figsize)
+    ax.bxp(estadisticas)
+    if escala_log:
+        ax.set_yscale("log")  # Mejora la visualización si hay outliers extremos
+    ax.set_title(titulo)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    fig.tight_layout()
+    fig.savefig(ruta)
+    plt.close(fig)
+
+
+def grafico_barras_etiquetadas(ruta, serie, color, titulo, xlabel, desplazamiento):
+    """Barras con el valor de cada una escrito en vertical (viajes por mes y por día de la semana)."""
+    fig, ax = plt.subplots()
+    serie.plot(kind="bar", color=color, ax=ax)
+    ax.set_title(titulo)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel("Cantidad de viajes")
+
+    # Agregar etiquetas a las barras con rotación y separación vertical
+    for i, v in enumerate(serie):
+        ax.text(i, v - desplazamiento, f"{int(v):,}", ha='center', va='bottom', fontsize=8, rotation=90)
+
+    fig.tight_layout()
+    fig.savefig(ruta)
+    plt.close(fig)
+
+
+def grafico_evolucion_mensual(ruta, df_mes, anio):
+    fig, ax = plt.subplots(figsize=(12, 6))
+    sns.lineplot(data=df_mes, x='MES_ANO', y='CANTIDAD', hue='TIPO_TRANSPORTE', marker='o', ax=ax)
+    ax.set_title(f'Evolución mensual de viajes por tipo de transporte - {anio}')
+    ax.set_xlabel('Mes')
+    ax.set_ylabel('Cantidad de viajes')
+    ax.tick_params(axis='x', rotation=45)
+    ax.legend(title='Tipo de transporte', bbox_to_anchor=(1.02, 1), loc='upper left')
+    fig.tight_layout()
+    fig.savefig(ruta)
+    plt.close(fig)
+
+
+def grafico_torta_tipo_transporte(ruta, viajes_tipo):
+    fig, ax = plt.subplots()
+    colores = ["#B0E0E6", "#87CEEB", "#C1E1C1", "#A7C7E7", "#C6E2FF", "#98FB98"]
+    viajes_tipo.plot(           # Graficar pie chart con etiquetas separadas y sin decimales en porcentajes
+        kind="pie",
+        autopct='%1.1f%%',      # un decimal
+        startangle=90,
+        pctdistance=0.85,       # distancia del porcentaje al centro
+        labeldistance=1.12,     # distancia de las etiquetas fuera de la torta
+        colors=colores,
+        ax=ax
+    )
+    ax.set_title("Distribución de viajes por tipo de transporte")
+    ax.set_ylabel("")
+    fig.tight_layout()
+    fig.savefig(ruta)
+    plt.close(fig)
+
+
+def grafico_promedio_tipo_dia(ruta, promedios):
+    fig, ax = plt.subplots()
+    promedios.plot(kind="bar", color="#C1E1C1", ax=ax)
+    ax.set_title("Viajes promedio por tipo de día")
+    ax.set_xlabel("Tipo de día")
+    ax.set_ylabel("Promedio de viajes")
+    fig.tight_layout()
+
+    # Agregar valores dentro de las barras
+    for i, valor in enumerate(promedios):
+        ax.text(i, valor * 0.95, f'{valor:,.0f}', ha='center', va='top', color='black')
+
+    fig.savefig(ruta)
+    plt.close(fig)
+
+
+def grafico_habil_vs_no(ruta, conteo_habiles):
+    # Calcular porcentajes
+    porcentajes = (conteo_habiles / conteo_habiles.sum() * 100).round(1)
+
+    fig, ax = plt.subplots()
+    conteo_habiles.plot(kind="bar", color=["#FF6347", "#3CB371"], ax=ax)
+    ax.set_title("Total de viajes: días hábiles vs no hábiles")
+    ax.set_xlabel("¿Es día hábil?")
+    ax.set_ylabel("Cantidad de viajes")
+    ax.set_xticks([0, 1], labels=["No", "Sí"], rotation=0)
+
+    # Agregar etiquetas de porcentaje sobre cada barra
+    for i, (valor, porcentaje) in enumerate(zip(conteo_habiles, porcentajes)):
+        ax.text(i, valor, f"{porcentaje}%", ha='center', va='bottom', fontsize=10, fontweight='bold')
+
+    fig.tight_layout()
+    fig.savefig(ruta)
+    plt.close(fig)
+
+
+def grafico_viajes_por_feriado(ruta, viajes_por_feriado, anio):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    viajes_por_feriado.plot(kind="barh", color="#DFBFF3", ax=ax)
+
+    # Agregar valores al final de cada barra
+    for i, valor in enumerate(viajes_por_feriado):
+        ax.text(valor - 1000, i, f"{int(valor):,}", va="center", ha="right", color="black", fontsize=9)
+
+    ax.set_xlabel("Cantidad total de viajes")
+    ax.set_ylabel("Motivo del feriado")
+    ax.set_title(f"Cantidad de viajes por feriado ({anio})")
+    fig.tight_layout()
+    fig.savefig(ruta)
+    plt.close(fig)
+
+
+def grafico_heatmap_dia_semana_tipo(ruta, tabla_pivot, anio):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.heatmap(
+        tabla_pivot,
+        annot=True,        # Mostrar los valores dentro de cada celda
+        fmt=".0f",         # Sin decimales
+        cmap="Reds",       # Paleta de colores
+        cbar_kws={'label': 'Cantidad de viajes'},
+        ax=ax
+    )
+    ax.set_title(f"Cantidad total de viajes por día de la semana y tipo de transporte ({anio})")
+    ax.set_xlabel("Tipo de transporte")
+    ax.set_ylabel("Día de la semana")
+    fig.tight_layout()
+    fig.savefig(ruta)
+    plt.close(fig)
+
+
+def grafico_variacion_interanual(ruta, variacion, titulo, ylabel):
+    """Barras horizontales con la variación porcentual de cada grupo (rojo si cae, verde si crece)."""
+    fig, ax = plt.subplots(figsize=(10, max(4, 0.4 * len(variacion))))
+    colores = ["#FF6347" if valor < 0 else "#3CB371" for valor in variacion]
+    variacion.plot(kind="barh", color=colores, ax=ax)
+    ax.axvline(0, color="black", linewidth=0.8)
+
+    # Agregar el porcentaje al final de cada barra
+    for i, valor in enumerate(variacion):
+        ax.text(valor, i, f" {valor:+.1f}% ", va="center", ha="left" if valor >= 0 else "right", fontsize=9)
+
+    ax.set_title(titulo)
+    ax.set_xlabel("Variación interanual (%)")
+    ax.set_ylabel(ylabel)
+    fig.tight_layout()
+    fig.savefig(ruta)
+    plt.close(fig)
+
+
+# ----- R E N D E R I Z A D O   E N   P A R A L E L O -----
+def huella_grafico(grafico):
+    """Huella del código de la función y de los datos de un gráfico: si no cambia, el PNG tampoco.
+
+    Al modificar una función de dibujo se vuelven a generar solo los gráficos que la usan.
+    """
+    nombre = f"{grafico.funcion.__module__}.{grafico.funcion.__qualname__}"
+    return huella(nombre, huella_codigo(grafico.funcion), grafico.datos)
+
+
+def _dibujar(funcion, ruta, datos):
+    funcion(ruta, **datos)
+    return ruta
+
+
+def _leer_huellas(ruta):
+    try:
+        with open(ruta, encoding="utf-8") as archivo:
+            return json.load(archivo)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def renderizar_graficos(graficos, directorio="graficos", procesos=None, forzar=False):
+    """Genera los PNG de `graficos` en paralelo, salteando los que no cambiaron.
+
+    Un gráfico se vuelve a dibujar solo si su PNG no existe o si la huella de sus
+    datos cambió desde la última ejecución (se guarda en `directorio`/.huellas_graficos.json).
+    Los procesos se crean con "fork"; donde no está disponible se dibuja en el
+    proceso actual. Devuelve (dibujados, omitidos) con los nombres de archivo.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    ruta_huellas = os.path.join(directorio, ARCHIVO_HUELLAS)
+    anteriores = _leer_huellas(ruta_huellas)
+
+    huellas, pendientes, omitidos = {}, [], []
+    for grafico in graficos:
+        ruta = os.path.join(directorio, grafico.archivo)
+        huellas[grafico.archivo] = huella_grafico(grafico)
+        if not forzar and os.path.exists(ruta) and anteriores.get(grafico.archivo) == huellas[grafico.archivo]:
+            omitidos.append(grafico.archivo)
+        else:
+            pendientes.append((grafico, ruta))
+
+    if pendientes and "fork" in multiprocessing.get_all_start_methods():
+        contexto = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto) as pool:
+            futuros = [pool.submit(_dibujar, g.funcion, ruta, g.datos) for g, ruta in pendientes]
+            for futuro in futuros:
+                futuro.result()    # propaga cualquier error de dibujo
+    else:
+        for grafico, ruta in pendientes:
+            _dibujar(grafico.funcion, ruta, grafico.datos)
+
+    with open(ruta_huellas, "w", encoding="utf-8") as archivo:
+        json.dump({**anteriores, **huellas}, archivo, indent=2, sort_keys=True)
+
+    return [g.archivo for g, _ in pendientes], omitidos
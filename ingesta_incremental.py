@@ -0,0 +1,204 @@
+import argparse          # Para leer los años desde la línea de comandos
+import io                # Para parsear el tramo nuevo del CSV sin escribirlo a disco
+import json              # Para guardar el estado de la ingesta
+import os
+
+import pandas as pd
+import requests
+
+from almacenamiento import COLUMNAS_ORIGINALES, leer_csv_sube, validar_sube
+from cubo_olap import CuboOLAP
+from dataset_particionado import borrar_escritura, escribir_particionado, listar_particiones
+from pipeline_sube import enriquecer, feriados_por_anio, informar_validacion, origen_por_defecto
+
+RAIZ_POR_DEFECTO = "sube_particionado"
+ARCHIVO_CUBO = "_cubo.parquet"            # los archivos que empiezan con "_" no son parte del dataset
+
+
+def ruta_estado(raiz, anio):
+    return os.path.join(raiz, f"_estado_ingesta_{anio}.json")
+
+
+def leer_estado(raiz, anio):
+    """Estado de la última ingesta del año: último día procesado, bytes leídos del origen, encabezado,
+    cantidad de ingestas y, si la última se interrumpió, la etiqueta de sus archivos ("pendiente")."""
+    try:
+        with open(ruta_estado(raiz, anio), encoding="utf-8") as archivo:
+            return json.load(archivo)
+    except FileNotFoundError:
+        return None
+
+
+def guardar_estado(raiz, anio, estado):
+    os.makedirs(raiz, exist_ok=True)
+    temporal = ruta_estado(raiz, anio) + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        json.dump(estado, archivo, ensure_ascii=False, indent=2)
+    os.replace(temporal, ruta_estado(raiz, anio))
+
+
+def es_url(origen):
+    return origen.startswith(("http://", "https://"))
+
+
+def leer_desde(origen, desde_byte):
+    """Bytes del origen (archivo local o URL) a partir de `desde_byte`.
+
+    En una URL se pide solo el tramo nuevo con un encabezado Range; si el
+    servidor no lo admite, se descarga el archivo completo y se descarta lo ya leído.
+    """
+    if es_url(origen):
+        encabezados = {"Range": f"bytes={desde_byte}-"} if desde_byte else {}
+        resp = requests.get(origen, headers=encabezados, timeout=60)
+        if resp.status_code == 416:        # no hay bytes nuevos desde desde_byte
+            return b""
+        resp.raise_for_status()
+        return resp.content if resp.status_code == 206 else resp.content[desde_byte:]
+
+    with open(origen, "rb") as archivo:
+        archivo.seek(desde_byte)
+        return archivo.read()
+
+
+def leer_encabezado(origen):
+    """Primera línea del CSV (con su salto de línea), para poder parsear tramos sueltos del archivo."""
+    if es_url(origen):
+        contenido = requests.get(origen, headers={"Range": "bytes=0-65535"}, timeout=60).content
+        return contenido[: contenido.index(b"\n") + 1]
+    with open(origen, "rb") as archivo:
+        return archivo.readline()
+
+
+def leer_filas_nuevas(origen, estado):
+    """Lee solo el tramo del CSV posterior a la última ingesta.
+
+    Devuelve (filas nuevas, bytes leídos hasta la última línea completa, encabezado).
+    Una línea final sin salto de línea (archivo en plena publicación) queda para
+    la próxima ingesta.
+    """
+    republicado = False
+    if estado:
+        encabezado = estado["encabezado"].encode("utf-8")
+        desde = estado["bytes_procesados"]
+        if not es_url(origen) and os.path.getsize(origen) < desde:
+            print(f"⚠️ {origen} es más corto que en la última ingesta; se vuelve a leer desde el principio")
+            desde, republicado = len(encabezado), True
+    else:
+        encabezado = leer_encabezado(origen)
+        desde = len(encabezado)
+
+    tramo = leer_desde(origen, desde)
+    completo = tramo[: tramo.rfind(b"\n") + 1]
+    if not completo:
+        return None, desde, encabezado
+
+    filas = leer_csv_sube(io.BytesIO(encabezado + completo))
+    if republicado:
+        # Al releer el archivo entero se descartan los días ya ingresados para no duplicarlos
+        filas = filas[filas["DIA_TRANSPORTE"] > pd.Timestamp(estado["ultimo_dia"])]
+    return filas, desde + len(completo), encabezado
+
+
+def actualizar_cubo(raiz, filas):
+    """Suma al cubo persistido (ver cubo_olap.py) las filas nuevas, sin recalcular el año completo.
+
+    Si el último día ingresado había quedado incompleto, sus filas restantes se
+    suman a las celdas que ya tenía el cubo.
+    """
+    ruta = os.path.join(raiz, ARCHIVO_CUBO)
+    if os.path.exists(ruta):
+        cubo = CuboOLAP.cargar(ruta).agregar(filas)
+    else:
+        cubo = CuboOLAP.desde_dataframe(filas)
+    cubo.guardar(ruta)
+    return cubo
+
+
+def reconstruir_cubo(raiz):
+    """Vuelve a calcular el cubo persistido a partir de todos los archivos del dataset particionado.
+
+    Se leen los archivos de a uno y solo con las columnas del cubo. Devuelve None si el dataset está vacío.
+    """
+    ruta = os.path.join(raiz, ARCHIVO_CUBO)
+    archivos = [archivo for archivo, _ in listar_particiones(raiz)]
+    if not archivos:
+        if os.path.exists(ruta):
+            os.remove(ruta)
+        return None
+    cubo = CuboOLAP.desde_datasets(archivos)
+    cubo.guardar(ruta)
+    return cubo
+
+
+def recuperar_ingesta(raiz, anio, estado):
+    """Deshace una ingesta interrumpida y devuelve el estado confirmado anterior (o None).
+
+    Los archivos de la ingesta pendiente pueden haberse escrito en parte, y el cubo
+    puede tener o no sus filas: se borran esos archivos y se reconstruye el cubo con
+    los que quedan, así las filas se vuelven a ingresar una sola vez.
+    """
+    borrados = borrar_escritura(raiz, estado["pendiente"])
+    reconstruir_cubo(raiz)
+    print(f"⚠️ {anio}: se deshizo la ingesta interrumpida {estado['pendiente']} ({len(borrados)} archivos borrados)")
+    estado = {clave: valor for clave, valor in estado.items() if clave != "pendiente"}
+    guardar_estado(raiz, anio, estado)
+    return estado if "bytes_procesados" in estado else None
+
+
+def ingerir_anio(anio, origen=None, raiz=RAIZ_POR_DEFECTO, refrescar=False):
+    """Ingresa al dataset particionado solo las filas de `anio` que todavía no se procesaron.
+
+    Antes de escribir se guarda en el estado la etiqueta de los archivos de esta
+    ingesta ("pendiente"), y se la quita al final junto con los bytes procesados:
+    si el proceso se interrumpe entre la escritura de las particiones, la del cubo
+    y la del estado, la próxima ejecución la deshace (recuperar_ingesta) en lugar de
+    contar dos veces las mismas filas. Devuelve la cantidad de filas nuevas.
+    """
+    origen = origen or origen_por_defecto(anio)
+    estado = leer_estado(raiz, anio)
+    if estado and estado.get("pendiente"):
+        estado = recuperar_ingesta(raiz, anio, estado)
+
+    filas, bytes_procesados, encabezado = leer_filas_nuevas(origen, estado)
+    if filas is None or filas.empty:
+        if estado and estado["bytes_procesados"] != bytes_procesados:
+            guardar_estado(raiz, anio, {**estado, "bytes_procesados": bytes_procesados})
+        print(f"✅ {anio}: sin filas nuevas desde {estado['ultimo_dia'] if estado else 'el inicio'}")
+        return 0
+
+    informar_validacion(anio, validar_sube(filas, COLUMNAS_ORIGINALES))
+    feriados = feriados_por_anio([anio], refrescar)[anio]
+    filas = enriquecer(filas, feriados)
+
+    # Número de ingesta en la etiqueta: dos ingestas con filas del mismo día no escriben el mismo archivo
+    ingesta = (estado or {}).get("ingestas", 0) + 1
+    desde, hasta = filas["DIA_TRANSPORTE"].min(), filas["DIA_TRANSPORTE"].max()
+    etiqueta = f"{anio}-{ingesta:05d}-{desde:%Y%m%d}-{hasta:%Y%m%d}"
+    guardar_estado(raiz, anio, {**(estado or {}), "pendiente": etiqueta})
+    escribir_particionado(filas, raiz, etiqueta=etiqueta)
+    actualizar_cubo(raiz, filas)
+
+    guardar_estado(raiz, anio, {
+        "origen": origen,
+        "ultimo_dia": f"{hasta:%Y-%m-%d}",
+        "bytes_procesados": bytes_procesados,
+        "encabezado": encabezado.decode("utf-8"),
+        "ingestas": ingesta,
+    })
+    print(f"📁 {anio}: {len(filas):,} filas nuevas ({desde:%Y-%m-%d} a {hasta:%Y-%m-%d}) agregadas a {raiz}")
+    return len(filas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingesta incremental de los días nuevos del dataset SUBE")
+    parser.add_argument("anios", nargs="*", type=int, default=[2025], help="años a actualizar")
+    parser.add_argument("--raiz", default=RAIZ_POR_DEFECTO, help="directorio del dataset particionado")
+    parser.add_argument("--refrescar-feriados", action="store_true")
+    args = parser.parse_args()
+
+    for anio in args.anios:
+        ingerir_anio(anio, raiz=args.raiz, refrescar=args.refrescar_feriados)
+
+
+if __name__ == "__main__":
+    main()
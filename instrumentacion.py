@@ -0,0 +1,199 @@
+import cProfile          # Perfil opcional de toda la ejecución
+import functools
+import json              # Para guardar el informe de la ejecución
+import os
+import sys
+import time              # Para medir tiempos de ejecución
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource      # Memoria máxima del proceso (no existe en Windows)
+except ImportError:
+    resource = None
+
+
+def rss_pico_mb(hijos=False):
+    """Memoria residente máxima (MB) alcanzada hasta ahora por el proceso o por sus procesos hijos."""
+    if resource is None:
+        return None
+    uso = resource.getrusage(resource.RUSAGE_CHILDREN if hijos else resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa KB y macOS bytes
+    return uso / 2**20 if sys.platform == "darwin" else uso / 1024
+
+
+class Medicion:
+    """Tiempo, memoria y filas de una sección o etapa (se acumulan si se ejecuta varias veces)."""
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.llamadas = 0
+        self.segundos = 0.0
+        self.filas = None
+        self.rss_pico_mb = None
+        self.incremento_pico_mb = 0.0
+
+    def sumar_filas(self, cantidad):
+        self.filas = (self.filas or 0) + cantidad
+
+    def como_dict(self):
+        return {
+            "nombre": self.nombre,
+            "llamadas": self.llamadas,
+            "segundos": round(self.segundos, 6),
+            "filas": self.filas,
+            "rss_pico_mb": None if self.rss_pico_mb is None else round(self.rss_pico_mb, 1),
+            "incremento_pico_mb": round(self.incremento_pico_mb, 1),
+        }
+
+
+class Instrumentacion:
+    """Registro de las secciones y etapas de una ejecución, con perfil de cProfile opcional."""
+
+    def __init__(self, nombre="ejecucion"):
+        self.nombre = nombre
+        self.inicio = time.perf_counter()
+        self.fecha = datetime.now().isoformat(timespec="seconds")
+        self.mediciones = {}
+        self.perfil = None
+
+    @contextmanager
+    def seccion(self, nombre, filas=None):
+        """Mide el bloque: tiempo de reloj, memoria máxima del proceso y cantidad de filas.
+
+        `filas` puede ser un número o una función sin argumentos que se evalúa al
+        terminar el bloque (ej. lambda: len(df), para contar las filas después de la sección).
+        Si el bloque lanza una excepción se registra el tiempo pero no las filas, así la
+        función no oculta el error original (ej. con una variable que no llegó a asignarse).
+        Si la misma sección se ejecuta varias veces (ej. una etapa por cada bloque del
+        dataset) se suman los tiempos y las filas.
+        """
+        medicion = self.mediciones.setdefault(nombre, Medicion(nombre))
+        pico_antes = rss_pico_mb()
+        inicio = time.perf_counter()
+        completo = False
+        try:
+            yield medicion
+            completo = True
+        finally:
+            medicion.segundos += time.perf_counter() - inicio
+            medicion.llamadas += 1
+            if completo and filas is not None:
+                medicion.sumar_filas(filas() if callable(filas) else filas)
+            pico = rss_pico_mb()
+            if pico is not None:
+                medicion.rss_pico_mb = pico
+                medicion.incremento_pico_mb += pico - pico_antes
+
+    def etapa(self, nombre=None):
+        """Decorador: mide cada llamada a la función como una sección.
+
+        Las filas son las del DataFrame que devuelve la función (o las del primer
+        argumento, si no devuelve un DataFrame).
+        """
+        def decorador(funcion):
+            etiqueta = nombre or funcion.__name__
+
+            @functools.wraps(funcion)
+            def envoltura(*args, **kwargs):
+                with self.seccion(etiqueta) as medicion:
+                    resultado = funcion(*args, **kwargs)
+                filas = _filas(resultado)
+                if filas is None and args:
+                    filas = _filas(args[0])
+                if filas is not None:
+                    medicion.sumar_filas(filas)
+                return resultado
+            return envoltura
+        return decorador
+
+    def registrar(self, nombre, segundos, filas=None, rss_pico_mb=None):
+        """Suma una medición hecha fuera de este proceso (ej. una tarea que corrió en un proceso hijo)."""
+        medicion = self.mediciones.setdefault(nombre, Medicion(nombre))
+        medicion.segundos += segundos
+        medicion.llamadas += 1
+        if filas is not None:
+            medicion.sumar_filas(filas)
+        if rss_pico_mb is not None:
+            medicion.rss_pico_mb = max(rss_pico_mb, medicion.rss_pico_mb or 0)
+        return medicion
+
+    # ----- P E R F I L   Y   A C T U A L I Z A C I Ó N -----
+    def iniciar_perfil(self):
+        """Activa cProfile para el resto de la ejecución (se guarda con guardar_perfil)."""
+        self.perfil = cProfile.Profile()
+        self.perfil.enable()
+
+    def guardar_perfil(self, ruta):
+        """Guarda las estadísticas de cProfile (se pueden abrir con pstats o snakeviz)."""
+        if self.perfil is None:
+            return None
+        self.perfil.disable()
+        self.perfil.dump_stats(ruta)
+        return ruta
+
+    def informe(self):
+        """Informe estructurado de la ejecución (listo para json.dump)."""
+        return {
+            "nombre": self.nombre,
+            "fecha": self.fecha,
+            "segundos_totales": round(time.perf_counter() - self.inicio, 6),
+            "rss_pico_mb": rss_pico_mb(),
+            "rss_pico_hijos_mb": rss_pico_mb(hijos=True),
+            "secciones": [m.como_dict() for m in self.mediciones.values()],
+        }
+
+    def guardar_informe(self, ruta):
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump(self.informe(), archivo, indent=2, ensure_ascii=False)
+        return ruta
+
+    def imprimir_resumen(self):
+        """Tabla con el tiempo, la memoria y las filas de cada sección, de la más lenta a la más rápida."""
+        informe = self.informe()
+        total = informe["segundos_totales"] or 1
+        print("─" * 80 + f"\nTIEMPOS POR SECCIÓN ({self.nombre})\n")
+        for m in sorted(informe["secciones"], key=lambda m: m["segundos"], reverse=True):
+            filas = f"{m['filas']:>12,} filas" if m["filas"] is not None else " " * 18
+            memoria = f"{m['rss_pico_mb']:8.0f} MB" if m["rss_pico_mb"] is not None else ""
+            print(f"{m['nombre'][:44]:<44} {m['segundos']:8.3f} s {100 * m['segundos'] / total:5.1f}% {filas} {memoria}")
+        print(f"{'Total':<44} {total:8.3f} s")
+
+
+def _filas(valor):
+    """Filas de un DataFrame (None para cualquier otro valor)."""
+    return len(valor) if hasattr(valor, "columns") else None
+
+
+# Instrumentación de la ejecución actual: los scripts la usan a través de estas funciones
+actual = Instrumentacion()
+
+
+def iniciar(nombre, perfil=False):
+    """Empieza una nueva ejecución medida (opcionalmente con cProfile) y la devuelve."""
+    global actual
+    actual = Instrumentacion(nombre)
+    if perfil:
+        actual.iniciar_perfil()
+    return actual
+
+
+def seccion(nombre, filas=None):
+    return actual.seccion(nombre, filas)
+
+
+def registrar(nombre, segundos, filas=None, rss_pico_mb=None):
+    return actual.registrar(nombre, segundos, filas, rss_pico_mb)
+
+
+def etapa(nombre=None):
+    """Decorador para medir una función (ej. una etapa de enriquecimiento) en la ejecución actual."""
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            return actual.etapa(nombre or funcion.__name__)(funcion)(*args, **kwargs)
+        return envoltura
+    return decorador
@@ -0,0 +1,104 @@
+import operator          # Operadores de comparación para las condiciones de las reglas
+from collections import namedtuple
+
+import numpy as np       # Para combinar las máscaras booleanas
+import pandas as pd      # Para manipulación y análisis de datos en DataFrames
+
+from almacenamiento import asegurar_categorias
+
+# Una regla de limpieza:
+# - nombre: descripción corta que aparece en el informe.
+# - accion: "descartar" (elimina las filas), "completar" (llena solo los nulos) o "asignar" (reemplaza el valor).
+# - condicion: {columna: valor} o {columna: (operador, valor)}; todas las condiciones deben cumplirse.
+# - valores: {columna: valor} a completar o asignar (no se usa al descartar).
+Regla = namedtuple("Regla", ["nombre", "accion", "condicion", "valores"], defaults=(None,))
+
+OPERADORES = {
+    "==": operator.eq, "!=": operator.ne,
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+}
+
+# Reglas de limpieza de los datasets SUBE (las mismas para todos los años)
+REGLAS_LIMPIEZA = [
+    # Valores negativos en CANTIDAD: errores o correcciones no documentadas
+    Regla("CANTIDAD negativa", "descartar", {"CANTIDAD": ("<", 0)}),
+    # El subte solo circula en CABA: se completa la ubicación que falta
+    Regla("SUBTE sin ubicación", "completar", {"TIPO_TRANSPORTE": "SUBTE"},
+          {"JURISDICCION": "CABA", "PROVINCIA": "CIUDAD AUTÓNOMA DE BUENOS AIRES", "MUNICIPIO": "CABA"}),
+    # COLECTIVO – Empresa 9 de Julio SRL – Línea 500 Santa Fe
+    Regla("Línea 500 Santa Fe", "asignar", {"TIPO_TRANSPORTE": "COLECTIVO", "LINEA": "LINEA_500I_SFE"},
+          {"PROVINCIA": "SANTA FE", "MUNICIPIO": "SANTA FE"}),
+    # TREN – Tren del Valle
+    Regla("Tren del Valle", "asignar", {"TIPO_TRANSPORTE": "TREN", "LINEA": "FFCC TREN DEL VALLE"},
+          {"PROVINCIA": "JN", "MUNICIPIO": "SD"}),
+]
+
+
+def columnas_reglas(reglas=REGLAS_LIMPIEZA):
+    """Columnas que leen o modifican las reglas (para cargar solo esas además de las propias)."""
+    columnas = [c for regla in reglas for c in list(regla.condicion) + list(regla.valores or {})]
+    return list(dict.fromkeys(columnas))
+
+
+def _mascara(df, regla, cache):
+    """Filas que cumplen todas las condiciones de la regla; cada comparación se calcula una sola vez."""
+    cumple = np.ones(len(df), dtype=bool)
+    for columna, criterio in regla.condicion.items():
+        simbolo, valor = criterio if isinstance(criterio, tuple) else ("==", criterio)
+        clave = (columna, simbolo, valor)
+        if clave not in cache:
+            cache[clave] = OPERADORES[simbolo](df[columna], valor).to_numpy(dtype=bool, na_value=False)
+        cumple &= cache[clave]
+    return cumple
+
+
+def aplicar_reglas(df, reglas=REGLAS_LIMPIEZA):
+    """Aplica las reglas de limpieza en una sola pasada y devuelve (df limpio, informe).
+
+    Las máscaras de todas las reglas se calculan sobre los datos originales y se
+    reutilizan (ej. TIPO_TRANSPORTE == "SUBTE" se compara una sola vez); las filas a
+    descartar no cuentan para las demás reglas. Las correcciones se hacen sobre df
+    (que se modifica) y las filas descartadas se quitan al final, de una sola vez.
+
+    El informe tiene una fila por regla y columna, con las filas que cumplen la
+    condición (FILAS_CONDICION) y las que efectivamente cambiaron (FILAS_AFECTADAS).
+    """
+    cache = {}
+    cumplen = [_mascara(df, regla, cache) for regla in reglas]
+
+    conservar = np.ones(len(df), dtype=bool)
+    for regla, cumple in zip(reglas, cumplen):
+        if regla.accion == "descartar":
+            conservar &= ~cumple
+
+    informe = []
+    for regla, cumple in zip(reglas, cumplen):
+        if regla.accion == "descartar":
+            informe.append((regla.nombre, regla.accion, "", cumple.sum(), cumple.sum()))
+            continue
+        cumple = cumple & conservar
+        for columna, valor in regla.valores.items():
+            asegurar_categorias(df, columna, [valor])
+            if regla.accion == "completar":
+                afectadas = cumple & df[columna].isna().to_numpy()
+            elif regla.accion == "asignar":
+                afectadas = cumple & (df[columna] != valor).to_numpy(dtype=bool, na_value=True)
+            else:
+                raise ValueError(f"Acción de limpieza desconocida: {regla.accion}")
+            if afectadas.any():
+                df.loc[afectadas, columna] = valor
+            informe.append((regla.nombre, regla.accion, columna, cumple.sum(), afectadas.sum()))
+
+    if not conservar.all():
+        df = df[conservar]
+    informe = pd.DataFrame(informe, columns=["REGLA", "ACCION", "COLUMNA", "FILAS_CONDICION", "FILAS_AFECTADAS"])
+    return df, informe
+
+
+def nulos_por_grupo(df, columnas, por="TIPO_TRANSPORTE"):
+    """Cantidad de nulos de cada columna por grupo, sin armar subconjuntos de filas.
+
+    Solo se devuelven los grupos con al menos un nulo.
+    """
+    conteos = df[columnas].isna().groupby(df[por], observed=True).sum()
+    return conteos[conteos.any(axis=1)]
@@ -0,0 +1,268 @@
+import argparse          # Para elegir el motor y los datasets desde la línea de comandos
+import os                # Para distinguir archivos de datasets particionados
+import time              # Para informar cuánto tarda cada motor
+
+import pandas as pd      # Para manipulación y análisis de datos en DataFrames
+
+from agregados_eda import DIMENSIONES_CUBO, AgregadosEDA, construir_cubo_diario
+from almacenamiento import COLUMNAS_CATEGORICAS, aplicar_esquema, formato_de, leer_dataset
+from dataset_particionado import consultar, listar_particiones
+from limpieza import OPERADORES, REGLAS_LIMPIEZA, aplicar_reglas, columnas_reglas
+
+try:
+    import duckdb
+except ImportError:             # DuckDB es opcional: sin él se usa Polars o pandas
+    duckdb = None
+
+try:
+    import polars as pl
+except ImportError:             # Polars es opcional: sin él se usa DuckDB o pandas
+    pl = None
+
+# Motores en orden de preferencia para motor="auto"
+MOTORES = ["duckdb", "polars", "pandas"]
+
+
+def motores_disponibles():
+    """Motores que se pueden usar con las librerías instaladas."""
+    instalados = {"duckdb": duckdb is not None, "polars": pl is not None, "pandas": True}
+    return [motor for motor in MOTORES if instalados[motor]]
+
+
+def elegir_motor(motor="auto"):
+    if motor == "auto":
+        return motores_disponibles()[0]
+    if motor not in motores_disponibles():
+        raise ValueError(f"Motor no disponible: {motor} (disponibles: {', '.join(motores_disponibles())})")
+    return motor
+
+
+def _archivos(rutas):
+    """(archivo, valores de partición) de cada ruta: un archivo suelto o un dataset particionado (directorio)."""
+    archivos = []
+    for ruta in rutas:
+        archivos.extend(listar_particiones(ruta) if os.path.isdir(ruta) else [(ruta, {})])
+    return archivos
+
+
+def _agrupar_por_particion(archivos, columnas):
+    """Agrupa los archivos por formato y por los valores de las claves de partición que se necesitan como columnas."""
+    grupos = {}
+    for ruta, valores in archivos:
+        propios = tuple((clave, valor) for clave, valor in valores.items() if clave in columnas)
+        grupos.setdefault((formato_de(ruta), propios), []).append(ruta)
+    return grupos
+
+
+def _normalizar(cubo, dimensiones):
+    """Mismo esquema, categorías y orden de filas para el cubo de cualquier motor.
+
+    Las categorías quedan solo con los valores presentes, en orden alfabético (salvo
+    DIA_SEMANA y TIPO_DIA, que tienen su propio orden), y las filas ordenadas por las dimensiones.
+    """
+    cubo = aplicar_esquema(cubo)
+    for columna in cubo.columns.intersection(COLUMNAS_CATEGORICAS):
+        serie = cubo[columna].cat.remove_unused_categories()
+        cubo[columna] = serie.cat.reorder_categories(sorted(serie.cat.categories))
+    return cubo.sort_values(dimensiones, kind="stable", na_position="last").reset_index(drop=True)
+
+
+# ----- P A N D A S   ( E N   M E M O R I A ,   U N   A R C H I V O   A   L A   V E Z ) -----
+def _cubo_pandas(rutas, dimensiones, columnas, reglas):
+    cubos = []
+    for ruta in rutas:
+        df = consultar(ruta, columnas=columnas) if os.path.isdir(ruta) else leer_dataset(ruta, columnas=columnas)
+        df, _ = aplicar_reglas(df, reglas)
+        cubos.append(construir_cubo_diario(df, dimensiones))
+    return construir_cubo_diario(pd.concat(cubos, ignore_index=True), dimensiones)
+
+
+# ----- D U C K D B   ( S Q L   S O B R E   L O S   A R C H I V O S ) -----
+def _literal_sql(valor):
+    if isinstance(valor, str):
+        return "'" + valor.replace("'", "''") + "'"
+    return repr(valor)
+
+
+def _condicion_sql(regla):
+    """Condición de la regla en SQL; una comparación con NULL cuenta como falsa (igual que en pandas)."""
+    partes = []
+    for columna, criterio in regla.condicion.items():
+        simbolo, valor = criterio if isinstance(criterio, tuple) else ("==", criterio)
+        simbolo = {"==": "=", "!=": "<>"}.get(simbolo, simbolo)
+        partes.append(f'COALESCE("{columna}" {simbolo} {_literal_sql(valor)}, FALSE)')
+    return " AND ".join(partes)
+
+
+def _columnas_limpias_sql(columnas, reglas):
+    """Expresión SELECT de cada columna con las correcciones de las reglas aplicadas en orden."""
+    expresiones = {columna: f'"{columna}"' for columna in columnas}
+    for regla in reglas:
+        if regla.accion == "descartar":
+            continue
+        condicion = _condicion_sql(regla)
+        for columna, valor in regla.valores.items():
+            actual = expresiones[columna]
+            if regla.accion == "completar":
+                cuando = f"{condicion} AND {actual} IS NULL"
+            elif regla.accion == "asignar":
+                cuando = condicion
+            else:
+                raise ValueError(f"Acción de limpieza desconocida: {regla.accion}")
+            expresiones[columna] = f"CASE WHEN {cuando} THEN {_literal_sql(valor)} ELSE {actual} END"
+    return ", ".join(f'{expresion} AS "{columna}"' for columna, expresion in expresiones.items())
+
+
+def _origen_sql(rutas, columnas):
+    """Unión de todos los archivos (CSV o Parquet), leyendo solo `columnas`."""
+    consultas = []
+    for (formato, propios), archivos in _agrupar_por_particion(_archivos(rutas), columnas).items():
+        lista = "[" + ", ".join(_literal_sql(archivo) for archivo in archivos) + "]"
+        if formato == "csv":
+            tipos = "{" + ", ".join(f"'{c}': 'VARCHAR'" for c in columnas if c not in ("CANTIDAD", "DIA_TRANSPORTE")) + "}"
+            lectura = f"read_csv({lista}, header = true, union_by_name = true, types = {tipos})"
+        else:
+            lectura = f"read_parquet({lista}, union_by_name = true)"
+        leidas = [c for c in columnas if c not in dict(propios)]
+        seleccion = [f'"{c}"' for c in leidas] + [f'{_literal_sql(str(v))} AS "{c}"' for c, v in propios]
+        consultas.append(f"SELECT {', '.join(seleccion)} FROM {lectura}")
+    return " UNION ALL BY NAME ".join(consultas)
+
+
+def _cubo_duckdb(rutas, dimensiones, columnas, reglas, limite_memoria=None):
+    descartar = [_condicion_sql(regla) for regla in reglas if regla.accion == "descartar"]
+    donde = " AND ".join(f"NOT ({condicion})" for condicion in descartar) or "TRUE"
+    dimensiones_sql = ", ".join(f'"{d}"' for d in dimensiones)
+    consulta = f"""
+        WITH origen AS ({_origen_sql(rutas, columnas)}),
+             limpio AS (SELECT {_columnas_limpias_sql(columnas, reglas)} FROM origen WHERE {donde})
+        SELECT {dimensiones_sql}, SUM("CANTIDAD")::BIGINT AS "CANTIDAD"
+        FROM (SELECT * REPLACE (CAST("DIA_TRANSPORTE" AS TIMESTAMP) AS "DIA_TRANSPORTE") FROM limpio)
+        GROUP BY ALL
+    """
+    with duckdb.connect() as conexion:
+        if limite_memoria:
+            conexion.execute(f"SET memory_limit = {_literal_sql(limite_memoria)}")
+        return conexion.execute(consulta).df()
+
+
+# ----- P O L A R S   ( A P I   L A Z Y ) -----
+def _condicion_polars(regla):
+    condicion = pl.lit(True)
+    for columna, criterio in regla.condicion.items():
+        simbolo, valor = criterio if isinstance(criterio, tuple) else ("==", criterio)
+        condicion = condicion & OPERADORES[simbolo](pl.col(columna), valor).fill_null(False)
+    return condicion
+
+
+def _origen_polars(rutas, columnas):
+    partes = []
+    for (formato, propios), archivos in _agrupar_por_particion(_archivos(rutas), columnas).items():
+        leidas = [c for c in columnas if c not in dict(propios)]
+        if formato == "csv":
+            tipos = {c: (pl.Int64 if c == "CANTIDAD" else pl.Utf8) for c in leidas}
+            lectura = pl.concat([pl.scan_csv(archivo, schema_overrides=tipos, encoding="utf8-lossy") for archivo in archivos], how="diagonal")
+        else:
+            lectura = pl.scan_parquet(archivos)
+        seleccion = [pl.col(c).cast(pl.Utf8) if c not in ("CANTIDAD", "DIA_TRANSPORTE") else pl.col(c) for c in leidas]
+        seleccion += [pl.lit(str(v)).alias(c) for c, v in propios]
+        partes.append(lectura.select(seleccion).with_columns(
+            pl.col("DIA_TRANSPORTE").cast(pl.Utf8).str.to_datetime(strict=False) if formato == "csv"
+            else pl.col("DIA_TRANSPORTE").cast(pl.Datetime("us")),
+            pl.col("CANTIDAD").cast(pl.Int64),
+        ))
+    return pl.concat(partes, how="diagonal")
+
+
+def _cubo_polars(rutas, dimensiones, columnas, reglas):
+    datos = _origen_polars(rutas, columnas)
+    for regla in reglas:
+        if regla.accion == "descartar":
+            datos = datos.filter(~_condicion_polars(regla))
+
+    # Las condiciones se evalúan sobre los valores originales: se calculan antes de corregir
+    correcciones = {}
+    for numero, regla in enumerate(reglas):
+        if regla.accion == "descartar":
+            continue
+        datos = datos.with_columns(_condicion_polars(regla).alias(f"__regla_{numero}"))
+        for columna, valor in regla.valores.items():
+            actual = correcciones.get(columna, pl.col(columna))
+            if regla.accion == "completar":
+                cuando = pl.col(f"__regla_{numero}") & actual.is_null()
+            elif regla.accion == "asignar":
+                cuando = pl.col(f"__regla_{numero}")
+            else:
+                raise ValueError(f"Acción de limpieza desconocida: {regla.accion}")
+            correcciones[columna] = pl.when(cuando).then(pl.lit(valor)).otherwise(actual)
+    datos = datos.with_columns(**correcciones)
+
+    cubo = datos.group_by(dimensiones).agg(pl.col("CANTIDAD").sum())
+    return cubo.collect(engine="streaming").to_pandas()
+
+
+# ----- P U N T O   D E   E N T R A D A -----
+def cubo_diario(rutas, dimensiones=DIMENSIONES_CUBO, motor="auto", reglas=REGLAS_LIMPIEZA, limite_memoria=None):
+    """Cubo diario (suma de CANTIDAD por `dimensiones`) de datasets enriquecidos, ya limpio.
+
+    `rutas` son archivos CSV o Parquet, o directorios de datasets particionados (ver
+    dataset_particionado.py). Con motor="duckdb" o "polars" la limpieza (las mismas
+    reglas de limpieza.py) y la agregación se ejecutan sobre los archivos, sin cargar
+    las filas en pandas: solo el cubo resultante pasa a memoria y los datasets pueden
+    ser más grandes que la RAM (`limite_memoria`, ej. "2GB", acota la memoria de DuckDB).
+    Con motor="pandas" se carga un archivo por vez. El resultado es idéntico con los
+    tres motores: mismas filas, mismo orden, mismos tipos y categorías.
+    """
+    rutas = [rutas] if isinstance(rutas, str) else list(rutas)
+    motor = elegir_motor(motor)
+    columnas = list(dict.fromkeys(list(dimensiones) + columnas_reglas(reglas) + ["CANTIDAD"]))
+    if motor == "duckdb":
+        cubo = _cubo_duckdb(rutas, dimensiones, columnas, reglas, limite_memoria)
+    elif motor == "polars":
+        cubo = _cubo_polars(rutas, dimensiones, columnas, reglas)
+    else:
+        cubo = _cubo_pandas(rutas, dimensiones, columnas, reglas)
+    return _normalizar(cubo, list(dimensiones))
+
+
+def agregados_eda(rutas, motor="auto", limite_memoria=None):
+    """Agregados del EDA (AgregadosEDA) de uno o varios datasets, calculados con `motor`."""
+    return AgregadosEDA(cubo_diario(rutas, DIMENSIONES_CUBO, motor, limite_memoria=limite_memoria))
+
+
+def verificar_motores(rutas, dimensiones=DIMENSIONES_CUBO):
+    """Calcula el cubo con todos los motores disponibles y verifica que sean idénticos al de pandas."""
+    referencia = None
+    for motor in reversed(motores_disponibles()):    # pandas primero
+        inicio = time.perf_counter()
+        cubo = cubo_diario(rutas, dimensiones, motor)
+        print(f"   {motor:<8} {time.perf_counter() - inicio:7.3f} s  {len(cubo):,} celdas")
+        if referencia is None:
+            referencia = cubo
+        else:
+            pd.testing.assert_frame_equal(cubo, referencia)
+    print(f"✅ Resultados idénticos con {', '.join(motores_disponibles())}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agregados del EDA SUBE con pandas, DuckDB o Polars (fuera de memoria)")
+    parser.add_argument("rutas", nargs="+", help="archivos CSV/Parquet o directorios particionados")
+    parser.add_argument("--motor", default="auto", choices=["auto"] + MOTORES)
+    parser.add_argument("--limite-memoria", help="memoria máxima de DuckDB (ej. 2GB)")
+    parser.add_argument("--verificar", action="store_true", help="comparar los resultados de todos los motores disponibles")
+    args = parser.parse_args()
+
+    if args.verificar:
+        verificar_motores(args.rutas)
+        return
+
+    inicio = time.perf_counter()
+    agregados = agregados_eda(args.rutas, args.motor, args.limite_memoria)
+    print(f"⚙️  Motor {elegir_motor(args.motor)}: {len(agregados.cubo):,} celdas en {time.perf_counter() - inicio:.2f} s\n")
+    print(agregados.viajes_por_tipo_transporte().to_string() + "\n")
+    print(agregados.promedio_por_tipo_dia().round(0).to_string() + "\n")
+    print(agregados.viajes_por_mes_y_tipo().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
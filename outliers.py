@@ -0,0 +1,66 @@
+import numpy as np       # Para operar con los códigos de grupo sin recorrer subgrupos
+import pandas as pd      # Para manipulación y análisis de datos en DataFrames
+
+
+def _como_lista(claves):
+    return [claves] if isinstance(claves, str) else list(claves)
+
+
+def marcar_outliers(df, claves, columna="CANTIDAD", factor=1.5):
+    """Marca los outliers de `columna` según el rango intercuartílico de cada grupo.
+
+    Se calculan Q1 y Q3 de todos los grupos con un único groupby().quantile()
+    y los límites se propagan a cada fila con los códigos de grupo, sin armar
+    subconjuntos del DataFrame. El límite inferior nunca es negativo.
+
+    Devuelve (es_outlier, limites):
+    - es_outlier: Serie booleana alineada con df.
+    - limites: tabla por grupo con Q1, Q3, IQR, LIMITE_INFERIOR, LIMITE_SUPERIOR, TOTAL y OUTLIERS.
+    """
+    claves = _como_lista(claves)
+    grupos = df.groupby(claves, observed=True, dropna=False, sort=True)
+    codigos = grupos.ngroup().to_numpy()
+
+    # Resultado del quantile con lista: un valor por (grupo, cuantil), agrupado por grupo
+    cuartiles = grupos[columna].quantile([0.25, 0.75])
+    q1, q3 = cuartiles.to_numpy().reshape(-1, 2).T
+    iqr = q3 - q1
+    inferior = np.maximum(q1 - factor * iqr, 0)
+    superior = q3 + factor * iqr
+
+    valores = df[columna].to_numpy()
+    es_outlier = (valores < inferior[codigos]) | (valores > superior[codigos])
+
+    limites = pd.DataFrame(
+        {
+            "Q1": q1,
+            "Q3": q3,
+            "IQR": iqr,
+            "LIMITE_INFERIOR": inferior,
+            "LIMITE_SUPERIOR": superior,
+            "TOTAL": np.bincount(codigos, minlength=len(q1)),
+            "OUTLIERS": np.bincount(codigos, weights=es_outlier, minlength=len(q1)).astype("int64"),
+        },
+        index=cuartiles.index.droplevel(-1)[::2],
+    )
+    return pd.Series(es_outlier, index=df.index, name="ES_OUTLIER"), limites
+
+
+def aplicar_limites(df, limites, columna="CANTIDAD"):
+    """Marca outliers en `df` usando una tabla de límites ya calculada (ej. la de otro período).
+
+    Las filas de grupos que no están en la tabla no se marcan.
+    """
+    claves = list(limites.index.names)
+    if len(claves) == 1:
+        buscadas = pd.Index(df[claves[0]])
+    else:
+        buscadas = pd.MultiIndex.from_frame(df[claves])
+    posiciones = limites.index.get_indexer(buscadas)
+
+    encontrado = posiciones >= 0
+    inferior = limites["LIMITE_INFERIOR"].to_numpy()[posiciones]
+    superior = limites["LIMITE_SUPERIOR"].to_numpy()[posiciones]
+    valores = df[columna].to_numpy()
+    es_outlier = encontrado & ((valores < inferior) | (valores > superior))
+    return pd.Series(es_outlier, index=df.index, name="ES_OUTLIER")
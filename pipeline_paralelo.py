@@ -0,0 +1,262 @@
+import argparse          # Para elegir los años y la cantidad de procesos desde la línea de comandos
+import multiprocessing   # Para ejecutar las tareas independientes en procesos separados
+import os
+import time              # Para medir cada tarea dentro de su proceso
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date
+from functools import partial, reduce
+
+import pandas as pd      # Para manipulación y análisis de datos en DataFrames
+
+import almacenamiento
+import limpieza
+from agregados_eda import construir_cubo_diario
+from almacenamiento import aplicar_esquema, formato_de, leer_dataset
+from cache_etapas import huella, huella_archivo, huella_codigo, memoizar
+from comparativa import DIMENSIONES_COMPARATIVA, clave_agregado_anual, columnas_agregado, comparar_anios
+from estadisticas_streaming import EstadisticasStreaming
+from instrumentacion import iniciar, registrar, rss_pico_mb, seccion
+from limpieza import aplicar_reglas
+from pipeline_sube import feriados_por_anio, procesar_anio
+
+# Una tarea del grafo: nombre único, función a ejecutar, argumentos propios y tareas de las que depende.
+# La función recibe sus argumentos seguidos de los resultados de las dependencias, en el mismo orden
+Tarea = namedtuple("Tarea", ["nombre", "funcion", "argumentos", "dependencias"], defaults=[(), ()])
+
+# Grupos de las estadísticas de CANTIDAD que se acumulan por partición (los mismos del EDA)
+CLAVES_ESTADISTICAS = ["AMBA", "TIPO_TRANSPORTE"]
+
+# Agregados de una partición (un mes o un año completo) o de un año ya combinado
+Agregados = namedtuple("Agregados", ["cubo", "estadisticas", "filas"])
+
+# Resultado de todo el pipeline: datasets enriquecidos, agregados por año, estadísticas de todos
+# los años juntos y variación interanual (None si hay un solo año)
+Resultado = namedtuple("Resultado", ["rutas", "agregados", "estadisticas", "variacion"])
+
+
+# ----- E J E C U C I Ó N   D E L   G R A F O   D E   T A R E A S -----
+def ordenar_tareas(tareas):
+    """Orden topológico de las tareas (cada una después de sus dependencias).
+
+    Ante nombres repetidos, dependencias inexistentes o ciclos se lanza ValueError.
+    Las tareas independientes conservan el orden en que se declararon.
+    """
+    por_nombre = {}
+    for tarea in tareas:
+        if tarea.nombre in por_nombre:
+            raise ValueError(f"Tarea repetida: {tarea.nombre}")
+        por_nombre[tarea.nombre] = tarea
+    for tarea in tareas:
+        faltantes = [d for d in tarea.dependencias if d not in por_nombre]
+        if faltantes:
+            raise ValueError(f"La tarea '{tarea.nombre}' depende de tareas inexistentes: {', '.join(faltantes)}")
+
+    orden, hechas = [], set()
+    pendientes = list(tareas)
+    while pendientes:
+        listas = [t for t in pendientes if hechas.issuperset(t.dependencias)]
+        if not listas:
+            raise ValueError(f"Dependencias circulares entre: {', '.join(t.nombre for t in pendientes)}")
+        orden.extend(listas)
+        hechas.update(t.nombre for t in listas)
+        pendientes = [t for t in pendientes if t.nombre not in hechas]
+    return orden
+
+
+def _ejecutar(funcion, argumentos):
+    """Ejecuta una tarea y devuelve su resultado, los segundos que tardó y la memoria máxima del proceso."""
+    inicio = time.perf_counter()
+    resultado = funcion(*argumentos)
+    return resultado, time.perf_counter() - inicio, rss_pico_mb()
+
+
+def ejecutar_dag(tareas, procesos=None):
+    """Ejecuta las tareas respetando sus dependencias, las independientes en paralelo.
+
+    Cada tarea se envía a un pool de `procesos` procesos (por defecto, uno por
+    núcleo) apenas terminan todas sus dependencias. Los procesos se crean con "fork";
+    donde no está disponible, o con `procesos=1`, las tareas se ejecutan una detrás
+    de otra en el proceso actual. El tiempo y la memoria de cada tarea se registran
+    en la instrumentación de la ejecución actual como "tarea <nombre>".
+    Devuelve {nombre: resultado}. Si una tarea falla se propaga su error.
+    """
+    orden = ordenar_tareas(tareas)
+    resultados = {}
+
+    def argumentos(tarea):
+        return (*tarea.argumentos, *(resultados[d] for d in tarea.dependencias))
+
+    def terminar(tarea, salida):
+        resultado, segundos, pico = salida
+        resultados[tarea.nombre] = resultado
+        registrar(f"tarea {tarea.nombre}", segundos, getattr(resultado, "filas", None), pico)
+        print(f"✔️  {tarea.nombre} ({segundos:.2f} s)")
+
+    if procesos == 1 or "fork" not in multiprocessing.get_all_start_methods():
+        for tarea in orden:
+            terminar(tarea, _ejecutar(tarea.funcion, argumentos(tarea)))
+        return resultados
+
+    contexto = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto) as pool:
+        pendientes, en_curso = list(orden), {}
+        while pendientes or en_curso:
+            listas = [t for t in pendientes if resultados.keys() >= set(t.dependencias)]
+            for tarea in listas:
+                en_curso[pool.submit(_ejecutar, tarea.funcion, argumentos(tarea))] = tarea
+            pendientes = [t for t in pendientes if t not in listas]
+            terminados, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+            for futuro in terminados:
+                terminar(en_curso.pop(futuro), futuro.result())
+    return resultados
+
+
+# ----- A G R E G A D O S   P O R   P A R T I C I Ó N -----
+def meses_del_anio(anio, hoy=None):
+    """Meses de `anio` que pueden tener datos (el año en curso, hasta el mes actual)."""
+    hoy = hoy or date.today()
+    return list(range(1, 13 if anio < hoy.year else hoy.month + 1))
+
+
+def leer_particion(ruta, anio, mes, columnas):
+    """Filas de un mes del dataset enriquecido (del año completo si `mes` es None).
+
+    En Parquet el filtro por fecha se aplica al leer, con las estadísticas de cada grupo
+    de filas: almacenamiento.guardar_dataset escribe un grupo por mes, así que se lee
+    del disco solo el del mes pedido y no el año completo.
+    """
+    if mes is None:
+        return leer_dataset(ruta, columnas=columnas)
+    desde = pd.Timestamp(year=anio, month=mes, day=1)
+    hasta = desde + pd.offsets.MonthBegin(1)
+    filtro = [("DIA_TRANSPORTE", ">=", desde), ("DIA_TRANSPORTE", "<", hasta)]
+    return aplicar_esquema(pd.read_parquet(ruta, columns=columnas, filters=filtro))
+
+
+def agregar_particion(anio, mes, ruta):
+    """Cubo diario (DIMENSIONES_COMPARATIVA) y estadísticas de CANTIDAD de un mes ya limpio.
+
+    Se memoriza en .cache_etapas/ con la huella del archivo y del código: al volver a
+    ejecutar el pipeline sin cambios no se vuelve a leer ninguna partición.
+    """
+    def calcular():
+        columnas = list(dict.fromkeys(columnas_agregado() + CLAVES_ESTADISTICAS))
+        df, _ = aplicar_reglas(leer_particion(ruta, anio, mes, columnas))
+        estadisticas = EstadisticasStreaming("CANTIDAD", CLAVES_ESTADISTICAS).agregar(df)
+        return construir_cubo_diario(df, DIMENSIONES_COMPARATIVA), estadisticas, len(df)
+
+    clave = huella(
+        huella_archivo(ruta), anio, mes,
+        huella_codigo(almacenamiento, limpieza, construir_cubo_diario, EstadisticasStreaming, leer_particion, agregar_particion),
+    )
+    # Se guarda como tupla: Agregados es de __main__ cuando este módulo se ejecuta como script
+    return Agregados(*memoizar("agregado_particion", clave, calcular))
+
+
+def combinar_anio(ruta, *parciales):
+    """Une los agregados de las particiones de un año (meses disjuntos, en orden).
+
+    El cubo resultante es el mismo que calcula comparativa.agregado_anual, así que
+    se guarda también con su clave: la comparación interanual lo reutiliza sin releer el año.
+    """
+    con_filas = [p for p in parciales if p.filas] or parciales[:1]    # los meses sin datos no aportan nada
+    cubo = aplicar_esquema(pd.concat([p.cubo for p in con_filas], ignore_index=True))
+    cubo = memoizar("agregado_anual", clave_agregado_anual(ruta), lambda: cubo)
+    estadisticas = reduce(lambda a, b: a.combinar(b), (p.estadisticas for p in con_filas))
+    return Agregados(cubo, estadisticas, sum(p.filas for p in con_filas))
+
+
+# ----- G R A F O   D E L   P I P E L I N E   C O M P L E T O -----
+def tareas_pipeline(anios, feriados, formato="parquet", chunksize=None, forzar=False, hoy=None):
+    """Grafo de tareas del pipeline para los años pedidos.
+
+    Por cada año: enriquecimiento (pipeline_sube.procesar_anio) → un agregado por mes
+    (o uno por año si el formato no es Parquet, que no permite leer un mes sin recorrer
+    todo el archivo) → combinación de los meses. Las ramas de cada año y los meses de
+    un mismo año son independientes entre sí.
+    """
+    tareas = []
+    for anio in anios:
+        salida = f"df-sube-{anio}.{formato}"
+        enriquecer = f"enriquecer {anio}"
+        tareas.append(Tarea(enriquecer, partial(
+            procesar_anio, anio, salida=salida, chunksize=chunksize, formato=formato,
+            feriados=feriados[anio], forzar=forzar,
+        )))
+        meses = meses_del_anio(anio, hoy) if formato_de(salida) == "parquet" else [None]
+        particiones = []
+        for mes in meses:
+            nombre = f"agregar {anio}" + (f"-{mes:02d}" if mes else "")
+            tareas.append(Tarea(nombre, agregar_particion, (anio, mes), [enriquecer]))
+            particiones.append(nombre)
+        tareas.append(Tarea(f"combinar {anio}", combinar_anio, (), [enriquecer, *particiones]))
+    return tareas
+
+
+def ejecutar_pipeline(anios, formato="parquet", chunksize=None, procesos=None, por=("TIPO_TRANSPORTE",),
+                      refrescar=False, forzar=False):
+    """Enriquece y agrega todos los años en paralelo y combina los resultados al final.
+
+    Los feriados se descargan primero (en paralelo, ver feriados.descargar_feriados);
+    después se ejecuta el grafo de tareas_pipeline y, ya en el proceso principal, se
+    combinan las estadísticas de todos los años y se calcula la variación de cada año
+    contra el anterior por las dimensiones `por`.
+    """
+    anios = sorted(anios)
+    with seccion("feriados"):
+        feriados = feriados_por_anio(anios, refrescar)
+    with seccion("grafo de tareas"):
+        resultados = ejecutar_dag(tareas_pipeline(anios, feriados, formato, chunksize, forzar), procesos)
+
+    with seccion("combinación final"):
+        por_anio = {anio: resultados[f"combinar {anio}"] for anio in anios}
+        estadisticas = reduce(lambda a, b: a.combinar(b), (a.estadisticas for a in por_anio.values()))
+        agregados = {anio: a.cubo for anio, a in por_anio.items()}
+        variacion = comparar_anios(anios, list(por), agregados=agregados) if len(anios) > 1 else None
+    rutas = {anio: resultados[f"enriquecer {anio}"] for anio in anios}
+    return Resultado(rutas, agregados, estadisticas, variacion)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pipeline SUBE completo en paralelo: enriquecimiento, agregados por mes y comparación interanual"
+    )
+    parser.add_argument("anios", nargs="*", type=int, default=[2024, 2025], help="años a procesar")
+    parser.add_argument("--procesos", type=int, default=None, help="procesos en paralelo (por defecto, uno por núcleo)")
+    parser.add_argument(
+        "--formato", choices=["csv", "parquet", "feather"], default="parquet",
+        help="formato de los datasets enriquecidos (con parquet los agregados se calculan por mes)"
+    )
+    parser.add_argument("--chunksize", type=int, default=None, help="enriquecer en bloques de N filas (memoria acotada)")
+    parser.add_argument("--por", nargs="*", default=["TIPO_TRANSPORTE"], help="dimensiones de la variación interanual")
+    parser.add_argument("--refrescar-feriados", action="store_true", help="volver a descargar los feriados")
+    parser.add_argument("--forzar", action="store_true", help="volver a generar los datasets enriquecidos")
+    parser.add_argument("--informe", help="guardar el tiempo, la memoria y las filas de cada tarea en este JSON")
+    parser.add_argument("--perfil", help="guardar un perfil de cProfile del proceso principal en este archivo")
+    args = parser.parse_args()
+
+    instrumentacion = iniciar("pipeline_paralelo", perfil=bool(args.perfil))
+    print(f"⚙️  Procesos: {args.procesos or os.cpu_count()}")
+    resultado = ejecutar_pipeline(args.anios, args.formato, args.chunksize, args.procesos, args.por,
+                                  refrescar=args.refrescar_feriados, forzar=args.forzar)
+
+    print("─" * 80 + "\nVIAJES POR AÑO\n")
+    for anio, cubo in resultado.agregados.items():
+        print(f"{anio}: {cubo['CANTIDAD'].sum():>15,} viajes ({resultado.rutas[anio]})")
+    print("─" * 80 + "\nDISTRIBUCIÓN DE CANTIDAD POR TIPO DE TRANSPORTE (TODOS LOS AÑOS)\n")
+    print(resultado.estadisticas.describir("TIPO_TRANSPORTE").round(2).to_string())
+    if resultado.variacion is not None:
+        print("─" * 80 + "\nVARIACIÓN INTERANUAL\n")
+        print(resultado.variacion.to_string(index=False))
+
+    instrumentacion.imprimir_resumen()
+    if args.informe:
+        instrumentacion.guardar_informe(args.informe)
+    if args.perfil:
+        instrumentacion.guardar_perfil(args.perfil)
+    print("✅ Proceso finalizado.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import argparse          # Para leer los años desde la línea de comandos
+import os                # Para verificar si el dataset original está descargado
+
+import almacenamiento
+import calendario_feriados
+import tipo_dia
+from almacenamiento import (
+    COLUMNAS_ORIGINALES, guardar_dataset, guardar_por_bloques, leer_csv_sube, leer_csv_sube_por_bloques,
+    problemas_validacion, sumar_validaciones, validar_sube,
+)
+from cache_etapas import huella, huella_archivo, huella_codigo, registrar_salida, salida_vigente
+from feriados import agregar_motivo_feriado, descargar_feriados
+from instrumentacion import etapa, iniciar, seccion
+from tipo_dia import agregar_tipo_dia
+
+URL_DATASET = "https://archivos-datos.transporte.gob.ar/upload/Dat_Ab_Usos/dat-ab-usos-{anio}.csv"
+
+
+def origen_por_defecto(anio):
+    """Usa el CSV descargado si existe; si no, lo lee directamente desde datos.transporte.gob.ar."""
+    local = f"dat-ab-usos-{anio}.csv"
+    return local if os.path.exists(local) else URL_DATASET.format(anio=anio)
+
+
+def feriados_por_anio(anios, refrescar=False):
+    """Feriados de cada año desde ambas fuentes: Nager.Date (tipo de día) y La Nación (motivo).
+
+    Todos los años y fuentes se descargan en paralelo; se leen de la caché local
+    cuando está vigente y `refrescar=True` fuerza la descarga.
+    Devuelve {anio: {"api": {...}, "lanacion": {...}}}.
+    """
+    descargados = descargar_feriados(anios, refrescar=refrescar)
+    return {
+        anio: {"api": descargados[("nager", anio)], "lanacion": descargados[("lanacion", anio)]}
+        for anio in anios
+    }
+
+
+# ----- E T A P A S   D E   E N R I Q U E C I M I E N T O -----
+# Cada etapa recibe el DataFrame y los feriados del año, agrega sus columnas y devuelve el DataFrame.
+# @etapa() registra el tiempo, la memoria y las filas de cada llamada (ver instrumentacion.py)
+@etapa()
+def etapa_tipo_dia(df, feriados):
+    """DIA_SEMANA y TIPO_DIA (HÁBIL, FIN_DE_SEMANA o FERIADO) según Nager.Date."""
+    return agregar_tipo_dia(df, feriados["api"])
+
+
+@etapa()
+def etapa_motivo_feriado(df, feriados):
+    """MOTIVO_FERIADO según el scraping de La Nación."""
+    return agregar_motivo_feriado(df, feriados["lanacion"])
+
+
+ETAPAS = [etapa_tipo_dia, etapa_motivo_feriado]
+
+
+def enriquecer(df, feriados, etapas=ETAPAS):
+    """Aplica las etapas en memoria, una detrás de otra, sin escribir archivos intermedios."""
+    for etapa in etapas:
+        df = etapa(df, feriados)
+    return df
+
+
+def enriquecer_por_bloques(origen, feriados, chunksize, etapas=ETAPAS, validaciones=None):
+    """Lee el dataset en bloques de `chunksize` filas y devuelve cada bloque ya enriquecido.
+
+    Como los feriados se obtienen una sola vez y las etapas solo dependen de la
+    fecha de cada fila, escribir los bloques uno detrás de otro da un archivo
+    idéntico (byte a byte, en CSV) al del camino en memoria, pero el consumo de
+    memoria queda acotado al tamaño del bloque. Si se pasa la lista `validaciones`,
+    se le agrega el informe de validar_sube de cada bloque original.
+    """
+    for bloque in leer_csv_sube_por_bloques(origen, chunksize=chunksize):
+        if validaciones is not None:
+            validaciones.append(validar_sube(bloque, COLUMNAS_ORIGINALES))
+        yield enriquecer(bloque, feriados, etapas)
+
+
+def informar_validacion(anio, informe):
+    """Imprime las columnas del dataset original con nulos, negativos o valores fuera del esquema."""
+    problemas = problemas_validacion(informe)
+    if problemas.empty:
+        print(f"✅ {anio}: el dataset original cumple el esquema, sin nulos ni negativos")
+    else:
+        print(f"⚠️  {anio}: valores a revisar en el dataset original\n{problemas.to_string()}")
+
+
+def huella_enriquecimiento(origen, feriados, formato):
+    """Huella de todo lo que determina el dataset enriquecido: archivo original, feriados, formato y código.
+
+    Devuelve None si el origen es una URL (no se puede saber si cambió sin descargarlo).
+    """
+    if not os.path.exists(origen):
+        return None
+    return huella(
+        huella_archivo(origen), feriados, formato,
+        huella_codigo(tipo_dia, calendario_feriados, agregar_motivo_feriado, almacenamiento, *ETAPAS, enriquecer),
+    )
+
+
+def procesar_anio(anio, origen=None, salida=None, chunksize=None, formato="csv", feriados=None,
+                  refrescar=False, forzar=False):
+    """Una sola lectura del dataset original, enriquecimiento completo y una sola escritura.
+
+    Con `chunksize` el dataset se procesa en bloques (modo streaming) en lugar de cargarlo entero.
+    `formato` define el archivo de salida: csv, parquet o feather (ver almacenamiento.py).
+    Si no se pasan los `feriados` del año, se obtienen en ese momento.
+    Si la salida ya se generó a partir del mismo archivo original, los mismos feriados
+    y el mismo código (ver cache_etapas.py), no se vuelve a generar salvo con `forzar`.
+    """
+    origen = origen or origen_por_defecto(anio)
+    salida = salida or f"df-sube-{anio}.{formato}"
+
+    if feriados is None:
+        with seccion("feriados"):
+            feriados = feriados_por_anio([anio], refrescar)[anio]
+    print(f"✅ {anio}: {len(feriados['api'])} feriados (Nager.Date), {len(feriados['lanacion'])} feriados (La Nación)")
+
+    clave = huella_enriquecimiento(origen, feriados, formato)
+    if clave and not forzar and salida_vigente(salida, clave):
+        print(f"♻️  {anio}: {salida} ya está actualizado (sin cambios en el origen, los feriados ni el código)")
+        return salida
+
+    if chunksize:
+        # Lectura y escritura intercaladas: se miden juntas (las etapas se miden por separado)
+        validaciones = []
+        with seccion(f"procesamiento por bloques {anio}", filas=lambda: filas):
+            filas = guardar_por_bloques(enriquecer_por_bloques(origen, feriados, chunksize, validaciones=validaciones), salida)
+        informar_validacion(anio, sumar_validaciones(validaciones))
+    else:
+        # Lectura con el esquema declarado (almacenamiento.leer_csv_sube) y validación solo con conteos
+        with seccion(f"lectura {anio}", filas=lambda: len(df)):
+            df = leer_csv_sube(origen)
+        with seccion(f"validación {anio}", filas=len(df)):
+            informar_validacion(anio, validar_sube(df, COLUMNAS_ORIGINALES))
+        df = enriquecer(df, feriados)
+        with seccion(f"escritura {anio}", filas=len(df)):
+            guardar_dataset(df, salida)
+        filas = len(df)
+
+    if clave:
+        registrar_salida(salida, clave)
+    print(f"📁 {anio}: {filas:,} filas guardadas en {salida}")
+    return salida
+
+
+def procesar_anios(anios, chunksize=None, formato="csv", refrescar=False, forzar=False):
+    """Ejecuta el pipeline para cada año de la lista y devuelve los archivos generados."""
+    with seccion("feriados"):
+        feriados = feriados_por_anio(anios, refrescar)
+    return [
+        procesar_anio(anio, chunksize=chunksize, formato=formato, feriados=feriados[anio], forzar=forzar)
+        for anio in anios
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Enriquece los datasets SUBE con DIA_SEMANA, TIPO_DIA y MOTIVO_FERIADO"
+    )
+    parser.add_argument("anios", nargs="*", type=int, default=[2024, 2025], help="años a procesar")
+    parser.add_argument(
+        "--chunksize", type=int, default=None,
+        help="procesar el dataset en bloques de N filas (memoria acotada)"
+    )
+    parser.add_argument(
+        "--formato", choices=["csv", "parquet", "feather"], default="csv",
+        help="formato del archivo de salida (parquet recomendado para el EDA)"
+    )
+    parser.add_argument(
+        "--refrescar-feriados", action="store_true",
+        help="volver a descargar los feriados aunque la caché local esté vigente"
+    )
+    parser.add_argument(
+        "--forzar", action="store_true",
+        help="volver a generar los datasets aunque no hayan cambiado sus entradas"
+    )
+    parser.add_argument("--informe", help="guardar el tiempo, la memoria y las filas de cada etapa en este JSON")
+    parser.add_argument("--perfil", help="guardar un perfil de cProfile de toda la ejecución en este archivo")
+    args = parser.parse_args()
+
+    instrumentacion = iniciar("pipeline_sube", perfil=bool(args.perfil))
+    procesar_anios(args.anios, chunksize=args.chunksize, formato=args.formato,
+                   refrescar=args.refrescar_feriados, forzar=args.forzar)
+    instrumentacion.imprimir_resumen()
+    if args.informe:
+        instrumentacion.guardar_informe(args.informe)
+    if args.perfil:
+        instrumentacion.guardar_perfil(args.perfil)
+    print("✅ Proceso finalizado.")
+
+
+if __name__ == "__main__":
+    main()
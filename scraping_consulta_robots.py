@@ -1,15 +1,53 @@
+import threading                        # Para compartir las reglas entre hilos de descarga
+from urllib.parse import urljoin, urlsplit
+from urllib.robotparser import RobotFileParser
+
 import requests
 
-# Consulta el archivo robots.txt del sitio de Wikipedia
-print(requests.get("https://www.lanacion.com.ar/robots.txt").text)
+AGENTE = "Mozilla/5.0"
+
+# Reglas de robots.txt ya descargadas, por sitio (se consultan una sola vez por ejecución)
+_reglas_por_sitio = {}
+_candado = threading.Lock()
+
+
+def reglas_robots(url, sesion=None):
+    """Descarga y parsea el robots.txt del sitio de `url` (una sola vez por sitio)."""
+    partes = urlsplit(url)
+    sitio = f"{partes.scheme}://{partes.netloc}"
+    with _candado:
+        if sitio not in _reglas_por_sitio:
+            resp = (sesion or requests).get(urljoin(sitio, "/robots.txt"), headers={"User-Agent": AGENTE}, timeout=10)
+            reglas = RobotFileParser()
+            if resp.status_code in (401, 403):
+                reglas.disallow_all = True
+            elif resp.status_code >= 400:
+                reglas.allow_all = True    # sin robots.txt no hay restricciones declaradas
+            else:
+                reglas.parse(resp.text.splitlines())
+            _reglas_por_sitio[sitio] = reglas
+        return _reglas_por_sitio[sitio]
+
+
+def scraping_permitido(url, sesion=None, agente=AGENTE):
+    """True si el robots.txt del sitio permite que `agente` descargue `url`."""
+    return reglas_robots(url, sesion).can_fetch(agente, url)
+
+
+if __name__ == "__main__":
+    # Consulta el archivo robots.txt del sitio de La Nación
+    print(requests.get("https://www.lanacion.com.ar/robots.txt").text)
+    for anio in (2024, 2025):
+        url = f"https://www.lanacion.com.ar/feriados/{anio}/"
+        print(f"{'✅' if scraping_permitido(url) else '⛔'} {url}")
 
 '''
-El archivo nO prohíbe de forma general el scraping. 
-⛔ Solo restringe el acceso a ciertas rutas, como: 
+El archivo nO prohíbe de forma general el scraping.
+⛔ Solo restringe el acceso a ciertas rutas, como:
 - /sinbarreras, /newsletters/, /registracion, etc.
 - URLs con ?utm_* en los parámetros.
 - Algunas rutas específicas como /buscador, /pf/api/..., y ciertos artículos puntuales.
 
 # 👉🏼 La página de feriados https://www.lanacion.com.ar/feriados/2024/ no está bloqueada
 # ✅ Se puede hacer scraping de esa página.
-'''
\ No newline at end of file
+'''
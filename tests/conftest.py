@@ -0,0 +1,48 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Los módulos del proyecto están en la raíz del repositorio (no es un paquete instalable)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ENCABEZADO = "DIA_TRANSPORTE,NOMBRE_EMPRESA,LINEA,AMBA,TIPO_TRANSPORTE,JURISDICCION,PROVINCIA,MUNICIPIO,CANTIDAD,DATO_PRELIMINAR"
+
+# Feriados de prueba con el formato de feriados_por_anio (sin descargar nada)
+FERIADOS = {
+    "api": {"2024-01-01": "Año Nuevo", "2024-02-12": "Carnaval", "2024-03-24": "Día de la Memoria"},
+    "lanacion": {"2024-01-01": "Año Nuevo", "2024-02-12": "Carnaval", "2024-03-24": "Día de la Memoria"},
+}
+
+
+def filas_sube(dias=90, lineas=4, desde="2024-01-01"):
+    """Filas de un CSV original (sin encabezado): `lineas` líneas por día, ordenadas por fecha."""
+    filas = []
+    for i, fecha in enumerate(pd.date_range(desde, periods=dias)):
+        for linea in range(lineas):
+            filas.append(
+                f"{fecha:%Y-%m-%d},EMPRESA {linea},LINEA_{linea},SI,COLECTIVO,NACIONAL,"
+                f"BUENOS AIRES,LA PLATA,{1000 + 7 * i + linea},NO"
+            )
+    return filas
+
+
+def con_valor(fila, columna, valor):
+    """La misma fila con otro valor en `columna`."""
+    valores = fila.split(",")
+    valores[ENCABEZADO.split(",").index(columna)] = valor
+    return ",".join(valores)
+
+
+@pytest.fixture
+def csv_sube(tmp_path, monkeypatch):
+    """Escribe un CSV original con las filas dadas; las pruebas corren dentro de tmp_path (cachés incluidas)."""
+    monkeypatch.chdir(tmp_path)
+
+    def escribir(filas, nombre="dat-ab-usos-2024.csv"):
+        ruta = tmp_path / nombre
+        ruta.write_text("\n".join([ENCABEZADO, *filas]) + "\n", encoding="utf-8")
+        return str(ruta)
+
+    return escribir
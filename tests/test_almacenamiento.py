@@ -0,0 +1,68 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from almacenamiento import (
+    COLUMNAS_ORIGINALES, MOTORES_CSV, guardar_dataset, guardar_por_bloques, leer_csv_sube, validar_sube,
+)
+from conftest import ENCABEZADO, con_valor, filas_sube
+
+
+def csv_en_memoria(filas):
+    return io.BytesIO(("\n".join([ENCABEZADO, *filas]) + "\n").encode("utf-8"))
+
+
+def leer(filas):
+    return pd.read_csv(csv_en_memoria(filas), parse_dates=["DIA_TRANSPORTE"])
+
+
+@pytest.mark.parametrize("formato", ["parquet", "feather", "csv"])
+def test_guardar_no_modifica_el_dataframe(tmp_path, formato):
+    df = leer(filas_sube(dias=3))
+    tipos = df.dtypes.copy()
+    guardar_dataset(df, str(tmp_path / f"salida.{formato}"))
+    pd.testing.assert_series_equal(df.dtypes, tipos)
+
+
+def test_parquet_por_bloques_con_columna_toda_nula_en_el_primero(tmp_path):
+    df = leer(filas_sube(dias=10))
+    df["JURISDICCION"] = df["JURISDICCION"].where(df.index >= 20)
+    ruta = str(tmp_path / "bloques.parquet")
+    guardar_por_bloques((df.iloc[i:i + 20].copy() for i in range(0, len(df), 20)), ruta)
+    leido = pd.read_parquet(ruta)
+    assert leido["JURISDICCION"].isna().sum() == 20
+    assert leido["CANTIDAD"].tolist() == df["CANTIDAD"].tolist()
+
+
+def meses_por_grupo(ruta):
+    archivo = pq.ParquetFile(ruta)
+    columna = archivo.schema_arrow.get_field_index("DIA_TRANSPORTE")
+    estadisticas = [archivo.metadata.row_group(i).column(columna).statistics for i in range(archivo.num_row_groups)]
+    return [(pd.Timestamp(e.min).to_period("M"), pd.Timestamp(e.max).to_period("M")) for e in estadisticas]
+
+
+def test_parquet_con_un_grupo_de_filas_por_mes(tmp_path):
+    df = leer(filas_sube(dias=90))
+    ruta = str(tmp_path / "anio.parquet")
+    guardar_dataset(df, ruta)
+    assert [desde for desde, _ in meses_por_grupo(ruta)] == list(pd.period_range("2024-01", "2024-03", freq="M"))
+    assert all(desde == hasta for desde, hasta in meses_por_grupo(ruta))
+
+    # Por bloques los grupos se cortan también en cada bloque, pero nunca mezclan meses
+    ruta = str(tmp_path / "bloques.parquet")
+    guardar_por_bloques((df.iloc[i:i + 50].copy() for i in range(0, len(df), 50)), ruta)
+    assert all(desde == hasta for desde, hasta in meses_por_grupo(ruta))
+    pd.testing.assert_frame_equal(pd.read_parquet(ruta), pd.read_parquet(str(tmp_path / "anio.parquet")))
+
+
+@pytest.mark.parametrize("motor", MOTORES_CSV)
+def test_cantidad_no_entera_es_violacion_y_no_se_trunca(motor):
+    filas = filas_sube(dias=3)
+    filas[1] = con_valor(filas[1], "CANTIDAD", "12.5")
+    df = leer_csv_sube(csv_en_memoria(filas), motor=motor)
+    assert np.isnan(df["CANTIDAD"].iloc[1])
+    assert df["CANTIDAD"].drop(index=1).tolist() == [int(f.split(",")[8]) for i, f in enumerate(filas) if i != 1]
+    assert validar_sube(df, COLUMNAS_ORIGINALES).loc["CANTIDAD", "FUERA_DE_ESQUEMA"] == 1
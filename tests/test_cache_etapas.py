@@ -0,0 +1,51 @@
+import os
+import shutil
+import time
+
+from cache_etapas import ARCHIVO_SALIDAS, _bloqueo, huella_archivo, registrar_salida, salida_vigente
+
+
+def test_huella_por_contenido(tmp_path):
+    directorio = str(tmp_path / "cache")
+    ruta = tmp_path / "datos.csv"
+    ruta.write_text("a,b\n1,2\n")
+    original = huella_archivo(str(ruta), directorio)
+
+    os.utime(ruta, (time.time() + 60, time.time() + 60))       # tocado, mismo contenido
+    assert huella_archivo(str(ruta), directorio) == original
+    shutil.copy(ruta, tmp_path / "copia.csv")
+    assert huella_archivo(str(tmp_path / "copia.csv"), directorio) == original
+
+    ruta.write_text("a,b\n1,3\n")
+    os.utime(ruta, (time.time() + 120, time.time() + 120))
+    assert huella_archivo(str(ruta), directorio) != original
+
+
+def test_bloqueo_vencido_se_descarta(tmp_path):
+    ruta = tmp_path / "salida.csv"
+    ruta.write_text("x\n")
+    bloqueo = tmp_path / (ARCHIVO_SALIDAS + ".lock")
+    bloqueo.write_bytes(b"otro-proceso")
+    os.utime(bloqueo, (time.time() - 3600, time.time() - 3600))
+
+    registrar_salida(str(ruta), "clave", str(tmp_path))
+    assert salida_vigente(str(ruta), "clave", str(tmp_path))
+    assert not bloqueo.exists()
+
+
+def test_bloqueo_de_otro_proceso_no_se_borra(tmp_path):
+    bloqueo = tmp_path / (ARCHIVO_SALIDAS + ".lock")
+    with _bloqueo(str(tmp_path)):
+        # Otro proceso lo dio por vencido y tomó el turno mientras tanto
+        os.remove(bloqueo)
+        bloqueo.write_bytes(b"otro-proceso")
+    assert bloqueo.read_bytes() == b"otro-proceso"
+
+
+def test_bloqueo_vigente_espera_el_turno(tmp_path):
+    bloqueo = tmp_path / (ARCHIVO_SALIDAS + ".lock")
+    bloqueo.write_bytes(b"otro-proceso")
+    inicio = time.monotonic()
+    with _bloqueo(str(tmp_path), vencimiento=0.3):
+        assert bloqueo.read_bytes() != b"otro-proceso"
+    assert time.monotonic() - inicio >= 0.3
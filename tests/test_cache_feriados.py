@@ -0,0 +1,28 @@
+import time
+
+import pytest
+import requests
+
+from cache_feriados import feriados_con_cache, guardar_cache
+
+MOTIVOS = {"2024-01-01": "Año Nuevo"}
+VENCIDO = time.time() - 7 * 24 * 60 * 60
+
+
+def descarga_que_falla(error):
+    def descargar(anio):
+        raise error
+    return descargar
+
+
+def test_falla_de_red_usa_la_copia_vencida(tmp_path):
+    guardar_cache("lanacion", 2030, MOTIVOS, str(tmp_path), ahora=VENCIDO)
+    descargar = descarga_que_falla(requests.ConnectionError("sin red"))
+    assert feriados_con_cache("lanacion", 2030, descargar, directorio=str(tmp_path)) == MOTIVOS
+
+
+def test_negativa_del_robots_no_usa_la_copia_vencida(tmp_path):
+    guardar_cache("lanacion", 2030, MOTIVOS, str(tmp_path), ahora=VENCIDO)
+    descargar = descarga_que_falla(PermissionError("robots.txt no permite la descarga"))
+    with pytest.raises(PermissionError):
+        feriados_con_cache("lanacion", 2030, descargar, directorio=str(tmp_path))
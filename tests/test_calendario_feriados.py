@@ -0,0 +1,14 @@
+import pandas as pd
+
+from feriados import agregar_motivo_feriado
+
+
+def test_sin_feriados_publicados_todo_es_no_feriado():
+    df = pd.DataFrame({"DIA_TRANSPORTE": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-02"])})
+    assert agregar_motivo_feriado(df, {})["MOTIVO_FERIADO"].astype(str).tolist() == ["NO FERIADO"] * 3
+
+
+def test_motivo_de_cada_feriado():
+    df = pd.DataFrame({"DIA_TRANSPORTE": pd.to_datetime(["2024-01-01", "2024-01-02"])})
+    motivos = agregar_motivo_feriado(df, {"2024-01-01": "Año Nuevo"})["MOTIVO_FERIADO"]
+    assert motivos.astype(str).tolist() == ["Año Nuevo", "NO FERIADO"]
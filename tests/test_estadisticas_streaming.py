@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from estadisticas_streaming import EstadisticasStreaming
+
+VALORES = [10.0, 20.0, 30.0, 40.0, 1000.0]
+
+
+def bloque(valores):
+    return pd.DataFrame({"LINEA": pd.Categorical(["A"] * len(valores)), "CANTIDAD": np.array(valores, dtype=float)})
+
+
+@pytest.mark.parametrize("claves", [None, ["LINEA"]])
+@pytest.mark.parametrize("valores", [[], [np.nan, np.nan]], ids=["sin_filas", "todo_nulo"])
+def test_bloque_sin_valores_validos_da_resumenes_vacios(claves, valores):
+    estadisticas = EstadisticasStreaming(claves=claves).agregar(bloque(valores))
+    assert estadisticas.describir().empty
+    assert estadisticas.limites_iqr().empty
+
+
+@pytest.mark.parametrize("claves", [None, ["LINEA"]])
+def test_combinar_con_un_bloque_vacio_no_cambia_nada(claves):
+    solo = EstadisticasStreaming(claves=claves).agregar(bloque(VALORES))
+    combinado = EstadisticasStreaming(claves=claves).agregar(bloque([])).agregar(bloque(VALORES))
+    pd.testing.assert_frame_equal(combinado.describir(), solo.describir())
+    pd.testing.assert_frame_equal(combinado.limites_iqr(), solo.limites_iqr())
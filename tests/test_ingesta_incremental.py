@@ -0,0 +1,70 @@
+import glob
+import os
+
+import pytest
+
+import ingesta_incremental
+from almacenamiento import leer_dataset
+from conftest import FERIADOS, filas_sube
+
+
+@pytest.fixture(autouse=True)
+def sin_descargas(monkeypatch):
+    monkeypatch.setattr(ingesta_incremental, "feriados_por_anio", lambda anios, refrescar=False: {2024: FERIADOS})
+
+
+def agregar_filas(ruta, filas):
+    with open(ruta, "a", encoding="utf-8") as archivo:
+        archivo.write("\n".join(filas) + "\n")
+
+
+def archivos_del_dataset(raiz):
+    return sorted(glob.glob(os.path.join(raiz, "**", "part-*.parquet"), recursive=True))
+
+
+def totales(raiz):
+    """Viajes en los archivos del dataset y en el cubo persistido."""
+    en_archivos = sum(leer_dataset(ruta)["CANTIDAD"].sum() for ruta in archivos_del_dataset(raiz))
+    return en_archivos, leer_dataset(os.path.join(raiz, ingesta_incremental.ARCHIVO_CUBO))["CANTIDAD"].sum()
+
+
+def test_dos_ingestas_del_mismo_dia_no_se_pisan(csv_sube, tmp_path):
+    filas = filas_sube(dias=3)
+    origen = csv_sube(filas[:8])
+    raiz = str(tmp_path / "particionado")
+    ingesta_incremental.ingerir_anio(2024, origen, raiz)
+
+    # Dos ingestas con filas de un mismo día que todavía se está publicando
+    for desde, hasta in [(8, 10), (10, 12)]:
+        agregar_filas(origen, filas[desde:hasta])
+        assert ingesta_incremental.ingerir_anio(2024, origen, raiz) == 2
+
+    nombres = [os.path.basename(ruta) for ruta in archivos_del_dataset(raiz)]
+    assert len(nombres) == len(set(nombres)) == 3
+    total = sum(int(fila.split(",")[8]) for fila in filas)
+    assert totales(raiz) == (total, total)
+
+
+def test_ingesta_interrumpida_no_cuenta_dos_veces(csv_sube, tmp_path, monkeypatch):
+    filas = filas_sube(dias=3)
+    origen = csv_sube(filas[:6])
+    raiz = str(tmp_path / "particionado")
+    ingesta_incremental.ingerir_anio(2024, origen, raiz)
+    agregar_filas(origen, filas[6:])
+
+    # Se corta después de escribir las particiones y el cubo, antes de confirmar el estado
+    guardar_estado = ingesta_incremental.guardar_estado
+
+    def cortar_al_confirmar(raiz, anio, estado):
+        if "pendiente" not in estado:
+            raise KeyboardInterrupt
+        guardar_estado(raiz, anio, estado)
+
+    monkeypatch.setattr(ingesta_incremental, "guardar_estado", cortar_al_confirmar)
+    with pytest.raises(KeyboardInterrupt):
+        ingesta_incremental.ingerir_anio(2024, origen, raiz)
+    monkeypatch.setattr(ingesta_incremental, "guardar_estado", guardar_estado)
+
+    ingesta_incremental.ingerir_anio(2024, origen, raiz)
+    total = sum(int(fila.split(",")[8]) for fila in filas)
+    assert totales(raiz) == (total, total)
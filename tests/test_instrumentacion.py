@@ -0,0 +1,21 @@
+import pytest
+
+from instrumentacion import Instrumentacion
+
+
+def test_seccion_que_falla_propaga_su_error():
+    instrumentacion = Instrumentacion()
+    with pytest.raises(ValueError):
+        with instrumentacion.seccion("escritura", filas=lambda: len(filas)):
+            raise ValueError("falla antes de asignar filas")
+            filas = []
+    medicion = instrumentacion.mediciones["escritura"]
+    assert medicion.llamadas == 1 and not medicion.filas
+
+
+def test_seccion_suma_filas_de_cada_llamada():
+    instrumentacion = Instrumentacion()
+    for filas in (3, 4):
+        with instrumentacion.seccion("bloque", filas=lambda: filas):
+            pass
+    assert instrumentacion.mediciones["bloque"].filas == 7
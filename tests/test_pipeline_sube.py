@@ -0,0 +1,48 @@
+import filecmp
+
+import pandas as pd
+import pytest
+
+from almacenamiento import leer_csv_sube, leer_csv_sube_por_bloques
+from conftest import FERIADOS, con_valor, filas_sube
+from pipeline_sube import procesar_anio
+
+
+def procesar_con_y_sin_bloques(origen, formato="csv", chunksize=70):
+    en_memoria = procesar_anio(2024, origen, f"en_memoria.{formato}", formato=formato, feriados=FERIADOS)
+    por_bloques = procesar_anio(2024, origen, f"por_bloques.{formato}", chunksize=chunksize, formato=formato,
+                                feriados=FERIADOS)
+    return en_memoria, por_bloques
+
+
+def test_bloques_identicos_con_cantidad_nula(csv_sube):
+    # El nulo está en un solo bloque: en memoria toda la columna sería decimal (1599.0)
+    filas = filas_sube()
+    filas[200] = con_valor(filas[200], "CANTIDAD", "")
+    en_memoria, por_bloques = procesar_con_y_sin_bloques(csv_sube(filas))
+    assert filecmp.cmp(en_memoria, por_bloques, shallow=False)
+    assert ",1000,NO," in open(en_memoria, encoding="utf-8-sig").read()
+
+
+def test_cantidad_no_entera_queda_nula_sin_cortar_el_pipeline(csv_sube):
+    filas = filas_sube()
+    filas[200] = con_valor(filas[200], "CANTIDAD", "")
+    filas[10] = con_valor(filas[10], "CANTIDAD", "12.5")
+    en_memoria, por_bloques = procesar_con_y_sin_bloques(csv_sube(filas))
+    assert filecmp.cmp(en_memoria, por_bloques, shallow=False)
+    resultado = pd.read_csv(en_memoria)
+    assert resultado["CANTIDAD"].isna().sum() == 2
+
+
+@pytest.mark.parametrize("texto", ["None", "<NA>", "NA", "null"])
+def test_textos_parecidos_a_nulos_iguales_con_y_sin_bloques(csv_sube, texto):
+    filas = filas_sube()
+    filas[5] = con_valor(filas[5], "MUNICIPIO", texto)
+    filas[300] = con_valor(filas[300], "MUNICIPIO", "")
+    origen = csv_sube(filas)
+
+    en_memoria = leer_csv_sube(origen)["MUNICIPIO"]
+    por_bloques = pd.concat([b["MUNICIPIO"].astype(object) for b in leer_csv_sube_por_bloques(origen, chunksize=70)])
+    assert en_memoria.iloc[5] == texto
+    assert en_memoria.isna().sum() == por_bloques.isna().sum() == 1
+    assert filecmp.cmp(*procesar_con_y_sin_bloques(origen), shallow=False)
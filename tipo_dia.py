@@ -0,0 +1,48 @@
+import numpy as np       # Para operar sobre arreglos de códigos sin recorrer fila por fila
+import pandas as pd      # Para manipulación y análisis de datos en DataFrames
+
+# Nombres de los días en español, en el orden de .weekday() (0 = lunes, 6 = domingo)
+DIAS_SEMANA = ["LUNES", "MARTES", "MIÉRCOLES", "JUEVES", "VIERNES", "SÁBADO", "DOMINGO"]
+
+# Clasificación del tipo de día (mismas etiquetas que usaba clasificar_fecha)
+TIPOS_DIA = ["HÁBIL", "FIN_DE_SEMANA", "FERIADO"]
+
+# Tipos categóricos compartidos: DIA_SEMANA queda ordenado de lunes a domingo
+TIPO_DIA_SEMANA = pd.CategoricalDtype(DIAS_SEMANA, ordered=True)
+TIPO_TIPO_DIA = pd.CategoricalDtype(TIPOS_DIA)
+
+
+def clasificar_fechas(fechas, fechas_feriados):
+    """Devuelve un DataFrame con DIA_SEMANA y TIPO_DIA (categóricas) para cada fecha.
+
+    En lugar de evaluar fila por fila, se clasifican solo las fechas únicas
+    (unas 366 por año) y el resultado se propaga a todas las filas con los
+    códigos que devuelve pd.factorize. Las fechas nulas quedan como nulas.
+    """
+    codigos, unicas = pd.factorize(fechas)
+    unicas = pd.DatetimeIndex(unicas)
+
+    # Clasificación sobre las fechas únicas: 0 = HÁBIL, 1 = FIN_DE_SEMANA, 2 = FERIADO
+    dia_semana = unicas.weekday.to_numpy()
+    es_feriado = unicas.normalize().isin(pd.to_datetime(sorted(fechas_feriados)))
+    tipo_dia = np.where(es_feriado, 2, np.where(dia_semana >= 5, 1, 0))
+
+    # Se agrega un -1 al final para que el código -1 (fecha nula) quede como categoría nula
+    dia_semana = np.append(dia_semana, -1)[codigos]
+    tipo_dia = np.append(tipo_dia, -1)[codigos]
+
+    return pd.DataFrame(
+        {
+            "DIA_SEMANA": pd.Categorical.from_codes(dia_semana, dtype=TIPO_DIA_SEMANA),
+            "TIPO_DIA": pd.Categorical.from_codes(tipo_dia, dtype=TIPO_TIPO_DIA),
+        },
+        index=fechas.index,
+    )
+
+
+def agregar_tipo_dia(df, fechas_feriados, columna="DIA_TRANSPORTE"):
+    """Agrega las columnas DIA_SEMANA y TIPO_DIA al DataFrame (lo modifica y lo devuelve)."""
+    clasificacion = clasificar_fechas(df[columna], fechas_feriados)
+    df["DIA_SEMANA"] = clasificacion["DIA_SEMANA"]
+    df["TIPO_DIA"] = clasificacion["TIPO_DIA"]
+    return df